@@ -0,0 +1,98 @@
+"""Benchmark of the package import time, in fresh interpreters, with a regression guard.
+
+Each statement runs in a new interpreter and is timed from inside it, so interpreter startup is excluded.
+With --check, the run fails (exit code 1) if a light import loads one of the heavy Google client modules,
+or if its median time exceeds --max-ms.
+
+Usage:
+    python benchmarks/bench_import.py --repeat 10
+    python benchmarks/bench_import.py --check --max-ms 100
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Statements that must not load the Google client stack
+LIGHT_STATEMENTS = {
+    "package": "import google_play_developer_api",
+    "report package": "import google_play_developer_api.report",
+    "report mapping": "from google_play_developer_api.report import mapping",
+    "report class": "from google_play_developer_api.report import CrashRateReport",
+    "review package": "import google_play_developer_api.review",
+}
+# Reference: what a worker pays once it builds a client
+HEAVY_STATEMENTS = {
+    "google client stack": "import google.oauth2.service_account, googleapiclient.discovery",
+}
+HEAVY_MODULES = ["googleapiclient.discovery", "google.oauth2.service_account", "google_auth_httplib2", "httplib2"]
+
+PROBE = """
+import json, sys, time
+started_at = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started_at
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [name for name in {heavy_modules!r} if name in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    """
+    Time a statement in `repeat` fresh interpreters
+
+    Args:
+        statement: Python statement
+        repeat: Number of interpreters
+
+    Returns:
+        Dict with the median/min/max time (ms) and the heavy modules loaded by the statement
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+    code = PROBE.format(statement=statement, heavy_modules=HEAVY_MODULES)
+
+    times = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        times.append(result["ms"])
+        heavy = result["heavy"]
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times), "heavy_modules": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per statement")
+    parser.add_argument("--check", action="store_true", help="Fail on a regression of the light imports")
+    parser.add_argument("--max-ms", type=float, default=150, help="Maximum median time of a light import")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {name: measure(statement, args.repeat)
+               for name, statement in {**LIGHT_STATEMENTS, **HEAVY_STATEMENTS}.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            heavy = f"  loads {', '.join(result['heavy_modules'])}" if result["heavy_modules"] else ""
+            print(f"{name:<22} median {result['median_ms']:7.1f} ms  "
+                  f"min {result['min_ms']:7.1f} ms  max {result['max_ms']:7.1f} ms{heavy}")
+
+    if args.check:
+        failures = []
+        for name in LIGHT_STATEMENTS:
+            if results[name]["heavy_modules"]:
+                failures.append(f"{name} loads {', '.join(results[name]['heavy_modules'])}")
+            if results[name]["median_ms"] > args.max_ms:
+                failures.append(f"{name} takes {results[name]['median_ms']:.1f} ms > {args.max_ms} ms")
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark of the report row parser against the previous per-row dict building.
+
+Usage:
+    python benchmarks/bench_parser.py --rows 200000 --dimensions 18
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from google_play_developer_api.report.parser import decode_rows
+
+DIMENSIONS = [
+    "apiLevel", "deviceBrand", "versionCode", "countryCode", "deviceType", "deviceModel", "deviceRamBucket",
+    "deviceSocMake", "deviceSocModel", "deviceCpuMake", "deviceCpuModel", "deviceGpuMake", "deviceGpuModel",
+    "deviceGpuVersion", "deviceVulkanVersion", "deviceGlEsVersion", "deviceScreenSize", "deviceScreenDpi",
+]
+INT_DIMENSIONS = {"apiLevel", "versionCode", "deviceRamBucket"}
+METRICS = ["crashRate", "userPerceivedCrashRate", "distinctUsers"]
+
+
+def legacy_parse_rows(rows: list[dict], app_package_name: str, timeline_spec: dict) -> list[dict]:
+    """Parse loop of BaseReportingService._query before RowDecoder."""
+    result_list = []
+    for row in rows:
+        year = row["startTime"].get("year")
+        month = row["startTime"].get("month")
+        day = row["startTime"].get("day")
+
+        if timeline_spec["aggregationPeriod"] == "HOURLY":
+            hour = row["startTime"].get("hours", "00")
+            hour = f" {hour}:00"
+        else:
+            hour = ""
+
+        result = {
+            "eventDate": f"{year}-{month}-{day}{hour}",
+            "timeZone": row["startTime"]["timeZone"]["id"],
+            "appPackageName": app_package_name,
+        }
+
+        for dimension in row.get("dimensions", []):
+            if "stringValue" in dimension:
+                result[f'{dimension["dimension"]}'] = dimension["stringValue"]
+            elif "int64Value" in dimension:
+                result[f'{dimension["dimension"]}'] = dimension["int64Value"]
+            else:
+                result[f'{dimension["dimension"]}'] = ""
+        for metric in row.get("metrics", []):
+            result[f'{metric["metric"]}'] = metric["decimalValue"]["value"] if "decimalValue" in metric else ""
+
+        result_list.append(result)
+
+    return result_list
+
+
+def generate_rows(row_count: int, dimensions: list[str], metrics: list[str], seed: int = 0) -> list[dict]:
+    """Generate synthetic raw rows shaped like Reporting API responses."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(row_count):
+        start_time = {"year": 2024, "month": 1, "day": 1 + (i // 24) % 28, "timeZone": {"id": "UTC"}}
+        if i % 24:
+            start_time["hours"] = i % 24
+        row_dimensions = []
+        for dimension in dimensions:
+            if dimension in INT_DIMENSIONS:
+                row_dimensions.append({"dimension": dimension, "int64Value": str(rng.randint(1, 500))})
+            elif rng.random() < 0.02:
+                row_dimensions.append({"dimension": dimension})
+            else:
+                row_dimensions.append({"dimension": dimension, "stringValue": f"{dimension}-{rng.randint(1, 50)}"})
+        row_metrics = []
+        for metric in metrics:
+            if rng.random() < 0.05:
+                row_metrics.append({"metric": metric})
+            else:
+                row_metrics.append({"metric": metric, "decimalValue": {"value": f"{rng.random():.6f}"}})
+        rows.append({"startTime": start_time, "dimensions": row_dimensions, "metrics": row_metrics})
+    return rows
+
+
+def measure(parse, pages: list[list[dict]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for page in pages:
+            parse(page)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def retained_memory(parse, payloads: list[str]) -> float:
+    """Memory (MB) held by parsed results once the raw response pages are released."""
+    gc.collect()
+    tracemalloc.start()
+    results = [parse(json.loads(payload)) for payload in payloads]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=50000)
+    parser.add_argument("--dimensions", type=int, default=len(DIMENSIONS))
+    parser.add_argument("--period", choices=["HOURLY", "DAILY"], default="HOURLY")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Decoded from JSON like API responses, so cells don't share their name strings
+    rows = json.loads(json.dumps(generate_rows(args.rows, DIMENSIONS[:args.dimensions], METRICS)))
+    pages = [rows[i:i + args.page_size] for i in range(0, len(rows), args.page_size)]
+    timeline_spec = {"aggregationPeriod": args.period}
+
+    assert [legacy_parse_rows(page, "app", timeline_spec) for page in pages] == \
+        [decode_rows(page, "app", args.period) for page in pages], "decoder output differs from the legacy parser"
+
+    parsers = {
+        "legacy dict": lambda page: legacy_parse_rows(page, "app", timeline_spec),
+        "decoder dict": lambda page: decode_rows(page, "app", args.period),
+        "decoder namedtuple": lambda page: decode_rows(page, "app", args.period, "namedtuple"),
+    }
+    payloads = [json.dumps(page) for page in pages]
+
+    print(f"{args.rows} rows, {args.dimensions} dimensions, {len(METRICS)} metrics, {args.period}")
+    baseline = None
+    for name, parse in parsers.items():
+        seconds = measure(parse, pages, args.repeat)
+        memory = retained_memory(parse, payloads)
+        baseline = seconds if baseline is None else baseline
+        print(f"{name:<20} {seconds:8.3f}s {args.rows / seconds:12,.0f} rows/s  x{baseline / seconds:.2f}  "
+              f"{memory:8.1f} MB retained")
+
+
+if __name__ == "__main__":
+    main()
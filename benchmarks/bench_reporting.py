@@ -0,0 +1,211 @@
+"""End-to-end benchmark of the report APIs against a local fake Reporting API server.
+
+No credentials or network access are needed: clients are built from the discovery document served by
+`fake_server.FakeReportingServer`. Each scenario reports throughput, per-request latency and peak memory,
+and `--json` saves the results to compare releases.
+
+Usage:
+    python benchmarks/bench_reporting.py --days 7 --rows-per-bucket 200 --page-size 10000
+    python benchmarks/bench_reporting.py --error-rate 0.05 --json results.json
+"""
+import argparse
+import datetime
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from google.auth.credentials import AnonymousCredentials
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_server import FakeReportingApi, FakeReportingServer  # noqa: E402
+
+from google_play_developer_api.report import BatchReportFetcher, CrashRateReport, ReportJob  # noqa: E402
+from google_play_developer_api.report.parser import decode_rows  # noqa: E402
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy  # noqa: E402
+from google_play_developer_api.transport import PooledHttp  # noqa: E402
+
+DIMENSIONS = ["apiLevel", "deviceBrand", "versionCode", "countryCode", "deviceType", "deviceModel"]
+METRICS = ["crashRate", "userPerceivedCrashRate", "distinctUsers"]
+
+
+class LatencyRecorder:
+    def __init__(self):
+        """
+        Record the duration of each API request of the report instances it is attached to
+        """
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def attach(self, report):
+        execute = report._execute
+
+        @functools.wraps(execute)
+        def timed_execute(request):
+            started_at = time.perf_counter()
+            try:
+                return execute(request)
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - started_at)
+
+        report._execute = timed_execute
+        return report
+
+    def reset(self):
+        with self._lock:
+            self.latencies = []
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {"requests": 0}
+        # Interpolated between the closest ranks, like the median, so p95 >= p50 even with few requests
+        p95 = statistics.quantiles(latencies, n=20, method="inclusive")[18] if len(latencies) > 1 else latencies[0]
+        return {
+            "requests": len(latencies),
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "latency_p95_ms": round(p95 * 1000, 2),
+            "latency_max_ms": round(latencies[-1] * 1000, 2),
+        }
+
+
+def row_count(result) -> int:
+    return result.num_rows if hasattr(result, "num_rows") else len(result)
+
+
+def run_scenario(name: str, run, recorder: LatencyRecorder) -> dict:
+    """Run one scenario and measure its duration, requests and peak traced memory."""
+    recorder.reset()
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - started_at
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        "scenario": name,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "peak_memory_mb": round(peak / 1e6, 1),
+        **recorder.summary(),
+    }
+    print(f"{name:<28} {rows:>9} rows {seconds:8.3f}s {result['rows_per_second'] or 0:>10,} rows/s "
+          f"{result['peak_memory_mb']:8.1f} MB peak  {result['requests']:>4} requests "
+          f"p50 {result.get('latency_p50_ms', 0):7.1f} ms  p95 {result.get('latency_p95_ms', 0):7.1f} ms")
+    return result
+
+
+def build_scenarios(report: CrashRateReport, fetcher: BatchReportFetcher, args) -> dict:
+    end = datetime.datetime(2024, 1, 1) + datetime.timedelta(days=args.days)
+    hourly = {"app_package_name": "com.example.app",
+              "start_time": "2024-01-01 00:00",
+              "end_time": end.strftime("%Y-%m-%d %H:%M"),
+              "dimensions": DIMENSIONS,
+              "metrics": METRICS,
+              "page_size": args.page_size}
+    daily = {**hourly, "start_time": "2024-01-01", "end_time": end.strftime("%Y-%m-%d")}
+    jobs = [ReportJob(app_package_name=f"com.example.app{i}",
+                      metric_set="crash_rate",
+                      start_time=daily["start_time"],
+                      end_time=daily["end_time"],
+                      dimensions=DIMENSIONS,
+                      metrics=METRICS,
+                      kwargs={"page_size": args.page_size})
+            for i in range(args.apps)]
+
+    def parse_pages():
+        pages = list(report._iter_pages(app_package_name=hourly["app_package_name"],
+                                        timeline_spec=report._hourly_timeline_spec(hourly["start_time"],
+                                                                                   hourly["end_time"]),
+                                        dimensions=DIMENSIONS,
+                                        metrics=METRICS,
+                                        metric_set="crashRateMetricSet",
+                                        page_size=args.page_size))
+        started_at = time.perf_counter()
+        count = sum(len(decode_rows(page.get("rows", []), hourly["app_package_name"], "HOURLY")) for page in pages)
+        print(f"{'':<28} parsing only: {time.perf_counter() - started_at:.3f}s")
+        return count
+
+    return {
+        "get_hourly": lambda: row_count(report.get_hourly(**hourly)),
+        "get_daily": lambda: row_count(report.get_daily(**daily)),
+        "iter_hourly": lambda: sum(1 for _ in report.iter_hourly(**hourly)),
+        "get_hourly namedtuples": lambda: row_count(report.get_hourly(**hourly, output_format="namedtuples")),
+        "get_hourly pandas": lambda: row_count(report.get_hourly(**hourly, output_format="pandas")),
+        "get_hourly arrow": lambda: row_count(report.get_hourly(**hourly, output_format="arrow")),
+        f"get_hourly shard DAY x{args.workers}": lambda: row_count(
+            report.get_hourly(**hourly, shard_by="DAY", max_workers=args.workers)),
+        f"batch fetch {args.apps} apps x{args.workers}": lambda: sum(
+            row_count(result) for result in fetcher.fetch(jobs)),
+        "freshness bulk": lambda: len(report.get_freshnesses_bulk([job.app_package_name for job in jobs],
+                                                                  max_workers=args.workers)),
+        "fetch + parse": parse_pages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=7, help="Length of the queried window")
+    parser.add_argument("--rows-per-bucket", type=int, default=200, help="Rows per hour (HOURLY) or day (DAILY)")
+    parser.add_argument("--page-size", type=int, default=10000)
+    parser.add_argument("--max-page-size", type=int, default=50000, help="Largest page the server returns")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server delay per response (seconds)")
+    parser.add_argument("--apps", type=int, default=8, help="Number of apps of the concurrent scenarios")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrency of the concurrent scenarios")
+    parser.add_argument("--transport", choices=["httplib2", "pooled"], default="httplib2",
+                        help="One httplib2 transport per thread, or one PooledHttp shared by all threads")
+    parser.add_argument("--scenario", action="append", help="Only run scenarios starting with this name")
+    parser.add_argument("--json", help="Save results to this file")
+    args = parser.parse_args()
+
+    api = FakeReportingApi(rows_per_bucket=args.rows_per_bucket,
+                           max_page_size=args.max_page_size,
+                           error_rate=args.error_rate,
+                           quota_error_rate=args.quota_error_rate,
+                           retry_after=0.05,
+                           latency=args.latency)
+    # No rate limit and short backoff: the benchmark measures the client, not the quota
+    scheduler = RequestScheduler(retry_policy=RetryPolicy(max_attempts=8, base_delay=0.05, max_delay=1.0))
+
+    with FakeReportingServer(api) as server, tempfile.TemporaryDirectory() as tmp_dir:
+        discovery_path = server.write_discovery_document(os.path.join(tmp_dir, "discovery.json"))
+        credentials = AnonymousCredentials()
+        http = PooledHttp(credentials, pool_size=args.workers) if args.transport == "pooled" else None
+        recorder = LatencyRecorder()
+
+        report = recorder.attach(CrashRateReport(credentials=credentials, discovery_path=discovery_path,
+                                                 scheduler=scheduler, http=http))
+        fetcher = BatchReportFetcher(credentials=credentials, discovery_path=discovery_path, scheduler=scheduler,
+                                     max_workers=args.workers, http=http)
+        recorder.attach(fetcher.get_report("crash_rate"))
+
+        print(f"{args.days} days, {args.rows_per_bucket} rows per bucket, page size {args.page_size}, "
+              f"{args.transport} transport, "
+              f"error rate {args.error_rate}, quota error rate {args.quota_error_rate}")
+        results = []
+        for name, run in build_scenarios(report, fetcher, args).items():
+            if args.scenario and not any(name.startswith(prefix) for prefix in args.scenario):
+                continue
+            results.append(run_scenario(name, run, recorder))
+
+        print(f"Server: {api.request_count} requests, {api.error_count} injected errors, "
+              f"{api.bytes_sent / 1e6:.1f} MB sent")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
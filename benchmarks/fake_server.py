@@ -0,0 +1,265 @@
+"""Local stand-in for the playdeveloperreporting v1beta1 endpoints used by the benchmarks.
+
+It serves the discovery document (pointing back to the local server), paged `:query` responses with synthetic
+rows and freshness `get` responses. Rows are generated for each hour (or day) of the requested timeline, so
+time sharding sees realistic per-shard volumes. Errors (503 and 429 with `Retry-After`) and latency can be
+injected to exercise retries.
+
+Usage:
+    python benchmarks/fake_server.py --port 8080 --rows-per-bucket 500
+"""
+import argparse
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from googleapiclient.discovery_cache import get_static_doc
+
+INT_DIMENSIONS = {"apiLevel", "versionCode", "deviceRamBucket"}
+QUERY_PATH = re.compile(r"^/v1beta1/apps/(?P<app>[^/]+)/(?P<metric_set>[A-Za-z]+):query$")
+GET_PATH = re.compile(r"^/v1beta1/apps/(?P<app>[^/]+)/(?P<metric_set>[A-Za-z]+)$")
+
+
+class FakeReportingApi:
+    def __init__(self,
+                 rows_per_bucket: int = 100,
+                 max_page_size: int = 50000,
+                 error_rate: float = 0.0,
+                 quota_error_rate: float = 0.0,
+                 retry_after: float = 0.1,
+                 latency: float = 0.0,
+                 seed: int = 0):
+        """
+        Synthetic Reporting API state and response generation
+
+        Args:
+            rows_per_bucket: Rows returned for each hour (HOURLY) or day (DAILY) of a query
+            max_page_size: Largest page returned, whatever the requested page size
+            error_rate: Share of requests answered with 503
+            quota_error_rate: Share of requests answered with 429 and a `Retry-After` header
+            retry_after: Value of the `Retry-After` header (seconds)
+            latency: Delay added to every response (seconds)
+            seed: Random seed of the generated values
+        """
+        self.rows_per_bucket = rows_per_bucket
+        self.max_page_size = max_page_size
+        self.error_rate = error_rate
+        self.quota_error_rate = quota_error_rate
+        self.retry_after = retry_after
+        self.latency = latency
+        self.seed = seed
+
+        self.request_count = 0
+        self.error_count = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def roll_error(self):
+        """Pick an injected error for a request: None, 503 or 429."""
+        with self._lock:
+            self.request_count += 1
+            draw = self._random.random()
+            if draw < self.quota_error_rate:
+                self.error_count += 1
+                return 429
+            if draw < self.quota_error_rate + self.error_rate:
+                self.error_count += 1
+                return 503
+        return None
+
+    @staticmethod
+    def _buckets(timeline_spec: dict) -> list[dict]:
+        hourly = timeline_spec["aggregationPeriod"] == "HOURLY"
+        step = datetime.timedelta(hours=1) if hourly else datetime.timedelta(days=1)
+        start, end = (
+            datetime.datetime(timeline_spec[key]["year"], timeline_spec[key]["month"], timeline_spec[key]["day"],
+                              timeline_spec[key].get("hours", 0))
+            for key in ("startTime", "endTime")
+        )
+        buckets = []
+        while start < end:
+            bucket = {"year": start.year, "month": start.month, "day": start.day,
+                      "timeZone": {"id": "UTC" if hourly else "America/Los_Angeles"}}
+            if hourly and start.hour:
+                bucket["hours"] = start.hour
+            buckets.append(bucket)
+            start += step
+        return buckets
+
+    def _row(self, index: int, start_time: dict, dimensions: list[str], metrics: list[str]) -> dict:
+        row_dimensions = []
+        for position, dimension in enumerate(dimensions):
+            value = (index * 31 + position * 7) % 97
+            if dimension in INT_DIMENSIONS:
+                row_dimensions.append({"dimension": dimension, "int64Value": str(value)})
+            else:
+                row_dimensions.append({"dimension": dimension, "stringValue": f"{dimension}-{value}"})
+        row_metrics = [{"metric": metric, "decimalValue": {"value": f"{((index * 13 + position) % 1000) / 1000:.3f}"}}
+                       for position, metric in enumerate(metrics)]
+        return {"startTime": start_time, "dimensions": row_dimensions, "metrics": row_metrics}
+
+    def query(self, body: dict) -> dict:
+        """Build one page of a `:query` response."""
+        buckets = self._buckets(body["timelineSpec"])
+        total = len(buckets) * self.rows_per_bucket
+        offset = int(body.get("pageToken") or 0)
+        page_size = min(body.get("pageSize") or self.max_page_size, self.max_page_size)
+        end = min(offset + page_size, total)
+
+        rows = [self._row(i, buckets[i // self.rows_per_bucket], body.get("dimensions", []), body.get("metrics", []))
+                for i in range(offset, end)]
+        response = {"rows": rows}
+        if end < total:
+            response["nextPageToken"] = str(end)
+        return response
+
+    @staticmethod
+    def get(app_package_name: str, metric_set: str) -> dict:
+        """Build a metric set resource with its freshnesses."""
+        now = datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0) - datetime.timedelta(hours=3)
+        yesterday = now - datetime.timedelta(days=1)
+        return {
+            "name": f"apps/{app_package_name}/{metric_set}",
+            "freshnessInfo": {"freshnesses": [
+                {"aggregationPeriod": "HOURLY",
+                 "latestEndTime": {"year": now.year, "month": now.month, "day": now.day, "hours": now.hour,
+                                   "timeZone": {"id": "UTC"}}},
+                {"aggregationPeriod": "DAILY",
+                 "latestEndTime": {"year": yesterday.year, "month": yesterday.month, "day": yesterday.day,
+                                   "timeZone": {"id": "America/Los_Angeles"}}},
+            ]},
+        }
+
+
+def make_handler(api: FakeReportingApi, discovery_document: bytes):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload, headers: dict = None):
+            content = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            if api.latency:
+                time.sleep(api.latency)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+            with api._lock:
+                api.bytes_sent += len(content)
+
+        def _send_error(self, status: int):
+            headers = {"Retry-After": str(api.retry_after)} if status == 429 else None
+            self._send(status, {"error": {"code": status, "message": "Injected error"}}, headers)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path.startswith("/$discovery/rest"):
+                self._send(200, discovery_document)
+                return
+
+            match = GET_PATH.match(path)
+            if not match:
+                self._send(404, {"error": {"code": 404, "message": path}})
+                return
+            error = api.roll_error()
+            if error:
+                self._send_error(error)
+                return
+            self._send(200, api.get(match["app"], match["metric_set"]))
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not QUERY_PATH.match(path):
+                self._send(404, {"error": {"code": 404, "message": path}})
+                return
+            error = api.roll_error()
+            if error:
+                self._send_error(error)
+                return
+            self._send(200, api.query(body))
+
+    return Handler
+
+
+def discovery_document(root_url: str) -> bytes:
+    """Bundled playdeveloperreporting v1beta1 discovery document, pointing to `root_url`."""
+    document = json.loads(get_static_doc("playdeveloperreporting", "v1beta1"))
+    document["rootUrl"] = root_url
+    document["baseUrl"] = root_url
+    document.pop("mtlsRootUrl", None)
+    return json.dumps(document).encode()
+
+
+class FakeReportingServer:
+    def __init__(self, api: FakeReportingApi = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Fake Reporting API server running in a background thread
+
+        Args:
+            api: Response generator, default FakeReportingApi() if None
+            host: Host to bind
+            port: Port to bind, 0 for a free port
+        """
+        self.api = FakeReportingApi() if api is None else api
+        self._server = ThreadingHTTPServer((host, port), None)
+        self.root_url = f"http://{host}:{self._server.server_address[1]}/"
+        self.discovery_document = discovery_document(self.root_url)
+        self._server.RequestHandlerClass = make_handler(self.api, self.discovery_document)
+        self._thread = None
+
+    def write_discovery_document(self, path: str) -> str:
+        """Save the discovery document, to build clients with `discovery_path`."""
+        with open(path, "wb") as f:
+            f.write(self.discovery_document)
+        return path
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rows-per-bucket", type=int, default=100)
+    parser.add_argument("--max-page-size", type=int, default=50000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota-error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    api = FakeReportingApi(rows_per_bucket=args.rows_per_bucket,
+                           max_page_size=args.max_page_size,
+                           error_rate=args.error_rate,
+                           quota_error_rate=args.quota_error_rate,
+                           latency=args.latency)
+    server = FakeReportingServer(api, host=args.host, port=args.port)
+    print(f"Serving fake Reporting API on {server.root_url}")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
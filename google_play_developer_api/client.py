@@ -0,0 +1,138 @@
+import threading
+
+REPORTING_SCOPES = ["https://www.googleapis.com/auth/playdeveloperreporting"]
+PUBLISHER_SCOPES = ["https://www.googleapis.com/auth/androidpublisher"]
+
+_lock = threading.Lock()
+_credentials_cache = {}
+_service_cache = {}
+
+
+def get_credentials(credentials_path: str, scopes: list[str]):
+    """
+    Load service account credentials, once per process for each (file, scopes)
+
+    Args:
+        credentials_path: Path to a service account json file
+        scopes: OAuth scopes
+
+    Returns:
+        Service account credentials
+    """
+    # Imported on first use, like googleapiclient.discovery in `get_service`: they take most of the package
+    # import time, which short-lived workers only pay when they build a client
+    from google.oauth2 import service_account
+
+    key = (credentials_path, tuple(scopes))
+    with _lock:
+        if key not in _credentials_cache:
+            _credentials_cache[key] = service_account.Credentials.from_service_account_file(credentials_path,
+                                                                                            scopes=scopes)
+        return _credentials_cache[key]
+
+
+def get_service(service_name: str,
+                version: str,
+                credentials=None,
+                discovery_path: str = None,
+                static_discovery: bool = True):
+    """
+    Build a googleapiclient client, once per process for each (credentials, service, version)
+
+    Args:
+        service_name: API name, e.g. 'playdeveloperreporting'
+        version: API version, e.g. 'v1beta1'
+        credentials: Credentials of the client
+        discovery_path: Path to a discovery document saved on disk, used instead of fetching it
+        static_discovery: Use the discovery document bundled with googleapiclient (no network I/O).
+            If False and no `discovery_path` is given, the document is fetched from the discovery service.
+
+    Returns:
+        googleapiclient Resource
+    """
+    from googleapiclient.discovery import build, build_from_document
+
+    key = (service_name, version, id(credentials), discovery_path, static_discovery)
+    with _lock:
+        cached = _service_cache.get(key)
+        # Credentials are keyed by id, keep a reference so the id can't be reused by another object
+        if cached is not None and cached[0] is credentials:
+            return cached[1]
+
+        if discovery_path is not None:
+            with open(discovery_path) as f:
+                service = build_from_document(f.read(), credentials=credentials)
+        else:
+            service = build(serviceName=service_name,
+                            version=version,
+                            credentials=credentials,
+                            cache_discovery=False,
+                            static_discovery=static_discovery)
+
+        _service_cache[key] = (credentials, service)
+        return service
+
+
+def get_reporting_service(credentials_path: str = None,
+                          credentials=None,
+                          version: str = "v1beta1",
+                          discovery_path: str = None,
+                          static_discovery: bool = True):
+    """
+    Get the shared playdeveloperreporting client
+
+    Args:
+        credentials_path: Path to a service account json file
+        credentials: Already loaded credentials, used instead of `credentials_path`
+        version: API version
+        discovery_path: Path to a discovery document saved on disk
+        static_discovery: Use the discovery document bundled with googleapiclient
+
+    Returns:
+        Tuple of (credentials, googleapiclient Resource)
+    """
+    if credentials is None:
+        credentials = get_credentials(credentials_path, REPORTING_SCOPES)
+    service = get_service("playdeveloperreporting",
+                          version,
+                          credentials=credentials,
+                          discovery_path=discovery_path,
+                          static_discovery=static_discovery)
+    return credentials, service
+
+
+def get_publisher_service(credentials_path: str = None,
+                          credentials=None,
+                          version: str = "v3",
+                          discovery_path: str = None,
+                          static_discovery: bool = True):
+    """
+    Get the shared androidpublisher client
+
+    Args:
+        credentials_path: Path to a service account json file
+        credentials: Already loaded credentials, used instead of `credentials_path`
+        version: API version
+        discovery_path: Path to a discovery document saved on disk
+        static_discovery: Use the discovery document bundled with googleapiclient
+
+    Returns:
+        Tuple of (credentials, googleapiclient Resource)
+    """
+    if credentials is None:
+        credentials = get_credentials(credentials_path, PUBLISHER_SCOPES)
+    service = get_service("androidpublisher",
+                          version,
+                          credentials=credentials,
+                          discovery_path=discovery_path,
+                          static_discovery=static_discovery)
+    return credentials, service
+
+
+def clear_cache():
+    """
+    Drop all cached credentials and clients
+    """
+    with _lock:
+        _credentials_cache.clear()
+        _service_cache.clear()
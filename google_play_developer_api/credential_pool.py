@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+
+from google_play_developer_api.client import REPORTING_SCOPES, get_credentials
+from google_play_developer_api.scheduler import TokenBucket
+
+
+class PooledCredentials:
+    def __init__(self, credentials, name: str, requests_per_second: float = None):
+        """
+        One credentials of a pool, with its own request rate and the apps it can't access
+
+        Args:
+            credentials: Credentials
+            name: Name used in logs and stats, e.g. the credentials file path
+            requests_per_second: Request rate of these credentials, unlimited if None
+        """
+        self.credentials = credentials
+        self.name = name
+        self.rate_limiter = TokenBucket(rate=requests_per_second) if requests_per_second else None
+        self.denied_apps = set()
+        self.requests = 0
+        self.errors = 0
+        self.quota_errors = 0
+        # time.monotonic() until which the credentials are paused after a quota error, with or without a rate limit
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float):
+        """
+        Stop sending requests with these credentials for a while
+
+        Args:
+            seconds: Pause duration
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def pause_time(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def wait_time(self) -> float:
+        bucket_wait = 0.0 if self.rate_limiter is None else self.rate_limiter.wait_time()
+        return max(self.pause_time(), bucket_wait)
+
+
+class CredentialPool:
+    def __init__(self,
+                 credentials_paths: list[str] = None,
+                 credentials: list = None,
+                 requests_per_second: float = 10,
+                 scopes: list[str] = None,
+                 quota_cooldown: float = 60):
+        """
+        Spread requests over several service accounts (and their Google Cloud projects), each with its own quota
+
+        Each request goes to the credentials whose rate limiter can serve it first, among the ones not known to be
+        denied access to the app of the request. A permission error (403) marks the app as denied for those
+        credentials and the request is sent again with other credentials, so each app ends up routed to the
+        accounts that have access to it. A quota error pauses the credentials for `quota_cooldown` seconds
+        (or the server's `Retry-After`) and the request fails over to the next credentials.
+
+        Args:
+            credentials_paths: Paths to service account json files
+            credentials: Already loaded credentials, used instead of `credentials_paths`
+            requests_per_second: Request rate of each credentials (the Reporting API quota is per project),
+                unlimited if None
+            scopes: OAuth scopes used with `credentials_paths`, the Reporting API scopes if None
+            quota_cooldown: Pause of credentials after a quota error without `Retry-After` (seconds)
+        """
+        if credentials is not None:
+            named = [(item, f"credentials-{i}") for i, item in enumerate(credentials)]
+        elif credentials_paths:
+            scopes = REPORTING_SCOPES if scopes is None else scopes
+            named = [(get_credentials(path, scopes), path) for path in credentials_paths]
+        else:
+            raise ValueError("CredentialPool needs credentials_paths or credentials")
+        if not named:
+            raise ValueError("CredentialPool needs at least one credentials")
+
+        self.members = [PooledCredentials(item, name, requests_per_second) for item, name in named]
+        self._quota_cooldown = quota_cooldown
+        self._lock = threading.Lock()
+
+    @property
+    def credentials(self):
+        """
+        Credentials of the first member, used to build the API client
+        """
+        return self.members[0].credentials
+
+    def _candidates(self, app_package_name: str, exclude: list) -> list:
+        candidates = [member for member in self.members if member not in exclude]
+        allowed = [member for member in candidates if app_package_name not in member.denied_apps]
+        # When every remaining member was denied before, check again: access may have been granted since
+        if not allowed and not exclude:
+            return candidates
+        return allowed
+
+    def acquire(self, app_package_name: str = None, exclude: list = None) -> PooledCredentials:
+        """
+        Pick the credentials of a request and take a token of its rate limiter
+
+        Args:
+            app_package_name: App of the request, None if unknown (e.g. a batch request)
+            exclude: Members already tried for this request
+
+        Returns:
+            PooledCredentials, None if no member is left
+        """
+        exclude = exclude or []
+        with self._lock:
+            candidates = self._candidates(app_package_name, exclude)
+            if not candidates:
+                return None
+            # Least loaded first: shortest wait for a token, then fewest requests
+            member = min(candidates, key=lambda candidate: (candidate.wait_time(), candidate.requests))
+            member.requests += 1
+
+        # Every candidate may be paused: wait for the least loaded one rather than failing the request
+        pause_time = member.pause_time()
+        if pause_time > 0:
+            time.sleep(pause_time)
+        if member.rate_limiter is not None:
+            member.rate_limiter.acquire()
+        return member
+
+    def report_denied(self, member: PooledCredentials, app_package_name: str):
+        """
+        Record that credentials can't access an app
+
+        Args:
+            member: Credentials of the failed request
+            app_package_name: App of the request
+        """
+        with self._lock:
+            member.errors += 1
+            if app_package_name is not None:
+                member.denied_apps.add(app_package_name)
+        logging.warning(f"Permission denied for {app_package_name} with {member.name}")
+
+    def report_quota(self, member: PooledCredentials, retry_after: float = None):
+        """
+        Pause credentials that exceeded their quota
+
+        Args:
+            member: Credentials of the failed request
+            retry_after: Delay requested by the server (seconds), `quota_cooldown` if None
+        """
+        with self._lock:
+            member.errors += 1
+            member.quota_errors += 1
+        cooldown = self._quota_cooldown if retry_after is None else retry_after
+        member.pause(cooldown)
+        logging.warning(f"Quota exceeded for {member.name}, paused for {cooldown:.0f}s")
+
+    def report_error(self, member: PooledCredentials):
+        with self._lock:
+            member.errors += 1
+
+    def has_candidate(self, app_package_name: str = None, exclude: list = None) -> bool:
+        """
+        Check whether credentials are left to send a request to
+
+        Args:
+            app_package_name: App of the request
+            exclude: Members already tried for this request
+
+        Returns:
+            True if `acquire` would return a member
+        """
+        with self._lock:
+            return bool(self._candidates(app_package_name, exclude or []))
+
+    def stats(self) -> dict:
+        """
+        Get the request counts of each credentials
+
+        Returns:
+            Dict {name: {'requests', 'errors', 'quota_errors', 'denied_apps'}}
+        """
+        with self._lock:
+            return {member.name: {"requests": member.requests,
+                                  "errors": member.errors,
+                                  "quota_errors": member.quota_errors,
+                                  "denied_apps": sorted(member.denied_apps)}
+                    for member in self.members}
@@ -0,0 +1,282 @@
+import contextlib
+import math
+import threading
+import time
+from typing import Callable
+
+# Spans, counters and histograms emitted by the report classes:
+#   spans: 'request' (one HTTP attempt), 'page' (one page with its retries), 'parse', 'freshness', 'search_page',
+#          'reviews_page'
+#   counters: 'bytes_received', 'rows', 'retry', 'request.http_errors', '<span>.count', '<span>.errors'
+#   histograms: '<span>.duration' (seconds), 'page.rows', 'response.bytes'
+
+
+class Instrumentation:
+    """
+    Instrumentation surface of the report classes. This base class does nothing and costs nothing,
+    subclasses record or export what they receive.
+    """
+    enabled = False
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Time a block of work
+
+        Args:
+            name: Span name
+            **attributes: Span attributes
+
+        Yields:
+            Attributes dict, which the block can complete (e.g. with a row count)
+        """
+        yield attributes
+
+    def count(self, name: str, value: float = 1, **attributes):
+        """
+        Add to a counter
+
+        Args:
+            name: Counter name
+            value: Increment
+            **attributes: Attributes of the increment
+        """
+
+    def observe(self, name: str, value: float, **attributes):
+        """
+        Record a value in a histogram
+
+        Args:
+            name: Histogram name
+            value: Value
+            **attributes: Attributes of the value
+        """
+
+    def event(self, name: str, **attributes):
+        """
+        Record a point-in-time event, e.g. a retry
+
+        Args:
+            name: Event name
+            **attributes: Event attributes
+        """
+
+
+class Histogram:
+    def __init__(self):
+        """
+        Histogram with logarithmic buckets (powers of 2), exact count, sum, min and max
+        """
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        bucket = math.ceil(math.log2(value)) if value > 0 else None
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Approximate percentile: upper bound of the bucket holding it, capped by the max
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Value
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets, key=lambda b: -math.inf if b is None else b):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 0.0 if bucket is None else min(2.0 ** bucket, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRecorder(Instrumentation):
+    enabled = True
+
+    def __init__(self, listeners: list[Callable[[dict], None]] = None):
+        """
+        Thread-safe in-process counters and histograms, with optional callbacks receiving every span and event
+
+        Args:
+            listeners: Functions called with a dict for each finished span
+                ({'type': 'span', 'name', 'duration', 'error', 'attributes'}) and event
+                ({'type': 'event', 'name', 'attributes'})
+        """
+        self.listeners = list(listeners or [])
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def _notify(self, record: dict):
+        for listener in self.listeners:
+            listener(record)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        started_at = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - started_at
+            self.count(f"{name}.count")
+            if error is not None:
+                self.count(f"{name}.errors")
+            self.observe(f"{name}.duration", duration)
+            self._notify({"type": "span", "name": name, "duration": duration,
+                          "error": None if error is None else repr(error), "attributes": attributes})
+
+    def count(self, name: str, value: float = 1, **attributes):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float, **attributes):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(value)
+
+    def event(self, name: str, **attributes):
+        self.count(name)
+        self._notify({"type": "event", "name": name, "attributes": attributes})
+
+    def snapshot(self) -> dict:
+        """
+        Export the current values
+
+        Returns:
+            Dict {'counters': {name: value}, 'histograms': {name: {count, sum, min, max, mean, p50, p95, p99}}}
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    enabled = True
+
+    def __init__(self, tracer=None, meter=None):
+        """
+        Export spans and metrics with OpenTelemetry
+
+        Args:
+            tracer: OpenTelemetry tracer, the global tracer provider's if None
+            meter: OpenTelemetry meter, the global meter provider's if None
+        """
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError("opentelemetry-api is required for OpenTelemetryInstrumentation, "
+                              "install it with `pip install opentelemetry-api`")
+
+        self._tracer = trace.get_tracer("google_play_developer_api") if tracer is None else tracer
+        self._meter = metrics.get_meter("google_play_developer_api") if meter is None else meter
+        self._lock = threading.Lock()
+        self._instruments = {}
+
+    def _instrument(self, kind: str, name: str):
+        with self._lock:
+            instrument = self._instruments.get((kind, name))
+            if instrument is None:
+                create = self._meter.create_counter if kind == "counter" else self._meter.create_histogram
+                instrument = self._instruments[(kind, name)] = create(name)
+            return instrument
+
+    @staticmethod
+    def _attributes(attributes: dict) -> dict:
+        # OpenTelemetry attributes are str, bool, int or float
+        return {key: value if isinstance(value, (str, bool, int, float)) else str(value)
+                for key, value in attributes.items() if value is not None}
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        started_at = time.perf_counter()
+        with self._tracer.start_as_current_span(name) as span:
+            try:
+                yield attributes
+            finally:
+                span.set_attributes(self._attributes(attributes))
+                self.observe(f"{name}.duration", time.perf_counter() - started_at)
+
+    def count(self, name: str, value: float = 1, **attributes):
+        self._instrument("counter", name).add(value, self._attributes(attributes))
+
+    def observe(self, name: str, value: float, **attributes):
+        self._instrument("histogram", name).record(value, self._attributes(attributes))
+
+    def event(self, name: str, **attributes):
+        from opentelemetry import trace
+
+        trace.get_current_span().add_event(name, self._attributes(attributes))
+        self.count(name, **attributes)
+
+
+class InstrumentedHttp:
+    def __init__(self, http, instrumentation: Instrumentation, **attributes):
+        """
+        Wrap an httplib2-like object to time each HTTP attempt and count received bytes
+
+        Args:
+            http: httplib2-like object
+            instrumentation: Instrumentation receiving the measures
+            **attributes: Attributes of the emitted spans
+        """
+        self._http = http
+        self._instrumentation = instrumentation
+        self._attributes = attributes
+
+    def request(self, uri: str, method: str = "GET", *args, **kwargs):
+        with self._instrumentation.span("request", method=method, **self._attributes) as attributes:
+            resp, content = self._http.request(uri, method, *args, **kwargs)
+            attributes["status"] = resp.status
+            attributes["bytes"] = len(content)
+        if resp.status >= 400:
+            self._instrumentation.count("request.http_errors", status=resp.status)
+        self._instrumentation.count("bytes_received", len(content))
+        self._instrumentation.observe("response.bytes", len(content))
+        return resp, content
+
+    def __getattr__(self, name):
+        # credentials, timeout, ... of the wrapped object
+        return getattr(self._http, name)
+
+
+# Shared no-op instance used when no instrumentation is given
+null_instrumentation = Instrumentation()
@@ -1,17 +1,73 @@
-from .anr_rate import AnrRateReport
-from .crash_rate import CrashRateReport
-from .error_count import ErrorCountReport
-from .excessive_wake_up_rate import ExcessiveWakeUpRateReport
-from .slow_start_rate import SlowStartRateReport
-from .slow_rendering_rate import SlowRenderingRateReport
-from .stuck_background_wake_lock_rate import StuckBackgroundWakelockRateReport
-
-mapping = {
-    "anr_rate": AnrRateReport,
-    "crash_rate": CrashRateReport,
-    "error_count": ErrorCountReport,
-    "excessive_wake_up_rate": ExcessiveWakeUpRateReport,
-    "slow_rendering_rate": SlowRenderingRateReport,
-    "slow_start_rate": SlowStartRateReport,
-    "stuck_background_wake_lock_rate": StuckBackgroundWakelockRateReport
+import importlib
+from typing import TYPE_CHECKING
+
+# Report classes are imported on first access (PEP 562), so `import google_play_developer_api.report` stays cheap
+# for short-lived workers that only use a few of them
+_exports = {
+    "AnomaliesReport": ".anomalies",
+    "AnomalyPoller": ".anomalies",
+    "AnrRateReport": ".anr_rate",
+    "BatchReportFetcher": ".batch",
+    "ReportJob": ".batch",
+    "ResponseCache": ".cache",
+    "CheckpointStore": ".checkpoint",
+    "CrashRateReport": ".crash_rate",
+    "ErrorCountReport": ".error_count",
+    "ErrorIssuesReport": ".error_issues",
+    "ErrorReportsReport": ".error_reports",
+    "ExcessiveWakeUpRateReport": ".excessive_wake_up_rate",
+    "QueryPlan": ".planner",
+    "QueryPlanner": ".planner",
+    "ReportRollup": ".rollup",
+    "SlowStartRateReport": ".slow_start_rate",
+    "SlowRenderingRateReport": ".slow_rendering_rate",
+    "StuckBackgroundWakelockRateReport": ".stuck_background_wake_lock_rate",
+    "IncrementalSync": ".sync",
+}
+
+# Key of `mapping` to report class name
+_mapping_names = {
+    "anr_rate": "AnrRateReport",
+    "crash_rate": "CrashRateReport",
+    "error_count": "ErrorCountReport",
+    "excessive_wake_up_rate": "ExcessiveWakeUpRateReport",
+    "slow_rendering_rate": "SlowRenderingRateReport",
+    "slow_start_rate": "SlowStartRateReport",
+    "stuck_background_wake_lock_rate": "StuckBackgroundWakelockRateReport"
 }
+
+__all__ = [*_exports, "mapping"]
+
+if TYPE_CHECKING:
+    from .anomalies import AnomaliesReport, AnomalyPoller
+    from .anr_rate import AnrRateReport
+    from .batch import BatchReportFetcher, ReportJob
+    from .cache import ResponseCache
+    from .checkpoint import CheckpointStore
+    from .crash_rate import CrashRateReport
+    from .error_count import ErrorCountReport
+    from .error_issues import ErrorIssuesReport
+    from .error_reports import ErrorReportsReport
+    from .excessive_wake_up_rate import ExcessiveWakeUpRateReport
+    from .planner import QueryPlan, QueryPlanner
+    from .rollup import ReportRollup
+    from .slow_start_rate import SlowStartRateReport
+    from .slow_rendering_rate import SlowRenderingRateReport
+    from .stuck_background_wake_lock_rate import StuckBackgroundWakelockRateReport
+    from .sync import IncrementalSync
+
+
+def __getattr__(name: str):
+    if name == "mapping":
+        # Plain dict of key to report class, built on first access since it imports the metric set reports
+        value = {key: __getattr__(class_name) for key, class_name in _mapping_names.items()}
+    elif name in _exports:
+        value = getattr(importlib.import_module(_exports[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Next accesses don't go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,149 @@
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from google_play_developer_api.report.base_search import BaseSearchService
+from google_play_developer_api.state import JsonStateStore
+
+
+class AnomaliesReport(BaseSearchService):
+    def __init__(self, credentials_path: str = None, **kwargs):
+        super().__init__(credentials_path=credentials_path, **kwargs)
+        self._metric_set = "anomalies"
+
+    @staticmethod
+    def _active_between_filter(start_time: datetime.datetime = None, end_time: datetime.datetime = None) -> str:
+        """
+        Build an `activeBetween` filter expression
+
+        Args:
+            start_time: Start time in UTC, unbounded if None
+            end_time: End time in UTC (exclusive), unbounded if None
+
+        Returns:
+            Filter expression
+        """
+        bounds = [f'"{value.strftime("%Y-%m-%dT%H:%M:%SZ")}"' if value is not None else "UNBOUNDED"
+                  for value in (start_time, end_time)]
+        return f"activeBetween({bounds[0]}, {bounds[1]})"
+
+    def list_anomalies(
+        self,
+        app_package_name: str = "",
+        active_since: datetime.datetime = None,
+        active_until: datetime.datetime = None,
+        filter: str = None,
+        fields: list[str] = None,
+        page_size: int = 100,
+        retry_count: int = None,
+        sleep_time: int = None,
+        raise_on_denied: bool = False,
+    ) -> Iterator[dict]:
+        """
+        List anomalies detected in the metric sets of an app
+
+        Pages are requested lazily, as the iterator is consumed.
+
+        Args:
+            app_package_name: App package name
+            active_since: Only anomalies active at or after this time (UTC)
+            active_until: Only anomalies active before this time (UTC)
+            filter: Filter expression, used instead of `active_since`/`active_until`
+            fields: Anomaly fields to return, e.g. ['name', 'metricSet', 'metric'], all fields if None
+            page_size: Page size (max 100)
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+            raise_on_denied: Raise permission errors (403) instead of logging them and yielding no anomalies
+
+        Yields:
+            Anomaly dicts
+        """
+        if filter is None and (active_since is not None or active_until is not None):
+            filter = self._active_between_filter(active_since, active_until)
+
+        return self._iter_search(resource=self._metric_set,
+                                 items_key="anomalies",
+                                 app_package_name=app_package_name,
+                                 params={"filter": filter} if filter else {},
+                                 fields=fields,
+                                 page_size=page_size,
+                                 retry_count=retry_count,
+                                 sleep_time=sleep_time,
+                                 method="list",
+                                 raise_on_denied=raise_on_denied)
+
+
+class AnomalyPoller:
+    def __init__(self,
+                 report: AnomaliesReport,
+                 state_store: JsonStateStore,
+                 lookback: datetime.timedelta = datetime.timedelta(days=7),
+                 max_workers: int = 16):
+        """
+        Poll anomalies of many apps and report only the ones not seen by a previous poll
+
+        Each poll lists, for every app, the anomalies active during the last `lookback` (one request per app
+        for up to 100 anomalies), and compares their names with the ones stored by the previous poll. Only names
+        still inside the lookback window are kept, so the state stays small whatever the polling frequency.
+        The lookback covers anomalies detected some time after the data they are about.
+
+        Args:
+            report: AnomaliesReport instance
+            state_store: Store keeping the names of seen anomalies between runs
+            lookback: Window of activity of listed anomalies
+            max_workers: Number of apps polled concurrently
+        """
+        self._report = report
+        self._state_store = state_store
+        self._lookback = lookback
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _state_key(app_package_name: str) -> str:
+        return f"{app_package_name}/anomalies"
+
+    def _list_app(self, app_package_name: str, active_since: datetime.datetime):
+        try:
+            # A denied app must fail: listing it as "no anomalies" would forget the seen ones and report them again
+            return list(self._report.list_anomalies(app_package_name=app_package_name,
+                                                    active_since=active_since,
+                                                    raise_on_denied=True))
+        except Exception as e:
+            logging.warning(f"Failed to list anomalies for {app_package_name}: {e}")
+            return e
+
+    def poll(self, app_package_names: list[str]) -> dict:
+        """
+        List new anomalies of many apps concurrently
+
+        On the first poll of an app, every anomaly active during the lookback window is new.
+
+        Args:
+            app_package_names: App package names
+
+        Returns:
+            Dict {app_package_name: list of new anomaly dicts}. Failed apps, including the ones denied (403),
+            map to the exception and keep their previous state.
+        """
+        active_since = datetime.datetime.utcnow() - self._lookback
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            responses = list(executor.map(lambda app_package_name: self._list_app(app_package_name, active_since),
+                                          app_package_names))
+
+        result = {}
+        seen_names = {}
+        for app_package_name, anomalies in zip(app_package_names, responses):
+            if isinstance(anomalies, Exception):
+                result[app_package_name] = anomalies
+                continue
+
+            key = self._state_key(app_package_name)
+            previous_names = set(self._state_store.get(key, []))
+            result[app_package_name] = [anomaly for anomaly in anomalies if anomaly["name"] not in previous_names]
+            seen_names[key] = sorted(anomaly["name"] for anomaly in anomalies)
+
+        # One write for the whole poll
+        if seen_names:
+            self._state_store.update(seen_names)
+        return result
@@ -2,8 +2,8 @@ from google_play_developer_api.report.base_report import BaseReportingService
 
 
 class AnrRateReport(BaseReportingService):
-    def __init__(self, credentials_path: str):
-        super().__init__(credentials_path=credentials_path)
+    def __init__(self, credentials_path: str = None, **kwargs):
+        super().__init__(credentials_path=credentials_path, **kwargs)
         self._default_dimensions = [
             "apiLevel",
             "deviceBrand",
@@ -0,0 +1,278 @@
+"""Backfill report data of many apps and metric sets into partitioned files.
+
+Usage:
+    python -m google_play_developer_api.report.backfill --credentials-path credentials.json \
+        --apps com.example.app1,com.example.app2 --metric-sets crash_rate,anr_rate \
+        --start-date 2024-01-01 --end-date 2025-01-01 --output-dir backfill --requests-per-second 10
+"""
+import argparse
+import datetime
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable
+
+from google_play_developer_api.report.batch import BatchReportFetcher
+from google_play_developer_api.report.export import is_partition_done, partition_path
+from google_play_developer_api.scheduler import RequestScheduler, TokenBucket
+
+
+@dataclass
+class BackfillJob:
+    """
+    Export of one (app, metric set, day) partition
+
+    Args:
+        app_package_name: App package name
+        metric_set: Key of `report.mapping` or metric set name
+        date: Day (format: YYYY-MM-DD)
+    """
+    app_package_name: str
+    metric_set: str
+    date: str
+
+
+@dataclass
+class BackfillSummary:
+    """
+    Outcome of a backfill
+
+    Args:
+        total_jobs: Number of partitions in the requested range
+        succeeded: Partitions written by this run
+        skipped: Partitions already written by a previous run
+        failed: Partitions that failed
+        unavailable: Partitions after the latest available data (freshness)
+        rows: Rows written
+        seconds: Duration
+        failures: Failed jobs with their error
+    """
+    total_jobs: int = 0
+    succeeded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    unavailable: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    failures: list[tuple[BackfillJob, str]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "total_jobs": self.total_jobs,
+            "succeeded": self.succeeded,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "unavailable": self.unavailable,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 1),
+            "failures": [{"app_package_name": job.app_package_name, "metric_set": job.metric_set, "date": job.date,
+                          "error": error} for job, error in self.failures],
+        }
+
+
+class Backfill:
+    def __init__(self,
+                 fetcher: BatchReportFetcher,
+                 output_dir: str,
+                 aggregation_period: str = "HOURLY",
+                 file_format: str = "parquet",
+                 max_workers: int = 8,
+                 on_progress: Callable[[int, int, BackfillJob, object], None] = None):
+        """
+        Backfill a grid of apps x metric sets x days with `export`, on a thread pool
+
+        The valid range of each (app, metric set) ends at its freshness, so no request is spent on days without
+        data yet. Every report of the fetcher shares its scheduler, whose rate limiter is the global quota budget
+        of all workers. Days already exported are skipped, so a backfill run again continues where it stopped.
+
+        Args:
+            fetcher: Fetcher holding the report instances, created with the scheduler enforcing the quota
+            output_dir: Root output directory
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            file_format: One of ['parquet', 'ndjson', 'csv']
+            max_workers: Number of partitions exported concurrently
+            on_progress: Function called after each job with (finished jobs, total jobs, job, rows or exception)
+        """
+        self._fetcher = fetcher
+        self._output_dir = output_dir
+        self._aggregation_period = aggregation_period
+        self._file_format = file_format
+        self._max_workers = max_workers
+        self._on_progress = on_progress
+
+    def _available_until(self, app_package_names: list[str], metric_set: str) -> dict:
+        """
+        Get the end (exclusive) of the last full day available for each app
+
+        Returns:
+            Dict {app_package_name: datetime or exception}
+        """
+        report = self._fetcher.get_report(metric_set)
+        freshnesses = report.get_freshnesses_bulk(app_package_names, metric_sets=[report._metric_set])
+
+        result = {}
+        for app_package_name in app_package_names:
+            freshness = freshnesses[app_package_name][report._metric_set]
+            if isinstance(freshness, Exception):
+                result[app_package_name] = freshness
+                continue
+            latest_end_time = report._latest_end_time(freshness, self._aggregation_period)
+            if latest_end_time is None:
+                result[app_package_name] = datetime.datetime.min
+                continue
+            result[app_package_name] = datetime.datetime.combine(latest_end_time.date(), datetime.time())
+        return result
+
+    def plan(self,
+             app_package_names: list[str],
+             metric_sets: list[str],
+             start_date: str,
+             end_date: str,
+             summary: BackfillSummary = None) -> list[BackfillJob]:
+        """
+        Build the job grid, without the partitions already written or not available yet
+
+        Args:
+            app_package_names: App package names
+            metric_sets: Keys of `report.mapping` or metric set names
+            start_date: First day (format: YYYY-MM-DD)
+            end_date: End day, exclusive (format: YYYY-MM-DD)
+            summary: Summary counting the partitions left out, if any
+
+        Returns:
+            Jobs to run
+        """
+        summary = BackfillSummary() if summary is None else summary
+        start_time = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        end_time = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+        days = []
+        day = start_time
+        while day < end_time:
+            days.append(day)
+            day += datetime.timedelta(days=1)
+
+        jobs = []
+        for metric_set in metric_sets:
+            report_metric_set = self._fetcher.get_report(metric_set)._metric_set
+            available_until = self._available_until(app_package_names, metric_set)
+            for app_package_name in app_package_names:
+                for day in days:
+                    summary.total_jobs += 1
+                    job = BackfillJob(app_package_name, metric_set, day.strftime("%Y-%m-%d"))
+                    if isinstance(available_until[app_package_name], Exception):
+                        summary.failed += 1
+                        summary.failures.append((job, f"Freshness: {available_until[app_package_name]}"))
+                    elif day + datetime.timedelta(days=1) > available_until[app_package_name]:
+                        summary.unavailable += 1
+                    elif is_partition_done(partition_path(self._output_dir, app_package_name, report_metric_set,
+                                                          job.date)):
+                        summary.skipped += 1
+                    else:
+                        jobs.append(job)
+        return jobs
+
+    def _run_job(self, job: BackfillJob, **kwargs) -> int:
+        report = self._fetcher.get_report(job.metric_set)
+        end_date = (datetime.datetime.strptime(job.date, "%Y-%m-%d") + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+        written = report.export(app_package_name=job.app_package_name,
+                                output_dir=self._output_dir,
+                                start_time=job.date,
+                                end_time=end_date,
+                                aggregation_period=self._aggregation_period,
+                                file_format=self._file_format,
+                                check_freshness=False,  # plan only keeps days before the freshness
+                                **kwargs)
+        return sum(written.values())
+
+    def run(self,
+            app_package_names: list[str],
+            metric_sets: list[str],
+            start_date: str,
+            end_date: str,
+            **kwargs) -> BackfillSummary:
+        """
+        Run the backfill
+
+        Args:
+            app_package_names: App package names
+            metric_sets: Keys of `report.mapping` or metric set names
+            start_date: First day (format: YYYY-MM-DD)
+            end_date: End day, exclusive (format: YYYY-MM-DD)
+            kwargs: Extra arguments passed to `export` (dimensions, metrics, page_size, ...)
+
+        Returns:
+            BackfillSummary
+        """
+        started_at = time.monotonic()
+        summary = BackfillSummary()
+        jobs = self.plan(app_package_names, metric_sets, start_date, end_date, summary=summary)
+        logging.info(f"Backfill: {len(jobs)} partitions to export, {summary.skipped} already done, "
+                     f"{summary.unavailable} not available yet")
+
+        lock = threading.Lock()
+        finished = 0
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(self._run_job, job, **kwargs): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.warning(f"Backfill of {job.metric_set} for {job.app_package_name} on {job.date} "
+                                    f"failed: {e}")
+                    result = e
+                with lock:
+                    finished += 1
+                    if isinstance(result, Exception):
+                        summary.failed += 1
+                        summary.failures.append((job, repr(result)))
+                    else:
+                        summary.succeeded += 1
+                        summary.rows += result
+                logging.info(f"Backfill [{finished}/{len(jobs)}] {job.metric_set} {job.app_package_name} {job.date}")
+                if self._on_progress is not None:
+                    self._on_progress(finished, len(jobs), job, result)
+
+        summary.seconds = time.monotonic() - started_at
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--credentials-path", required=True)
+    parser.add_argument("--apps", required=True, help="Comma separated app package names")
+    parser.add_argument("--metric-sets", default=None,
+                        help="Comma separated keys of report.mapping, all metric sets if not set")
+    parser.add_argument("--start-date", required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end-date", required=True, help="End day, exclusive (YYYY-MM-DD)")
+    parser.add_argument("--aggregation-period", choices=["HOURLY", "DAILY"], default="HOURLY")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--file-format", choices=["parquet", "ndjson", "csv"], default="parquet")
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--requests-per-second", type=float, default=10,
+                        help="Global request budget shared by all workers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    from google_play_developer_api.report import mapping
+
+    scheduler = RequestScheduler(rate_limiter=TokenBucket(rate=args.requests_per_second))
+    fetcher = BatchReportFetcher(credentials_path=args.credentials_path, scheduler=scheduler)
+    backfill = Backfill(fetcher,
+                        output_dir=args.output_dir,
+                        aggregation_period=args.aggregation_period,
+                        file_format=args.file_format,
+                        max_workers=args.max_workers)
+    summary = backfill.run(app_package_names=args.apps.split(","),
+                           metric_sets=args.metric_sets.split(",") if args.metric_sets else list(mapping),
+                           start_date=args.start_date,
+                           end_date=args.end_date)
+    print(json.dumps(summary.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,222 @@
 import logging
-import time
+import re
 import datetime
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Iterator, Union
 from googleapiclient.errors import HttpError
 
+from google_play_developer_api.client import REPORTING_SCOPES, get_credentials, get_reporting_service
+from google_play_developer_api.credential_pool import CredentialPool
+from google_play_developer_api.instrumentation import Instrumentation, InstrumentedHttp
+from google_play_developer_api.scheduler import PERMANENT, RequestScheduler
+from google_play_developer_api.service import BaseService
+from google_play_developer_api.report.cache import ResponseCache
+from google_play_developer_api.report.checkpoint import CheckpointStore
+from google_play_developer_api.report.columnar import OUTPUT_FORMATS, concat_tables, pages_to_table
+from google_play_developer_api.report.export import is_partition_done, partition_path, write_partition
+from google_play_developer_api.report.parser import RowDecoder, decode_rows
 
-class BaseReportingService:
-    def __init__(self, credentials_path: str):
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path, scopes=["https://www.googleapis.com/auth/playdeveloperreporting"]
-        )
-        self._reporting_service = build(serviceName="playdeveloperreporting",
-                                        version="v1beta1",
-                                        credentials=credentials,
-                                        cache_discovery=False)
-
-        self._metric_sets = {
-            'anomalies': self._reporting_service.anomalies(),
-            'anrRateMetricSet': self._reporting_service.vitals().anrrate(),
-            'crashRateMetricSet': self._reporting_service.vitals().crashrate(),
-            'errorCountMetricSet': self._reporting_service.vitals().errors().counts(),
-            'errorIssues': self._reporting_service.vitals().errors().issues(),
-            'errorReports': self._reporting_service.vitals().errors().reports(),
-            'excessiveWakeupRateMetricSet': self._reporting_service.vitals().excessivewakeuprate(),
-            'slowRenderingRateMetricSet': self._reporting_service.vitals().slowrenderingrate(),
-            'slowStartRateMetricSet': self._reporting_service.vitals().slowstartrate(),
-            'stuckBackgroundWakelockRateMetricSet': self._reporting_service.vitals().stuckbackgroundwakelockrate(),
+SHARD_SIZES = {
+    "DAY": datetime.timedelta(days=1),
+    "WEEK": datetime.timedelta(weeks=1),
+}
+
+_metric_sets_cache = weakref.WeakKeyDictionary()
+
+
+def _build_metric_sets(reporting_service) -> dict:
+    """
+    Get the resources of each metric set, built once per client
+
+    Args:
+        reporting_service: playdeveloperreporting client
+
+    Returns:
+        Dict of metric set name to googleapiclient Resource
+    """
+    metric_sets = _metric_sets_cache.get(reporting_service)
+    if metric_sets is None:
+        metric_sets = {
+            'anomalies': reporting_service.anomalies(),
+            'anrRateMetricSet': reporting_service.vitals().anrrate(),
+            'crashRateMetricSet': reporting_service.vitals().crashrate(),
+            'errorCountMetricSet': reporting_service.vitals().errors().counts(),
+            'errorIssues': reporting_service.vitals().errors().issues(),
+            'errorReports': reporting_service.vitals().errors().reports(),
+            'excessiveWakeupRateMetricSet': reporting_service.vitals().excessivewakeuprate(),
+            'slowRenderingRateMetricSet': reporting_service.vitals().slowrenderingrate(),
+            'slowStartRateMetricSet': reporting_service.vitals().slowstartrate(),
+            'stuckBackgroundWakelockRateMetricSet': reporting_service.vitals().stuckbackgroundwakelockrate(),
         }
+        _metric_sets_cache[reporting_service] = metric_sets
+    return metric_sets
 
-    def _query(
+
+class BaseReportingClient(BaseService):
+    def __init__(self,
+                 credentials_path: Union[str, list[str]] = None,
+                 credentials=None,
+                 reporting_service=None,
+                 api_version: str = "v1beta1",
+                 discovery_path: str = None,
+                 static_discovery: bool = True,
+                 scheduler: RequestScheduler = None,
+                 http=None,
+                 instrumentation: Instrumentation = None,
+                 credential_pool: CredentialPool = None):
+        """
+        playdeveloperreporting client and request plumbing shared by the metric set reports and the search/list
+        resources (error issues, error reports, anomalies)
+
+        Credentials and clients are cached process-wide, so creating several report instances
+        with the same credentials loads the credentials file and builds the client only once.
+
+        Args:
+            credentials_path: Path to a service account json file, or a list of paths to spread requests over
+                several service accounts (see `credential_pool`)
+            credentials: Already loaded credentials, used instead of `credentials_path`
+            reporting_service: Already built playdeveloperreporting client to share between report instances
+            api_version: playdeveloperreporting API version
+            discovery_path: Path to a discovery document saved on disk, used instead of the bundled one
+            static_discovery: Use the discovery document bundled with googleapiclient (no network I/O)
+            scheduler: Rate limiter and retry policy of API calls, the process-wide default scheduler if None
+            http: Thread-safe httplib2-like transport shared by all threads, e.g. `transport.PooledHttp`.
+                If None, each thread gets its own httplib2 transport.
+            instrumentation: Receives spans, counters and histograms of requests, pages, retries, parsing and
+                freshness calls, e.g. `instrumentation.MetricsRecorder()`. Nothing is recorded if None.
+            credential_pool: Several credentials sharing the requests, with a rate limiter each, routing of apps to
+                the credentials that can access them and failover on quota errors. Share one pool between report
+                instances so they share what it learned.
+        """
+        if isinstance(credentials_path, (list, tuple)):
+            credential_pool = CredentialPool(credentials_paths=credentials_path)
+            credentials_path = None
+        if credential_pool is not None and credentials is None:
+            credentials = credential_pool.credentials
+
+        if reporting_service is None:
+            credentials, reporting_service = get_reporting_service(credentials_path=credentials_path,
+                                                                   credentials=credentials,
+                                                                   version=api_version,
+                                                                   discovery_path=discovery_path,
+                                                                   static_discovery=static_discovery)
+        elif credentials is None and credentials_path is not None:
+            credentials = get_credentials(credentials_path, REPORTING_SCOPES)
+        super().__init__(credentials=credentials, scheduler=scheduler, http=http, instrumentation=instrumentation,
+                         credential_pool=credential_pool)
+
+        self._reporting_service = reporting_service
+        self._metric_sets = _build_metric_sets(self._reporting_service)
+
+    def _execute_batch(self, requests: list) -> list:
+        """
+        Execute several API requests in one batch HTTP request
+
+        Args:
+            requests: googleapiclient HttpRequests
+
+        Returns:
+            List with one response dict (or exception) per request
+        """
+        results = [None] * len(requests)
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = response if exception is None else exception
+
+        batch = self._reporting_service.new_batch_http_request(callback=callback)
+        for i, request in enumerate(requests):
+            batch.add(request, request_id=str(i))
+
+        # Requests of a batch may be about different apps, the batch goes to any credentials of the pool
+        member = self._credential_pool.acquire() if self._credential_pool is not None else None
+        http = self._get_http(member)
+        if http is None:
+            batch.execute()
+        elif self._instrumentation.enabled:
+            batch.execute(http=InstrumentedHttp(http, self._instrumentation, batch_size=len(requests)))
+        else:
+            batch.execute(http=http)
+        return results
+
+    def _execute_many(self,
+                      requests: list,
+                      use_batch: bool = False,
+                      batch_size: int = 100,
+                      max_workers: int = 8,
+                      description: str = "") -> list:
+        """
+        Execute many independent API requests together
+
+        Args:
+            requests: googleapiclient HttpRequests
+            use_batch: Send requests in batch HTTP requests of `batch_size` requests. Requests failing inside
+                a batch with a quota or transient error are retried one by one through the scheduler, the ones
+                failing with a permanent error (e.g. permission denied) are returned as is.
+                Otherwise requests are sent concurrently on `max_workers` threads.
+            batch_size: Number of requests per batch HTTP request
+            max_workers: Number of concurrent requests when not using batches
+            description: Description of the requests used in logs
+
+        Returns:
+            List with one response dict (or exception) per request
+        """
+        def execute_one(request):
+            try:
+                return self._scheduler.execute(functools.partial(self._execute, request),
+                                               description=description,
+                                               on_retry=self._on_retry)
+            except Exception as e:
+                return e
+
+        if not use_batch:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(execute_one, requests))
+
+        results = []
+        for i in range(0, len(requests), batch_size):
+            chunk = requests[i:i + batch_size]
+            try:
+                # Each request of a batch counts against the quota
+                chunk_results = self._scheduler.execute(functools.partial(self._execute_batch, chunk),
+                                                        description=description,
+                                                        on_retry=self._on_retry,
+                                                        cost=len(chunk))
+            except Exception as e:
+                chunk_results = [e] * len(chunk)
+
+            for request, result in zip(chunk, chunk_results):
+                if isinstance(result, Exception) and self._scheduler.retry_policy.classify(result) != PERMANENT:
+                    result = execute_one(request)
+                results.append(result)
+
+        return results
+
+
+class BaseReportingService(BaseReportingClient):
+    def __init__(self,
+                 credentials_path: Union[str, list[str]] = None,
+                 cache: ResponseCache = None,
+                 checkpoint_store: CheckpointStore = None,
+                 **kwargs):
+        """
+        Query API of a metric set: `get_hourly`/`get_daily`, `iter_*`, `export` and freshnesses
+
+        Args:
+            credentials_path: Path to a service account json file, or a list of paths to spread requests over
+                several service accounts
+            cache: Optional on-disk cache serving closed time buckets of `get_hourly`/`get_daily` locally
+            checkpoint_store: Optional store saving the page token and rows of `get_hourly`/`get_daily` after each
+                page, so a failed query run again resumes from its last page
+            kwargs: Arguments of `BaseReportingClient` (credentials, reporting_service, scheduler, http, ...)
+        """
+        super().__init__(credentials_path=credentials_path, **kwargs)
+        self._cache = cache
+        self._checkpoint_store = checkpoint_store
+
+    def _iter_pages(
         self,
         app_package_name: str = "",
         timeline_spec: dict = {},
@@ -37,29 +224,31 @@ class BaseReportingService:
         metrics: list[str] = [],
         metric_set: str = "",
         page_size: int = 50000,
-        retry_count: int = 3,
-        sleep_time: int = 15,
-    ) -> list[dict]:
+        retry_count: int = None,
+        sleep_time: int = None,
+        filter: str = None,
+        page_token: str = "",
+        raise_on_denied: bool = False,
+    ) -> Iterator[dict]:
         """
-        Query report data from Google Play Developer API
-
-        Note: Read this doc
-        https://developers.google.com/play/developer/reporting/reference/rest
+        Iterate over raw response pages of a report query, following `nextPageToken`
 
         Args:
             app_package_name: App package name
-            timeline_spec: Timeline spec (see docs above)
-            dimensions: Dimensions (see docs above)
-            metrics: Metrics (see docs above)
-            metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+            timeline_spec: Timeline spec
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name
             page_size: Page size
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+            filter: Filter expression on dimension values, e.g. 'countryCode = "US"'
+            page_token: Token of the first page to request, empty to start from the first page
+            raise_on_denied: Raise permission errors (403) instead of logging them and stopping
 
-        Returns:
-            List of dicts with report data
+        Yields:
+            Raw response dicts, one per page
         """
-        # GET DATA
-        page_token = ""
-        rows = []
         while True:
             body = {
                 "dimensions": dimensions,
@@ -68,104 +257,451 @@ class BaseReportingService:
                 "pageSize": page_size,
                 "pageToken": page_token
             }
+            if filter:
+                body["filter"] = filter
 
-            for i in range(retry_count):
-                try:
-                    report = self._metric_sets[metric_set].query(name=f"apps/{app_package_name}/{metric_set}",
-                                                                 body=body).execute()
-                    break
-                except HttpError as e:
-                    if e.resp.status == 403:
-                        logging.warning(f'Permission denied for {app_package_name}')
-                    elif e.resp.status == 400:
-                        logging.warning(f'Bad request for {app_package_name}, {e.reason}')
-                        raise e
-                    return []
-
-                except TimeoutError as e:
-                    raise e
-                except Exception as e:
-                    if i == retry_count - 1:
+            request = self._metric_sets[metric_set].query(name=f"apps/{app_package_name}/{metric_set}", body=body)
+            try:
+                with self._instrumentation.span("page",
+                                                app_package_name=app_package_name,
+                                                metric_set=metric_set,
+                                                page_size=page_size) as attributes:
+                    report = self._scheduler.execute(functools.partial(self._execute, request),
+                                                     retry_policy=self._retry_policy(retry_count, sleep_time),
+                                                     description=f"Query {metric_set} for {app_package_name}",
+                                                     on_retry=self._on_retry)
+                    attributes["rows"] = len(report.get("rows", []))
+                self._instrumentation.count("rows", attributes["rows"])
+                self._instrumentation.observe("page.rows", attributes["rows"])
+            except HttpError as e:
+                if e.resp.status == 403 and self._scheduler.retry_policy.classify(e) == PERMANENT:
+                    if raise_on_denied:
                         raise e
-                    else:
-                        time.sleep(sleep_time)
-                        logging.warning(f"Retry {i + 1}/{retry_count}...")
-                        continue
+                    logging.warning(f'Permission denied for {app_package_name}')
+                    return
+                if e.resp.status == 400:
+                    logging.warning(f'Bad request for {app_package_name}, {e.reason}')
+                raise e
 
-            rows.extend(report.get("rows", []))
+            yield report
             page_token = report.get("nextPageToken", "")
             if not page_token:
                 break
 
-        # PARSE DATA
-        result_list = []
-        for row in rows:
-            year = row["startTime"].get("year")
-            month = row["startTime"].get("month")
-            day = row["startTime"].get("day")
-
-            # Add hour if aggregationPeriod is HOURLY
-            if timeline_spec["aggregationPeriod"] == "HOURLY":
-                hour = row["startTime"].get("hours", "00")
-                hour = f" {hour}:00"
-            else:
-                hour = ""
+    def _parse_rows(
+        self,
+        rows: list[dict],
+        app_package_name: str,
+        timeline_spec: dict,
+        row_type: str = "dict",
+        decoder: RowDecoder = None,
+    ) -> list:
+        """
+        Parse raw report rows into flat dicts
 
-            result = {
-                "eventDate": f"{year}-{month}-{day}{hour}",
-                "timeZone": row["startTime"]["timeZone"]["id"],
-                "appPackageName": app_package_name,
-            }
+        Args:
+            rows: Raw rows of one response page
+            app_package_name: App package name
+            timeline_spec: Timeline spec the rows were queried with
+            row_type: One of ['dict', 'namedtuple']
+            decoder: Decoder shared by the pages of the query, a new one for this page if None
 
-            # dimensions
-            _dimensions = row.get("dimensions", [])
-            for dimension in _dimensions:
-                if "stringValue" in dimension:
-                    result[f'{dimension["dimension"]}'] = dimension["stringValue"]
-                elif "int64Value" in dimension:
-                    result[f'{dimension["dimension"]}'] = dimension["int64Value"]
-                else:
-                    result[f'{dimension["dimension"]}'] = ""
-            # metrics
-            _metrics = row.get("metrics", [])
-            for metric in _metrics:
-                result[f'{metric["metric"]}'] = metric["decimalValue"]["value"] if "decimalValue" in metric else ""
-
-            result_list.append(result)
+        Returns:
+            List of dicts (or namedtuples) with report data
+        """
+        with self._instrumentation.span("parse", rows=len(rows), row_type=row_type):
+            if decoder is None:
+                return decode_rows(rows, app_package_name, timeline_spec["aggregationPeriod"], row_type)
+            return decoder.decode(rows, app_package_name)
 
-        return result_list
+    def _iter_query(
+        self,
+        app_package_name: str = "",
+        timeline_spec: dict = {},
+        dimensions: list[str] = [],
+        metrics: list[str] = [],
+        metric_set: str = "",
+        page_size: int = 50000,
+        retry_count: int = None,
+        sleep_time: int = None,
+        filter: str = None,
+        row_type: str = "dict",
+        raise_on_denied: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Query report data from Google Play Developer API, yielding rows page by page
 
-    def get_freshnesses(self,
-                        app_package_name: str = None,
-                        metric_set: str = None,
-                        retry_count: int = 3,
-                        sleep_time: int = 5):
+        Only one response page is held in memory at a time, so callers can start consuming rows
+        while the following pages are still being requested.
+
+        Args:
+            app_package_name: App package name
+            timeline_spec: Timeline spec (see `_query`)
+            dimensions: Dimensions (see `_query`)
+            metrics: Metrics (see `_query`)
+            metric_set: Metric set name (see `_query`)
+            page_size: Page size
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+            filter: Filter expression on dimension values
+            row_type: One of ['dict', 'namedtuple']
+            raise_on_denied: Raise permission errors (403) instead of logging them and returning no rows
+
+        Yields:
+            Dicts (or namedtuples) with report data
         """
-        Get freshnesses of a report
+        pages = self._iter_pages(
+            app_package_name=app_package_name,
+            timeline_spec=timeline_spec,
+            dimensions=dimensions,
+            metrics=metrics,
+            metric_set=metric_set,
+            page_size=page_size,
+            retry_count=retry_count,
+            sleep_time=sleep_time,
+            filter=filter,
+            raise_on_denied=raise_on_denied,
+        )
+        # One decoder per query: namedtuple rows of every page share their class, and its caches end with the query
+        decoder = RowDecoder(timeline_spec["aggregationPeriod"], row_type)
+        for page in pages:
+            yield from self._parse_rows(page.get("rows", []), app_package_name, timeline_spec, row_type, decoder)
+
+    def _query(
+        self,
+        app_package_name: str = "",
+        timeline_spec: dict = {},
+        dimensions: list[str] = [],
+        metrics: list[str] = [],
+        metric_set: str = "",
+        page_size: int = 50000,
+        retry_count: int = None,
+        sleep_time: int = None,
+        filter: str = None,
+        output_format: str = "records",
+        raise_on_denied: bool = False,
+    ):
+        """
+        Query report data from Google Play Developer API
+
+        Note: Read this doc
+        https://developers.google.com/play/developer/reporting/reference/rest
 
         Args:
             app_package_name: App package name
+            timeline_spec: Timeline spec (see docs above)
+            dimensions: Dimensions (see docs above)
+            metrics: Metrics (see docs above)
             metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
-            retry_count: number of retries
-            sleep_time: time to sleep between retries (seconds)
+            page_size: Page size
+            filter: Filter expression on dimension values (see docs above)
+            output_format: One of ['records', 'namedtuples', 'pandas', 'arrow']. 'namedtuples' returns lighter
+                namedtuple rows. 'pandas' and 'arrow' parse pages straight into a typed DataFrame/Table (timestamp
+                eventDate, float metrics, integer and categorical dimensions). Only 'records' uses the response cache.
+            raise_on_denied: Raise permission errors (403) instead of logging them and returning no rows, e.g. to
+                tell a denied app from an app without data
 
         Returns:
-            Dict with freshnesses
+            List of dicts with report data, or pandas DataFrame / pyarrow Table
         """
-        import time
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format}")
+        if output_format == "namedtuples":
+            return list(self._iter_query(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                page_size=page_size,
+                retry_count=retry_count,
+                sleep_time=sleep_time,
+                filter=filter,
+                raise_on_denied=raise_on_denied,
+                row_type="namedtuple",
+            ))
 
-        metric_set = self._metric_set if not metric_set else metric_set  # Default of each child class
-        for i in range(retry_count):
+        if output_format != "records":
+            pages = self._iter_pages(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                page_size=page_size,
+                retry_count=retry_count,
+                sleep_time=sleep_time,
+                filter=filter,
+                raise_on_denied=raise_on_denied,
+            )
+            return pages_to_table(pages,
+                                  app_package_name=app_package_name,
+                                  dimensions=dimensions,
+                                  metrics=metrics,
+                                  output_format=output_format)
+
+        if self._cache is not None:
+            return self._cached_query(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                page_size=page_size,
+                retry_count=retry_count,
+                sleep_time=sleep_time,
+                filter=filter,
+                raise_on_denied=raise_on_denied,
+            )
+
+        if self._checkpoint_store is not None:
+            return self._checkpointed_query(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                page_size=page_size,
+                retry_count=retry_count,
+                sleep_time=sleep_time,
+                filter=filter,
+                raise_on_denied=raise_on_denied,
+            )
+
+        return list(self._iter_query(
+            app_package_name=app_package_name,
+            timeline_spec=timeline_spec,
+            dimensions=dimensions,
+            metrics=metrics,
+            metric_set=metric_set,
+            page_size=page_size,
+            retry_count=retry_count,
+            sleep_time=sleep_time,
+            filter=filter,
+            raise_on_denied=raise_on_denied,
+        ))
+
+    def _checkpointed_query(
+        self,
+        app_package_name: str,
+        timeline_spec: dict,
+        dimensions: list[str],
+        metrics: list[str],
+        metric_set: str,
+        page_size: int = 50000,
+        filter: str = None,
+        **kwargs,
+    ) -> list[dict]:
+        """
+        Query report data, saving a checkpoint after each page and resuming from the last one if any
+
+        Args:
+            app_package_name: App package name
+            timeline_spec: Timeline spec
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name
+            page_size: Page size
+            filter: Filter expression on dimension values
+            kwargs: Other arguments of `_iter_pages`
+
+        Returns:
+            List of dicts with report data
+        """
+        key = self._checkpoint_store.query_key(app_package_name, metric_set, timeline_spec, dimensions, metrics,
+                                               filter, page_size)
+        checkpoint = self._checkpoint_store.load(key)
+        rows, page_token = checkpoint if checkpoint is not None else ([], "")
+        if page_token:
+            logging.warning(f"Resume {metric_set} for {app_package_name} after {len(rows)} rows")
+
+        pages = self._iter_pages(
+            app_package_name=app_package_name,
+            timeline_spec=timeline_spec,
+            dimensions=dimensions,
+            metrics=metrics,
+            metric_set=metric_set,
+            page_size=page_size,
+            filter=filter,
+            page_token=page_token,
+            **kwargs,
+        )
+        try:
+            for page in pages:
+                page_rows = self._parse_rows(page.get("rows", []), app_package_name, timeline_spec)
+                rows.extend(page_rows)
+                if page.get("nextPageToken"):
+                    self._checkpoint_store.save(key, page_rows, page["nextPageToken"])
+        except HttpError as e:
+            if not page_token or e.resp.status != 400:
+                raise e
+            # The saved page token expired, start over
+            logging.warning(f"Checkpoint of {metric_set} for {app_package_name} is no longer valid, restart")
+            self._checkpoint_store.clear(key)
+            return self._checkpointed_query(app_package_name, timeline_spec, dimensions, metrics, metric_set,
+                                            page_size=page_size, filter=filter, **kwargs)
+
+        self._checkpoint_store.clear(key)
+        return rows
+
+    def _cached_query(
+        self,
+        app_package_name: str,
+        timeline_spec: dict,
+        dimensions: list[str],
+        metrics: list[str],
+        metric_set: str,
+        **kwargs,
+    ) -> list[dict]:
+        """
+        Query report data through the response cache
+
+        Time buckets found in the cache are served locally. Missing buckets are fetched in contiguous ranges,
+        and those ending before the freshness `latestEndTime` are stored, since their data won't change anymore.
+        Like the uncached query, a permission error (403) is logged and returns no rows, and nothing is cached.
+
+        Args:
+            app_package_name: App package name
+            timeline_spec: Timeline spec
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name
+            kwargs: Other arguments of `_query`
+
+        Returns:
+            List of dicts with report data
+        """
+        aggregation_period = timeline_spec["aggregationPeriod"]
+        step = datetime.timedelta(hours=1) if aggregation_period == "HOURLY" else datetime.timedelta(days=1)
+        start_time, end_time = self._timeline_range(timeline_spec)
+
+        buckets = []
+        bucket_start = start_time
+        while bucket_start < end_time:
+            buckets.append(bucket_start)
+            bucket_start += step
+
+        query_key = self._cache.query_key(app_package_name, metric_set, aggregation_period, dimensions, metrics,
+                                          kwargs.get("filter"))
+        bucket_rows = self._cache.get(query_key, [bucket.isoformat() for bucket in buckets])
+
+        missing = [bucket for bucket in buckets if bucket.isoformat() not in bucket_rows]
+        if missing:
+            raise_on_denied = kwargs.pop("raise_on_denied", False)
             try:
-                data = self._metric_sets[metric_set].get(name=f"apps/{app_package_name}/{metric_set}").execute()
-                break
-            except Exception as e:
-                if i == retry_count - 1:
-                    raise e
-                else:
-                    time.sleep(sleep_time)
-                    continue
+                self._fetch_buckets(bucket_rows, query_key, missing, step, app_package_name, aggregation_period,
+                                    dimensions, metrics, metric_set, **kwargs)
+            except HttpError as e:
+                if e.resp.status == 403 and self._scheduler.retry_policy.classify(e) == PERMANENT:
+                    if raise_on_denied:
+                        raise e
+                    logging.warning(f'Permission denied for {app_package_name}')
+                    return []
+                raise e
 
+        return list(chain.from_iterable(bucket_rows.get(bucket.isoformat(), []) for bucket in buckets))
+
+    def _fetch_buckets(
+        self,
+        bucket_rows: dict,
+        query_key: str,
+        missing: list[datetime.datetime],
+        step: datetime.timedelta,
+        app_package_name: str,
+        aggregation_period: str,
+        dimensions: list[str],
+        metrics: list[str],
+        metric_set: str,
+        **kwargs,
+    ):
+        """
+        Fetch the time buckets missing from the cache into `bucket_rows`, and store the closed ones
+
+        Args:
+            bucket_rows: Dict {bucket start (isoformat): rows}, updated with the fetched buckets
+            query_key: Cache key of the query
+            missing: Start of the missing buckets
+            step: Bucket duration
+            app_package_name: App package name
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name
+            kwargs: Other arguments of `_iter_pages`
+
+        Raises:
+            HttpError: Including permission errors (403), so nothing is cached for a denied app
+        """
+        freshnesses = self.get_freshnesses(app_package_name=app_package_name, metric_set=metric_set)
+        latest_end_time = self._latest_end_time(freshnesses, aggregation_period)
+
+        # Group missing buckets into contiguous ranges, one query per range
+        ranges = []
+        for bucket in missing:
+            if ranges and ranges[-1][1] == bucket:
+                ranges[-1][1] = bucket + step
+            else:
+                ranges.append([bucket, bucket + step])
+
+        for range_start, range_end in ranges:
+            fetched = {}
+            bucket = range_start
+            while bucket < range_end:
+                fetched[bucket.isoformat()] = []
+                bucket += step
+
+            timeline_spec = self._timeline_spec(aggregation_period, start_time=range_start, end_time=range_end)
+            pages = self._iter_pages(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                raise_on_denied=True,
+                **kwargs,
+            )
+            for page in pages:
+                for row in self._parse_rows(page.get("rows", []), app_package_name, timeline_spec):
+                    fetched.setdefault(datetime.datetime(*self._event_date_key(row)).isoformat(), []).append(row)
+            bucket_rows.update(fetched)
+
+            if latest_end_time is not None:
+                closed = {bucket: fetched_rows for bucket, fetched_rows in fetched.items()
+                          if datetime.datetime.fromisoformat(bucket) + step <= latest_end_time}
+                if closed:
+                    self._cache.put(query_key, closed)
+
+    @staticmethod
+    def _timeline_range(timeline_spec: dict) -> tuple[datetime.datetime, datetime.datetime]:
+        """
+        Get start and end times of a timeline spec
+
+        Args:
+            timeline_spec: Timeline spec
+
+        Returns:
+            Tuple of (start_time, end_time)
+        """
+        start_time, end_time = (
+            datetime.datetime(timeline_spec[key]["year"],
+                              timeline_spec[key]["month"],
+                              timeline_spec[key]["day"],
+                              timeline_spec[key].get("hours", 0))
+            for key in ("startTime", "endTime")
+        )
+        return start_time, end_time
+
+    @staticmethod
+    def _parse_freshnesses(data: dict) -> dict:
+        """
+        Parse the freshnesses of a metric set resource
+
+        Args:
+            data: Metric set resource
+
+        Returns:
+            Dict with freshnesses
+        """
         freshnesses = data.get('freshnessInfo', {}).get('freshnesses', [])
         result = {
             'HOURLY': {},
@@ -187,6 +723,389 @@ class BaseReportingService:
 
         return result
 
+    @staticmethod
+    def _latest_end_time(freshnesses: dict, aggregation_period: str) -> datetime.datetime:
+        """
+        Get the end (exclusive) of the data available for an aggregation period
+
+        Args:
+            freshnesses: Freshnesses from `get_freshnesses`
+            aggregation_period: One of ['HOURLY', 'DAILY']
+
+        Returns:
+            Latest end time, None if the API returned no freshness for the period
+        """
+        latest = freshnesses.get(aggregation_period)
+        if not latest:
+            return None
+        return datetime.datetime.strptime(latest["event_date"], "%Y-%m-%d %H:%M")
+
+    def get_freshnesses(self,
+                        app_package_name: str = None,
+                        metric_set: str = None,
+                        retry_count: int = None,
+                        sleep_time: int = None):
+        """
+        Get freshnesses of a report
+
+        Args:
+            app_package_name: App package name
+            metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+
+        Returns:
+            Dict with freshnesses
+        """
+        metric_set = self._metric_set if not metric_set else metric_set  # Default of each child class
+        request = self._metric_sets[metric_set].get(name=f"apps/{app_package_name}/{metric_set}")
+        with self._instrumentation.span("freshness", app_package_name=app_package_name, metric_set=metric_set):
+            data = self._scheduler.execute(functools.partial(self._execute, request),
+                                           retry_policy=self._retry_policy(retry_count, sleep_time),
+                                           description=f"Get freshness of {metric_set} for {app_package_name}",
+                                           on_retry=self._on_retry)
+
+        return self._parse_freshnesses(data)
+
+    def get_freshnesses_bulk(self,
+                             app_package_names: list[str],
+                             metric_sets: list[str] = None,
+                             use_batch: bool = False,
+                             batch_size: int = 100,
+                             max_workers: int = 8) -> dict:
+        """
+        Get freshnesses of many (app, metric set) pairs at once
+
+        Args:
+            app_package_names: App package names
+            metric_sets: Metric set names, default metric set of the report if None
+            use_batch: Send requests in batch HTTP requests instead of concurrent single requests
+            batch_size: Number of requests per batch HTTP request
+            max_workers: Number of concurrent requests when not using batches
+
+        Returns:
+            Dict {app_package_name: {metric_set: freshnesses}}. Freshnesses of failed requests are the exception.
+        """
+        metric_sets = [self._metric_set] if metric_sets is None else metric_sets
+        pairs = [(app_package_name, metric_set) for app_package_name in app_package_names for metric_set in metric_sets]
+        requests = [self._metric_sets[metric_set].get(name=f"apps/{app_package_name}/{metric_set}")
+                    for app_package_name, metric_set in pairs]
+
+        responses = self._execute_many(requests,
+                                       use_batch=use_batch,
+                                       batch_size=batch_size,
+                                       max_workers=max_workers,
+                                       description="Get freshness")
+
+        result = {app_package_name: {} for app_package_name in app_package_names}
+        for (app_package_name, metric_set), response in zip(pairs, responses):
+            if isinstance(response, Exception):
+                logging.warning(f"Failed to get freshness of {metric_set} for {app_package_name}: {response}")
+                result[app_package_name][metric_set] = response
+            else:
+                result[app_package_name][metric_set] = self._parse_freshnesses(response)
+        return result
+
+    def query_many(self,
+                   queries: list[dict],
+                   use_batch: bool = False,
+                   batch_size: int = 100,
+                   max_workers: int = 8) -> list:
+        """
+        Run many small queries at once
+
+        The first page of every query is requested together (batched or concurrently), then queries with more
+        pages continue their pagination one by one.
+
+        Args:
+            queries: Dicts with `_query` arguments: app_package_name, timeline_spec, dimensions, metrics,
+                metric_set and optionally page_size, filter
+            use_batch: Send first pages in batch HTTP requests instead of concurrent single requests
+            batch_size: Number of requests per batch HTTP request
+            max_workers: Number of concurrent requests when not using batches
+
+        Returns:
+            List with one list of dicts with report data (or exception) per query
+        """
+        requests = []
+        for query in queries:
+            body = {
+                "dimensions": query["dimensions"],
+                "metrics": query["metrics"],
+                "timelineSpec": query["timeline_spec"],
+                "pageSize": query.get("page_size", 50000),
+                "pageToken": "",
+            }
+            if query.get("filter"):
+                body["filter"] = query["filter"]
+            metric_set = query["metric_set"]
+            requests.append(self._metric_sets[metric_set].query(name=f"apps/{query['app_package_name']}/{metric_set}",
+                                                                body=body))
+
+        responses = self._execute_many(requests,
+                                       use_batch=use_batch,
+                                       batch_size=batch_size,
+                                       max_workers=max_workers,
+                                       description="Query")
+
+        results = []
+        for query, response in zip(queries, responses):
+            if isinstance(response, Exception):
+                results.append(response)
+                continue
+
+            rows = self._parse_rows(response.get("rows", []), query["app_package_name"], query["timeline_spec"])
+            if response.get("nextPageToken"):
+                pages = self._iter_pages(page_token=response["nextPageToken"], **query)
+                for page in pages:
+                    rows.extend(self._parse_rows(page.get("rows", []), query["app_package_name"],
+                                                 query["timeline_spec"]))
+            results.append(rows)
+
+        return results
+
+    @staticmethod
+    def _timeline_spec(aggregation_period: str, start_time: datetime.datetime, end_time: datetime.datetime) -> dict:
+        """
+        Build a timeline spec
+
+        Args:
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            start_time: Start time
+            end_time: End time (exclusive)
+
+        Returns:
+            Timeline spec dict
+        """
+        if aggregation_period == "HOURLY":
+            return {
+                "aggregationPeriod": "HOURLY",
+                "startTime": {
+                    "year": start_time.year,
+                    "month": start_time.month,
+                    "day": start_time.day,
+                    "hours": start_time.hour,
+                },
+                "endTime": {
+                    "year": end_time.year,
+                    "month": end_time.month,
+                    "day": end_time.day,
+                    "hours": end_time.hour,
+                },
+            }
+
+        return {
+            "aggregationPeriod": "DAILY",
+            "startTime": {
+                "year": start_time.year,
+                "month": start_time.month,
+                "day": start_time.day,
+                "timeZone": {"id": "America/Los_Angeles"},
+            },
+            "endTime": {
+                "year": end_time.year,
+                "month": end_time.month,
+                "day": end_time.day,
+                "timeZone": {"id": "America/Los_Angeles"},
+            },
+        }
+
+    @classmethod
+    def _hourly_timeline_spec(cls, start_time: str, end_time: str) -> dict:
+        """
+        Build an HOURLY timeline spec
+
+        Args:
+            start_time: Start time (format: YYYY-MM-DD HH:MM)
+            end_time: End time (format: YYYY-MM-DD HH:MM)
+
+        Returns:
+            Timeline spec dict
+        """
+        start_time = datetime.datetime.strptime(start_time, "%Y-%m-%d %H:%M")
+        end_time = datetime.datetime.strptime(end_time, "%Y-%m-%d %H:%M")
+        return cls._timeline_spec("HOURLY", start_time=start_time, end_time=end_time)
+
+    @classmethod
+    def _daily_timeline_spec(cls, start_time: str, end_time: str) -> dict:
+        """
+        Build a DAILY timeline spec
+
+        Args:
+            start_time: Start time (format: YYYY-MM-DD)
+            end_time: End time (format: YYYY-MM-DD)
+
+        Returns:
+            Timeline spec dict
+        """
+        start_time = datetime.datetime.strptime(start_time, "%Y-%m-%d")
+        end_time = datetime.datetime.strptime(end_time, "%Y-%m-%d")
+        return cls._timeline_spec("DAILY", start_time=start_time, end_time=end_time)
+
+    @staticmethod
+    def _split_time_range(start_time: datetime.datetime,
+                          end_time: datetime.datetime,
+                          shard_by: str) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        """
+        Split [start_time, end_time) into consecutive shards
+
+        Args:
+            start_time: Start time
+            end_time: End time (exclusive)
+            shard_by: One of ['DAY', 'WEEK'], or None for a single shard
+
+        Returns:
+            List of (start, end) tuples in timeline order
+        """
+        if shard_by is None:
+            return [(start_time, end_time)]
+        if shard_by not in SHARD_SIZES:
+            raise ValueError(f"shard_by must be one of {list(SHARD_SIZES)}, got {shard_by}")
+
+        shards = []
+        shard_start = start_time
+        while shard_start < end_time:
+            shard_end = min(shard_start + SHARD_SIZES[shard_by], end_time)
+            shards.append((shard_start, shard_end))
+            shard_start = shard_end
+        return shards
+
+    @staticmethod
+    def _dimension_filter(dimension: str, value) -> str:
+        """
+        Build a filter expression matching one dimension value
+
+        Args:
+            dimension: Dimension name
+            value: Dimension value
+
+        Returns:
+            Filter expression
+        """
+        if isinstance(value, int) or (isinstance(value, str) and value.lstrip("-").isdigit()):
+            return f"{dimension} = {value}"
+        return f'{dimension} = "{value}"'
+
+    @classmethod
+    def _remainder_filter(cls, dimension: str, values: list) -> str:
+        """
+        Build a filter expression matching every value of a dimension but the given ones, including rows
+        without a value
+
+        Args:
+            dimension: Dimension name
+            values: Dimension values
+
+        Returns:
+            Filter expression, None to match every row
+        """
+        if not values:
+            return None
+        return " AND ".join(f"NOT {cls._dimension_filter(dimension, value)}" for value in values)
+
+    @staticmethod
+    def _event_date_key(row: dict) -> tuple:
+        """
+        Sort key of a parsed row by its eventDate
+
+        Args:
+            row: Dict with report data
+
+        Returns:
+            Tuple of ints (year, month, day[, hour, minute])
+        """
+        event_date = row["eventDate"] if isinstance(row, dict) else row.eventDate
+        return tuple(int(part) for part in re.split("[- :]", event_date))
+
+    def _query_sharded(
+        self,
+        app_package_name: str,
+        aggregation_period: str,
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        dimensions: list[str],
+        metrics: list[str],
+        metric_set: str,
+        shard_by: str = None,
+        shard_dimension: str = None,
+        shard_values: list = None,
+        max_workers: int = 4,
+        **kwargs,
+    ) -> list[dict]:
+        """
+        Query report data split into time (and optionally dimension) shards fetched in parallel
+
+        Page tokens of one query can only be followed one after another, so a long window is split into
+        independent queries instead. Results are merged back in timeline order.
+
+        Args:
+            app_package_name: App package name
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            start_time: Start time
+            end_time: End time (exclusive)
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name
+            shard_by: One of ['DAY', 'WEEK'], or None to keep the whole window in one shard
+            shard_dimension: Dimension to split each time shard on, e.g. 'countryCode' or 'versionCode'
+            shard_values: Values of `shard_dimension`. Fetched with a one-dimension query if None.
+                Rows with an empty or unlisted value are fetched by one more shard excluding the listed values.
+            max_workers: Number of shards fetched concurrently
+
+        Returns:
+            List of dicts with report data
+        """
+        time_shards = self._split_time_range(start_time, end_time, shard_by)
+
+        filters = [None]
+        if shard_dimension is not None:
+            if shard_values is None:
+                rows = self._query(
+                    app_package_name=app_package_name,
+                    timeline_spec=self._timeline_spec(aggregation_period, start_time=start_time, end_time=end_time),
+                    dimensions=[shard_dimension],
+                    metrics=metrics[:1],
+                    metric_set=metric_set,
+                    **{**kwargs, "output_format": "records"},
+                )
+                shard_values = list(dict.fromkeys(row[shard_dimension] for row in rows))
+            # An empty value is a missing dimension, which an equality filter can't select
+            shard_values = [value for value in shard_values if value not in ("", None)]
+            filters = [self._dimension_filter(shard_dimension, value) for value in shard_values]
+            filters.append(self._remainder_filter(shard_dimension, shard_values))
+
+        def query_shard(shard):
+            (shard_start, shard_end), shard_filter = shard
+            return self._query(
+                app_package_name=app_package_name,
+                timeline_spec=self._timeline_spec(aggregation_period, start_time=shard_start, end_time=shard_end),
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                filter=shard_filter,
+                **kwargs,
+            )
+
+        shards = [(time_shard, shard_filter) for time_shard in time_shards for shard_filter in filters]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            shard_results = list(executor.map(query_shard, shards))
+
+        output_format = kwargs.get("output_format", "records")
+        if output_format in ("pandas", "arrow"):
+            if not shard_results:
+                return pages_to_table([], app_package_name, dimensions, metrics, output_format)
+            return concat_tables(shard_results, output_format, sort=len(filters) > 1)
+
+        # Time shards are already in timeline order, only rows of dimension shards need to be interleaved
+        result_list = []
+        for i in range(0, len(shard_results), len(filters)):
+            time_shard_rows = list(chain.from_iterable(shard_results[i:i + len(filters)]))
+            if len(filters) > 1:
+                time_shard_rows.sort(key=self._event_date_key)
+            result_list.extend(time_shard_rows)
+
+        return result_list
+
     def get_hourly(
         self,
         app_package_name: str = "",
@@ -195,6 +1114,10 @@ class BaseReportingService:
         dimensions: list[str] = [],
         metrics: list[str] = [],
         metric_set: str = None,
+        shard_by: str = None,
+        shard_dimension: str = None,
+        shard_values: list = None,
+        max_workers: int = 4,
         **kwargs,
     ) -> list[dict]:
         """
@@ -207,6 +1130,10 @@ class BaseReportingService:
             dimensions: Dimensions
             metrics: Metrics
             metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+            shard_by: Split the window into 'DAY' or 'WEEK' shards fetched in parallel
+            shard_dimension: Also split each shard on this dimension, e.g. 'countryCode' or 'versionCode'
+            shard_values: Values of `shard_dimension`, fetched first if None. Other values get one more shard.
+            max_workers: Number of shards fetched concurrently
 
         Returns:
             List of dicts with report data
@@ -215,24 +1142,23 @@ class BaseReportingService:
         metrics = self._default_metrics if metrics is None else metrics
         metric_set = self._metric_set if metric_set is None else metric_set  # Default of each child class
 
-        start_time = datetime.datetime.strptime(start_time, "%Y-%m-%d %H:%M")
-        end_time = datetime.datetime.strptime(end_time, "%Y-%m-%d %H:%M")
+        if shard_by is not None or shard_dimension is not None:
+            return self._query_sharded(
+                app_package_name=app_package_name,
+                aggregation_period="HOURLY",
+                start_time=datetime.datetime.strptime(start_time, "%Y-%m-%d %H:%M"),
+                end_time=datetime.datetime.strptime(end_time, "%Y-%m-%d %H:%M"),
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                shard_by=shard_by,
+                shard_dimension=shard_dimension,
+                shard_values=shard_values,
+                max_workers=max_workers,
+                **kwargs,
+            )
 
-        timeline_spec = {
-            "aggregationPeriod": "HOURLY",
-            "startTime": {
-                "year": start_time.year,
-                "month": start_time.month,
-                "day": start_time.day,
-                "hours": start_time.hour,
-            },
-            "endTime": {
-                "year": end_time.year,
-                "month": end_time.month,
-                "day": end_time.day,
-                "hours": end_time.hour,
-            },
-        }
+        timeline_spec = self._hourly_timeline_spec(start_time=start_time, end_time=end_time)
 
         return self._query(
             app_package_name=app_package_name,
@@ -251,6 +1177,10 @@ class BaseReportingService:
         dimensions: list[str] = None,
         metrics: list[str] = None,
         metric_set: str = None,
+        shard_by: str = None,
+        shard_dimension: str = None,
+        shard_values: list = None,
+        max_workers: int = 4,
         **kwargs,
     ) -> list[dict]:
         """
@@ -263,6 +1193,10 @@ class BaseReportingService:
             dimensions: Dimensions
             metrics: Metrics
             metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+            shard_by: Split the window into 'DAY' or 'WEEK' shards fetched in parallel
+            shard_dimension: Also split each shard on this dimension, e.g. 'countryCode' or 'versionCode'
+            shard_values: Values of `shard_dimension`, fetched first if None. Other values get one more shard.
+            max_workers: Number of shards fetched concurrently
 
         Returns:
             List of dicts with report data
@@ -271,24 +1205,23 @@ class BaseReportingService:
         metrics = self._default_metrics if metrics is None else metrics
         metric_set = self._metric_set if metric_set is None else metric_set  # Default of each child class
 
-        start_time = datetime.datetime.strptime(start_time, "%Y-%m-%d")
-        end_time = datetime.datetime.strptime(end_time, "%Y-%m-%d")
+        if shard_by is not None or shard_dimension is not None:
+            return self._query_sharded(
+                app_package_name=app_package_name,
+                aggregation_period="DAILY",
+                start_time=datetime.datetime.strptime(start_time, "%Y-%m-%d"),
+                end_time=datetime.datetime.strptime(end_time, "%Y-%m-%d"),
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                shard_by=shard_by,
+                shard_dimension=shard_dimension,
+                shard_values=shard_values,
+                max_workers=max_workers,
+                **kwargs,
+            )
 
-        timeline_spec = {
-            "aggregationPeriod": "DAILY",
-            "startTime": {
-                "year": start_time.year,
-                "month": start_time.month,
-                "day": start_time.day,
-                "timeZone": {"id": "America/Los_Angeles"},
-            },
-            "endTime": {
-                "year": end_time.year,
-                "month": end_time.month,
-                "day": end_time.day,
-                "timeZone": {"id": "America/Los_Angeles"},
-            },
-        }
+        timeline_spec = self._daily_timeline_spec(start_time=start_time, end_time=end_time)
 
         return self._query(
             app_package_name=app_package_name,
@@ -298,3 +1231,169 @@ class BaseReportingService:
             metric_set=metric_set,
             **kwargs,
         )
+
+    def iter_hourly(
+        self,
+        app_package_name: str = "",
+        start_time: str = "YYYY-MM-DD HH:MM",
+        end_time: str = "YYYY-MM-DD HH:MM",
+        dimensions: list[str] = None,
+        metrics: list[str] = None,
+        metric_set: str = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Iterate over hourly report data from Google Play Developer API
+
+        Same as `get_hourly`, but rows are parsed and yielded page by page as each page arrives,
+        so memory stays bounded by one response page.
+
+        Args:
+            app_package_name: App package name
+            start_time: Start time (format: YYYY-MM-DD HH:MM)
+            end_time: End time (format: YYYY-MM-DD HH:MM)
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+
+        Yields:
+            Dicts with report data
+        """
+        dimensions = self._default_dimensions if dimensions is None else dimensions
+        metrics = self._default_metrics if metrics is None else metrics
+        metric_set = self._metric_set if metric_set is None else metric_set  # Default of each child class
+
+        timeline_spec = self._hourly_timeline_spec(start_time=start_time, end_time=end_time)
+
+        return self._iter_query(
+            app_package_name=app_package_name,
+            timeline_spec=timeline_spec,
+            dimensions=dimensions,
+            metrics=metrics,
+            metric_set=metric_set,
+            **kwargs,
+        )
+
+    def iter_daily(
+        self,
+        app_package_name: str = "",
+        start_time: str = "YYYY-MM-DD",
+        end_time: str = "YYYY-MM-DD",
+        dimensions: list[str] = None,
+        metrics: list[str] = None,
+        metric_set: str = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Iterate over daily report data from Google Play Developer API
+
+        Same as `get_daily`, but rows are parsed and yielded page by page as each page arrives,
+        so memory stays bounded by one response page.
+
+        Args:
+            app_package_name: App package name
+            start_time: Start time (format: YYYY-MM-DD)
+            end_time: End time (format: YYYY-MM-DD)
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+
+        Yields:
+            Dicts with report data
+        """
+        dimensions = self._default_dimensions if dimensions is None else dimensions
+        metrics = self._default_metrics if metrics is None else metrics
+        metric_set = self._metric_set if metric_set is None else metric_set  # Default of each child class
+
+        timeline_spec = self._daily_timeline_spec(start_time=start_time, end_time=end_time)
+
+        return self._iter_query(
+            app_package_name=app_package_name,
+            timeline_spec=timeline_spec,
+            dimensions=dimensions,
+            metrics=metrics,
+            metric_set=metric_set,
+            **kwargs,
+        )
+
+    def export(
+        self,
+        app_package_name: str = "",
+        output_dir: str = "",
+        start_time: str = "YYYY-MM-DD",
+        end_time: str = "YYYY-MM-DD",
+        aggregation_period: str = "HOURLY",
+        file_format: str = "parquet",
+        dimensions: list[str] = None,
+        metrics: list[str] = None,
+        metric_set: str = None,
+        check_freshness: bool = True,
+        **kwargs,
+    ) -> dict:
+        """
+        Export report data to files partitioned by app, metric set and date
+
+        Each day is written to `{output_dir}/app={app}/metric_set={metric_set}/date={YYYY-MM-DD}/` page by page,
+        so memory stays bounded by one response page. Days already exported are skipped, so running the same
+        export again after a failure resumes from the first unfinished day. Days ending after the latest end time
+        of the metric set are written without their success marker, so the next export completes them.
+
+        Args:
+            app_package_name: App package name
+            output_dir: Root output directory
+            start_time: First day (format: YYYY-MM-DD)
+            end_time: End day, exclusive (format: YYYY-MM-DD)
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            file_format: One of ['parquet', 'ndjson', 'csv']
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: One of ['anrRateMetricSet', 'crashRateMetricSet', 'errorCountMetricSet', 'excessiveWakeupRateMetricSet', 'slowRenderingRateMetricSet', 'slowStartRateMetricSet', 'stuckBackgroundWakelockRateMetricSet']
+            check_freshness: Get the freshness of the metric set to mark only complete days as done. If False, every
+                day is assumed complete (e.g. days already checked against the freshness by the caller).
+
+        Returns:
+            Dict of partition path to number of rows written, skipped partitions are not included
+
+        Raises:
+            HttpError: Permission denied (403) for the app, nothing is marked as done
+        """
+        dimensions = self._default_dimensions if dimensions is None else dimensions
+        metrics = self._default_metrics if metrics is None else metrics
+        metric_set = self._metric_set if metric_set is None else metric_set  # Default of each child class
+
+        start_time = datetime.datetime.strptime(start_time, "%Y-%m-%d")
+        end_time = datetime.datetime.strptime(end_time, "%Y-%m-%d")
+
+        latest_end_time = None
+        if check_freshness:
+            freshnesses = self.get_freshnesses(app_package_name=app_package_name, metric_set=metric_set)
+            latest_end_time = self._latest_end_time(freshnesses, aggregation_period) or datetime.datetime.min
+
+        written = {}
+        for day_start, day_end in self._split_time_range(start_time, end_time, "DAY"):
+            path = partition_path(output_dir, app_package_name, metric_set, day_start.strftime("%Y-%m-%d"))
+            if is_partition_done(path):
+                continue
+
+            timeline_spec = self._timeline_spec(aggregation_period, start_time=day_start, end_time=day_end)
+            pages = self._iter_pages(
+                app_package_name=app_package_name,
+                timeline_spec=timeline_spec,
+                dimensions=dimensions,
+                metrics=metrics,
+                metric_set=metric_set,
+                raise_on_denied=True,
+                **kwargs,
+            )
+            written[path] = write_partition(path,
+                                            pages,
+                                            file_format=file_format,
+                                            app_package_name=app_package_name,
+                                            dimensions=dimensions,
+                                            metrics=metrics,
+                                            parse_rows=functools.partial(self._parse_rows,
+                                                                         app_package_name=app_package_name,
+                                                                         timeline_spec=timeline_spec),
+                                            mark_done=latest_end_time is None or day_end <= latest_end_time)
+
+        return written
@@ -0,0 +1,127 @@
+import datetime
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report.base_report import BaseReportingClient
+from google_play_developer_api.scheduler import PERMANENT
+
+
+class BaseSearchService(BaseReportingClient):
+    """
+    Base of the paginated search/list resources of the Reporting API (error issues, error reports, anomalies).
+    They have no freshness or timeline, so they don't get the metric set query API of `BaseReportingService`.
+    Subclasses define `search` (used by `_search_many`) or their own list method.
+    """
+
+    @staticmethod
+    def _interval_params(start_time: str = None, end_time: str = None) -> dict:
+        """
+        Build the `interval` parameters of a search request. Search intervals are aligned to the hour, in UTC.
+
+        Args:
+            start_time: Start time (format: YYYY-MM-DD HH:MM), None to use the API default
+            end_time: End time (format: YYYY-MM-DD HH:MM), None to use the API default
+
+        Returns:
+            Dict of request parameters
+        """
+        params = {}
+        for bound, value in (("startTime", start_time), ("endTime", end_time)):
+            if value is None:
+                continue
+            value = datetime.datetime.strptime(value, "%Y-%m-%d %H:%M")
+            params.update({
+                f"interval_{bound}_year": value.year,
+                f"interval_{bound}_month": value.month,
+                f"interval_{bound}_day": value.day,
+                f"interval_{bound}_hours": value.hour,
+                f"interval_{bound}_timeZone_id": "UTC",
+            })
+        return params
+
+    def _iter_search(self,
+                     resource: str,
+                     items_key: str,
+                     app_package_name: str,
+                     params: dict,
+                     fields: list[str] = None,
+                     page_size: int = 50,
+                     retry_count: int = None,
+                     sleep_time: int = None,
+                     method: str = "search",
+                     raise_on_denied: bool = False) -> Iterator[dict]:
+        """
+        Iterate over the items of a `search` (or `list`) endpoint, requesting the next page only when
+        the previous one has been consumed
+
+        Args:
+            resource: Resource name, e.g. 'errorIssues'
+            items_key: Key of the items in the response, e.g. 'errorIssues'
+            app_package_name: App package name
+            params: Other request parameters
+            fields: Item fields to return (partial response), all fields if None
+            page_size: Page size
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+            method: Paginated method of the resource, 'search' or 'list'
+            raise_on_denied: Raise permission errors (403) instead of logging them and yielding no items
+
+        Yields:
+            Item dicts
+        """
+        if fields is not None:
+            params = {**params, "fields": f"{items_key}({','.join(fields)}),nextPageToken"}
+
+        page_token = ""
+        while True:
+            request = getattr(self._metric_sets[resource], method)(parent=f"apps/{app_package_name}",
+                                                                   pageSize=page_size,
+                                                                   pageToken=page_token,
+                                                                   **params)
+            try:
+                with self._instrumentation.span("search_page", app_package_name=app_package_name, resource=resource):
+                    response = self._scheduler.execute(functools.partial(self._execute, request),
+                                                       retry_policy=self._retry_policy(retry_count, sleep_time),
+                                                       description=f"{method.capitalize()} {resource} for "
+                                                                   f"{app_package_name}",
+                                                       on_retry=self._on_retry)
+            except HttpError as e:
+                if e.resp.status == 403 and self._scheduler.retry_policy.classify(e) == PERMANENT:
+                    if raise_on_denied:
+                        raise e
+                    logging.warning(f'Permission denied for {app_package_name}')
+                    return
+                if e.resp.status == 400:
+                    logging.warning(f'Bad request for {app_package_name}, {e.reason}')
+                raise e
+
+            yield from response.get(items_key, [])
+            page_token = response.get("nextPageToken", "")
+            if not page_token:
+                break
+
+    def _search_many(self, app_package_names: list[str], max_workers: int = 8, **kwargs) -> dict:
+        """
+        Run `search` for many apps concurrently
+
+        Args:
+            app_package_names: App package names
+            max_workers: Number of apps searched concurrently
+            **kwargs: Arguments of `search`
+
+        Returns:
+            Dict {app_package_name: list of items}. Items of failed searches are the exception.
+        """
+        def search_one(app_package_name):
+            try:
+                return list(self.search(app_package_name=app_package_name, **kwargs))
+            except Exception as e:
+                logging.warning(f"Search failed for {app_package_name}: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(app_package_names, executor.map(search_one, app_package_names)))
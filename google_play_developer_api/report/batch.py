@@ -0,0 +1,214 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterator, Union
+
+from google_play_developer_api.client import get_reporting_service
+from google_play_developer_api.credential_pool import CredentialPool
+from google_play_developer_api.instrumentation import Instrumentation
+from google_play_developer_api.report.base_report import BaseReportingService
+from google_play_developer_api.report.cache import ResponseCache
+from google_play_developer_api.report.checkpoint import CheckpointStore
+from google_play_developer_api.report.join import RowJoiner
+from google_play_developer_api.scheduler import RequestScheduler
+
+
+@dataclass
+class ReportJob:
+    """
+    One report fetch of a batch
+
+    Args:
+        app_package_name: App package name
+        metric_set: Key of `report.mapping` (e.g. 'crash_rate') or metric set name (e.g. 'crashRateMetricSet')
+        start_time: Start time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+        end_time: End time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+        aggregation_period: One of ['HOURLY', 'DAILY']
+        dimensions: Dimensions, default dimensions of the report class if None
+        metrics: Metrics, default metrics of the report class if None
+        kwargs: Extra arguments passed to `get_hourly`/`get_daily`
+    """
+    app_package_name: str
+    metric_set: str
+    start_time: str
+    end_time: str
+    aggregation_period: str = "DAILY"
+    dimensions: list[str] = None
+    metrics: list[str] = None
+    kwargs: dict = field(default_factory=dict)
+
+
+class BatchReportFetcher:
+    def __init__(self,
+                 credentials_path: Union[str, list[str]] = None,
+                 credentials=None,
+                 max_workers: int = 8,
+                 cache: ResponseCache = None,
+                 scheduler: RequestScheduler = None,
+                 discovery_path: str = None,
+                 http=None,
+                 instrumentation: Instrumentation = None,
+                 checkpoint_store: CheckpointStore = None,
+                 credential_pool: CredentialPool = None):
+        """
+        Fetch many reports concurrently with one shared playdeveloperreporting client
+
+        Args:
+            credentials_path: Path to a service account json file, or a list of paths to spread requests over
+                several service accounts
+            credentials: Already loaded credentials, used instead of `credentials_path`
+            max_workers: Number of concurrent requests. The Reporting API quota is per Google Cloud project,
+                so this is the concurrency of the project owning the credentials (or of all projects of the pool).
+            cache: Optional response cache shared by all reports
+            scheduler: Rate limiter and retry policy shared by all reports, the process-wide default if None
+            discovery_path: Path to a discovery document saved on disk, used instead of the bundled one
+            http: Thread-safe transport shared by all reports, e.g. `transport.PooledHttp`
+            instrumentation: Instrumentation shared by all reports, e.g. `instrumentation.MetricsRecorder()`
+            checkpoint_store: Optional checkpoint store shared by all reports, to resume failed jobs
+            credential_pool: Credential pool shared by all reports, see `BaseReportingService`
+        """
+        from google_play_developer_api.report import mapping
+
+        if isinstance(credentials_path, (list, tuple)):
+            credential_pool = CredentialPool(credentials_paths=credentials_path)
+            credentials_path = None
+        if credential_pool is not None and credentials is None:
+            credentials = credential_pool.credentials
+
+        credentials, reporting_service = get_reporting_service(credentials_path=credentials_path,
+                                                               credentials=credentials,
+                                                               discovery_path=discovery_path)
+
+        self._max_workers = max_workers
+        self._reports = {}
+        for name, report_class in mapping.items():
+            report = report_class(credentials=credentials, reporting_service=reporting_service, cache=cache,
+                                  scheduler=scheduler, http=http,
+                                  instrumentation=instrumentation, checkpoint_store=checkpoint_store,
+                                  credential_pool=credential_pool)
+            self._reports[name] = report
+            self._reports[report._metric_set] = report
+
+    def get_report(self, metric_set: str) -> BaseReportingService:
+        """
+        Get the shared report instance of a metric set
+
+        Args:
+            metric_set: Key of `report.mapping` or metric set name
+
+        Returns:
+            Report instance
+        """
+        if metric_set not in self._reports:
+            raise ValueError(f"Unknown metric set {metric_set}")
+        return self._reports[metric_set]
+
+    def _run_job(self, job: ReportJob) -> list[dict]:
+        report = self.get_report(job.metric_set)
+        if job.aggregation_period == "HOURLY":
+            get_report_data = report.get_hourly
+        elif job.aggregation_period == "DAILY":
+            get_report_data = report.get_daily
+        else:
+            raise ValueError(f"Unknown aggregation period {job.aggregation_period}")
+
+        return get_report_data(app_package_name=job.app_package_name,
+                               start_time=job.start_time,
+                               end_time=job.end_time,
+                               dimensions=job.dimensions,
+                               metrics=job.metrics,
+                               **job.kwargs)
+
+    def iter_completed(self, jobs: list[ReportJob]) -> Iterator[tuple[ReportJob, list[dict]]]:
+        """
+        Run jobs concurrently and yield them as they complete
+
+        Args:
+            jobs: Report jobs
+
+        Yields:
+            Tuples of (job, list of dicts with report data)
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(self._run_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def fetch(self, jobs: list[ReportJob], return_exceptions: bool = False) -> list:
+        """
+        Run jobs concurrently and return their results in the order of `jobs`
+
+        Args:
+            jobs: Report jobs
+            return_exceptions: If True, a failed job puts its exception in the result list instead of raising
+
+        Returns:
+            List with one list of dicts with report data (or exception) per job
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [executor.submit(self._run_job, job) for job in jobs]
+
+            results = []
+            for job, future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        for pending in futures:
+                            pending.cancel()
+                        raise e
+                    logging.warning(f"Job {job.metric_set} for {job.app_package_name} failed: {e}")
+                    results.append(e)
+
+        return results
+
+    def fetch_joined(self,
+                     app_package_name: str,
+                     metric_sets: list[str],
+                     start_time: str,
+                     end_time: str,
+                     dimensions: list[str],
+                     aggregation_period: str = "DAILY",
+                     metrics: dict[str, list[str]] = None,
+                     **kwargs) -> list[dict]:
+        """
+        Fetch several metric sets for the same slice in parallel and join them on (eventDate, dimensions)
+
+        Each result is hash joined as soon as it arrives (see `RowJoiner`).
+
+        Args:
+            app_package_name: App package name
+            metric_sets: Keys of `report.mapping` or metric set names, e.g. ['crash_rate', 'anr_rate']
+            start_time: Start time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+            end_time: End time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+            dimensions: Dimensions supported by every metric set, e.g. ['versionCode']
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            metrics: Dict of metric set to its metrics, default metrics of the report classes if None or missing
+            kwargs: Extra arguments passed to `get_hourly`/`get_daily`. Rows are joined as dicts, an
+                `output_format` other than 'records' is rejected.
+
+        Returns:
+            List of joined dicts, one per (eventDate, dimensions), with float metrics (see `RowJoiner`). Metrics
+            returned by several metric sets are renamed '<metric set>.<metric>'.
+        """
+        output_format = kwargs.pop("output_format", "records")
+        if output_format != "records":
+            raise ValueError(f"fetch_joined only supports output_format 'records', got {output_format}")
+
+        metrics = {} if metrics is None else metrics
+        metrics = {metric_set: metrics.get(metric_set) or self.get_report(metric_set)._default_metrics
+                   for metric_set in metric_sets}
+
+        jobs = [ReportJob(app_package_name=app_package_name,
+                          metric_set=metric_set,
+                          start_time=start_time,
+                          end_time=end_time,
+                          aggregation_period=aggregation_period,
+                          dimensions=dimensions,
+                          metrics=metrics[metric_set],
+                          kwargs=kwargs) for metric_set in metric_sets]
+
+        joiner = RowJoiner(dimensions=dimensions, metrics=metrics)
+        for job, rows in self.iter_completed(jobs):
+            joiner.add(job.metric_set, rows)
+        return joiner.rows()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    def __init__(self, path: str = "google_play_developer_api_cache.sqlite3"):
+        """
+        SQLite cache of parsed report rows, stored per time bucket (one hour or one day)
+
+        Only buckets that are closed, i.e. end before the `latestEndTime` of the report freshness,
+        are stored, so cached rows never change and are served without calling the API.
+
+        Args:
+            path: Path of the SQLite database file, ':memory:' for a cache living in the process only
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS report_cache ("
+                "query_key TEXT NOT NULL, "
+                "bucket TEXT NOT NULL, "
+                "rows TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "PRIMARY KEY (query_key, bucket))"
+            )
+
+    @staticmethod
+    def query_key(app_package_name: str,
+                  metric_set: str,
+                  aggregation_period: str,
+                  dimensions: list[str],
+                  metrics: list[str],
+                  filter: str = None) -> str:
+        """
+        Build the cache key of a query, without its time range
+
+        Args:
+            app_package_name: App package name
+            metric_set: Metric set name
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            dimensions: Dimensions
+            metrics: Metrics
+            filter: Filter expression
+
+        Returns:
+            Hex digest identifying the query
+        """
+        key = json.dumps([app_package_name, metric_set, aggregation_period, list(dimensions), list(metrics), filter])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, query_key: str, buckets: list[str]) -> dict[str, list[dict]]:
+        """
+        Get cached rows of some time buckets
+
+        Args:
+            query_key: Key from `query_key`
+            buckets: Bucket names (ISO format start time of each bucket)
+
+        Returns:
+            Dict of bucket name to rows, only for buckets found in the cache
+        """
+        result = {}
+        # Stay below the SQLite limit of bound parameters
+        for i in range(0, len(buckets), 500):
+            chunk = buckets[i:i + 500]
+            with self._lock:
+                cursor = self._connection.execute(
+                    f"SELECT bucket, rows FROM report_cache WHERE query_key = ? "
+                    f"AND bucket IN ({', '.join('?' * len(chunk))})",
+                    [query_key, *chunk],
+                )
+                for bucket, rows in cursor.fetchall():
+                    result[bucket] = json.loads(rows)
+        return result
+
+    def put(self, query_key: str, bucket_rows: dict[str, list[dict]]):
+        """
+        Store rows of closed time buckets
+
+        Args:
+            query_key: Key from `query_key`
+            bucket_rows: Dict of bucket name to rows. Buckets without rows must be stored with an empty list.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO report_cache (query_key, bucket, rows, created_at) VALUES (?, ?, ?, ?)",
+                [(query_key, bucket, json.dumps(rows), now) for bucket, rows in bucket_rows.items()],
+            )
+
+    def clear(self):
+        """
+        Delete all cached rows
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM report_cache")
+
+    def close(self):
+        """
+        Close the database connection
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+
+
+class CheckpointStore:
+    def __init__(self, directory: str = "google_play_developer_api_checkpoints"):
+        """
+        On-disk checkpoints of paginated queries: the rows delivered so far and the next `pageToken`
+
+        Each query has a data file, where the rows of every page are appended as JSON lines, and a small state file
+        with the next page token and the size of the data file at that point. The state file is replaced atomically
+        after the rows are written, so a crash in the middle of a page only loses that page.
+
+        Args:
+            directory: Directory of the checkpoint files, created on first write
+        """
+        self._directory = directory
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def query_key(app_package_name: str,
+                  metric_set: str,
+                  timeline_spec: dict,
+                  dimensions: list[str],
+                  metrics: list[str],
+                  filter: str = None,
+                  page_size: int = None) -> str:
+        """
+        Build the checkpoint key of a query. Page tokens are only valid for the exact same request, so every
+        parameter is part of the key.
+
+        Args:
+            app_package_name: App package name
+            metric_set: Metric set name
+            timeline_spec: Timeline spec
+            dimensions: Dimensions
+            metrics: Metrics
+            filter: Filter expression
+            page_size: Page size
+
+        Returns:
+            Hex digest identifying the query
+        """
+        key = json.dumps([app_package_name, metric_set, timeline_spec, list(dimensions), list(metrics), filter,
+                          page_size], sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        return os.path.join(self._directory, f"{key}.ndjson"), os.path.join(self._directory, f"{key}.json")
+
+    def load(self, key: str) -> tuple[list[dict], str]:
+        """
+        Load a checkpoint
+
+        Args:
+            key: Key from `query_key`
+
+        Returns:
+            Tuple of (rows delivered so far, next page token), None if there is no checkpoint
+        """
+        data_path, state_path = self._paths(key)
+        with self._lock:
+            if not os.path.exists(state_path):
+                return None
+            with open(state_path) as f:
+                state = json.load(f)
+            # Rows appended after the last state write belong to a page that was not checkpointed
+            with open(data_path, "rb") as f:
+                data = f.read(state["offset"])
+
+        rows = [json.loads(line) for line in data.splitlines() if line]
+        return rows, state["page_token"]
+
+    def save(self, key: str, rows: list[dict], page_token: str):
+        """
+        Append the rows of one page and move the checkpoint to the next page
+
+        Args:
+            key: Key from `query_key`
+            rows: Parsed rows of the page
+            page_token: Token of the next page
+        """
+        data_path, state_path = self._paths(key)
+        with self._lock:
+            os.makedirs(self._directory, exist_ok=True)
+            state = {"offset": 0}
+            if os.path.exists(state_path):
+                with open(state_path) as f:
+                    state = json.load(f)
+
+            with open(data_path, "ab") as f:
+                # Drop a partial page left by a previous crash
+                f.truncate(state["offset"])
+                f.seek(state["offset"])
+                f.write("".join(json.dumps(row) + "\n" for row in rows).encode())
+                offset = f.tell()
+
+            tmp_path = f"{state_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"page_token": page_token, "offset": offset}, f)
+            os.replace(tmp_path, state_path)
+
+    def clear(self, key: str):
+        """
+        Delete a checkpoint, once its query completed
+
+        Args:
+            key: Key from `query_key`
+        """
+        with self._lock:
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
@@ -0,0 +1,238 @@
+import datetime
+from typing import Iterable
+
+OUTPUT_FORMATS = ["records", "namedtuples", "pandas", "arrow"]
+# Dimensions the API returns as int64Value, typed as integers even when a page has no value for them
+INT_DIMENSIONS = {"apiLevel", "versionCode", "deviceRamBucket"}
+
+
+class ColumnBuffers:
+    def __init__(self, app_package_name: str, dimensions: list[str], metrics: list[str], infer_types: bool = True):
+        """
+        Column buffers filled directly from raw response pages, without building one dict per row
+
+        Dimensions of `INT_DIMENSIONS` are always integers, so tables of different pages or shards share their
+        schema. Other dimensions are strings, or integers if every value is an int64Value and `infer_types` is set.
+
+        Args:
+            app_package_name: App package name
+            dimensions: Dimensions of the query
+            metrics: Metrics of the query
+            infer_types: Type other dimensions from their values. If False they are strings, so the schema only
+                depends on the query (e.g. for a file written page by page).
+        """
+        self.app_package_name = app_package_name
+        self.dimensions = list(dimensions)
+        self.metrics = list(metrics)
+        self.infer_types = infer_types
+
+        self.event_dates = []
+        self.time_zones = []
+        self.dimension_values = {dimension: [] for dimension in self.dimensions}
+        self.metric_values = {metric: [] for metric in self.metrics}
+        # Dimensions returned as int64Value are typed as integers (e.g. versionCode, apiLevel)
+        self.int_dimensions = set()
+        self.string_dimensions = set()
+
+        self._timestamps = {}
+
+    def __len__(self):
+        return len(self.event_dates)
+
+    def _timestamp(self, start_time: dict) -> datetime.datetime:
+        key = (start_time.get("year"), start_time.get("month"), start_time.get("day"), start_time.get("hours", 0))
+        timestamp = self._timestamps.get(key)
+        if timestamp is None:
+            timestamp = datetime.datetime(*key)
+            self._timestamps[key] = timestamp
+        return timestamp
+
+    def add_rows(self, rows: list[dict]):
+        """
+        Append raw rows of one response page
+
+        Args:
+            rows: Raw rows
+        """
+        event_dates = self.event_dates
+        time_zones = self.time_zones
+        dimension_values = self.dimension_values
+        metric_values = self.metric_values
+
+        for row in rows:
+            start_time = row["startTime"]
+            event_dates.append(self._timestamp(start_time))
+            time_zones.append(start_time["timeZone"]["id"])
+
+            row_dimensions = {}
+            for dimension in row.get("dimensions", []):
+                if "stringValue" in dimension:
+                    row_dimensions[dimension["dimension"]] = dimension["stringValue"]
+                    self.string_dimensions.add(dimension["dimension"])
+                elif "int64Value" in dimension:
+                    row_dimensions[dimension["dimension"]] = int(dimension["int64Value"])
+                    self.int_dimensions.add(dimension["dimension"])
+            for dimension, values in dimension_values.items():
+                values.append(row_dimensions.get(dimension))
+
+            row_metrics = {}
+            for metric in row.get("metrics", []):
+                if "decimalValue" in metric:
+                    row_metrics[metric["metric"]] = float(metric["decimalValue"]["value"])
+            for metric, values in metric_values.items():
+                values.append(row_metrics.get(metric))
+
+    def _is_integer(self, dimension: str) -> bool:
+        if dimension in INT_DIMENSIONS:
+            return True
+        return self.infer_types and dimension in self.int_dimensions and dimension not in self.string_dimensions
+
+    @staticmethod
+    def _to_int(value):
+        # An integer dimension only gets a string from an unexpected response, keep it if it is a number
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def to_pandas(self):
+        """
+        Build a pandas DataFrame
+
+        Returns:
+            DataFrame with datetime eventDate, float metrics, Int64 integer dimensions and categorical
+            string dimensions
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for output_format='pandas', install it with `pip install pandas`")
+
+        columns = {
+            "eventDate": pd.to_datetime(pd.Series(self.event_dates, dtype="object")),
+            "timeZone": pd.Categorical(self.time_zones),
+            "appPackageName": pd.Categorical([self.app_package_name] * len(self)),
+        }
+        for dimension, values in self.dimension_values.items():
+            if self._is_integer(dimension):
+                columns[dimension] = pd.array([self._to_int(value) for value in values], dtype="Int64")
+            else:
+                categorical = pd.Categorical([str(value) if value is not None else None for value in values])
+                if len(categorical.categories) == 0:
+                    # Without values the categories would be floats: keep string ones, so that tables of pages
+                    # with and without values of the dimension can be concatenated
+                    categorical = categorical.set_categories(pd.Index([], dtype=pd.Index([""]).dtype))
+                columns[dimension] = categorical
+        for metric, values in self.metric_values.items():
+            columns[metric] = pd.array(values, dtype="float64")
+
+        return pd.DataFrame(columns)
+
+    def to_arrow(self):
+        """
+        Build a pyarrow Table
+
+        Returns:
+            Table with timestamp eventDate, float64 metrics, int64 integer dimensions and dictionary encoded
+            string dimensions
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for output_format='arrow', install it with `pip install pyarrow`")
+
+        columns = {
+            "eventDate": pa.array(self.event_dates, type=pa.timestamp("s")),
+            "timeZone": pa.array(self.time_zones, type=pa.string()).dictionary_encode(),
+            "appPackageName": pa.array([self.app_package_name] * len(self), type=pa.string()).dictionary_encode(),
+        }
+        for dimension, values in self.dimension_values.items():
+            if self._is_integer(dimension):
+                columns[dimension] = pa.array([self._to_int(value) for value in values], type=pa.int64())
+            else:
+                values = [str(value) if value is not None else None for value in values]
+                columns[dimension] = pa.array(values, type=pa.string()).dictionary_encode()
+        for metric, values in self.metric_values.items():
+            columns[metric] = pa.array(values, type=pa.float64())
+
+        return pa.table(columns)
+
+    def build(self, output_format: str):
+        """
+        Build the table in one of the columnar output formats
+
+        Args:
+            output_format: One of ['pandas', 'arrow']
+
+        Returns:
+            pandas DataFrame or pyarrow Table
+        """
+        if output_format == "pandas":
+            return self.to_pandas()
+        if output_format == "arrow":
+            return self.to_arrow()
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format}")
+
+
+def pages_to_table(pages: Iterable[dict],
+                   app_package_name: str,
+                   dimensions: list[str],
+                   metrics: list[str],
+                   output_format: str):
+    """
+    Parse raw response pages straight into a columnar table
+
+    Args:
+        pages: Raw response pages
+        app_package_name: App package name
+        dimensions: Dimensions of the query
+        metrics: Metrics of the query
+        output_format: One of ['pandas', 'arrow']
+
+    Returns:
+        pandas DataFrame or pyarrow Table
+    """
+    buffers = ColumnBuffers(app_package_name=app_package_name, dimensions=dimensions, metrics=metrics)
+    for page in pages:
+        buffers.add_rows(page.get("rows", []))
+    return buffers.build(output_format)
+
+
+def concat_tables(tables: list, output_format: str, sort: bool = False):
+    """
+    Concatenate tables of several queries
+
+    Args:
+        tables: pandas DataFrames or pyarrow Tables
+        output_format: One of ['pandas', 'arrow']
+        sort: Sort the result by eventDate (stable)
+
+    Returns:
+        pandas DataFrame or pyarrow Table
+    """
+    if output_format == "pandas":
+        import pandas as pd
+
+        # Categories differ between tables, union them so the columns stay categorical
+        from pandas.api.types import union_categoricals
+
+        result = pd.concat(tables, ignore_index=True)
+        for column in tables[0].columns:
+            if all(isinstance(table[column].dtype, pd.CategoricalDtype) for table in tables):
+                result[column] = union_categoricals([table[column] for table in tables])
+        if sort:
+            result = result.sort_values("eventDate", kind="stable", ignore_index=True)
+        return result
+
+    if output_format == "arrow":
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        result = pa.concat_tables(tables).unify_dictionaries()
+        if sort:
+            result = result.take(pc.sort_indices(result, sort_keys=[("eventDate", "ascending")]))
+        return result
+
+    raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format}")
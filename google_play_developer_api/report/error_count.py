@@ -2,8 +2,8 @@ from google_play_developer_api.report.base_report import BaseReportingService
 
 
 class ErrorCountReport(BaseReportingService):
-    def __init__(self, credentials_path: str):
-        super().__init__(credentials_path=credentials_path)
+    def __init__(self, credentials_path: str = None, **kwargs):
+        super().__init__(credentials_path=credentials_path, **kwargs)
         # Note: can use isUserPerceived dimension (Google internal-only) to filter out non-user-perceived errors.
         self._default_dimensions = [
             "reportType",
@@ -0,0 +1,76 @@
+from typing import Iterator
+
+from google_play_developer_api.report.base_search import BaseSearchService
+
+
+class ErrorIssuesReport(BaseSearchService):
+    def __init__(self, credentials_path: str = None, **kwargs):
+        super().__init__(credentials_path=credentials_path, **kwargs)
+        self._default_fields = None
+
+        self._metric_set = "errorIssues"
+
+    def search(
+        self,
+        app_package_name: str = "",
+        start_time: str = None,
+        end_time: str = None,
+        filter: str = None,
+        order_by: str = None,
+        sample_error_report_limit: int = 0,
+        fields: list[str] = None,
+        page_size: int = 1000,
+        retry_count: int = None,
+        sleep_time: int = None,
+    ) -> Iterator[dict]:
+        """
+        Search error issues (groups of error reports) of an app
+
+        Pages are requested lazily, as the iterator is consumed.
+
+        Args:
+            app_package_name: App package name
+            start_time: Start time in UTC (format: YYYY-MM-DD HH:MM), None for the API default
+            end_time: End time in UTC (format: YYYY-MM-DD HH:MM), None for the API default
+            filter: Filter expression, e.g. 'errorIssueType = CRASH AND versionCode = 123'
+            order_by: Order of the issues, e.g. 'distinctUsers desc'
+            sample_error_report_limit: Number of sample error reports per issue (0 or 1)
+            fields: Issue fields to return, e.g. ['name', 'type', 'cause', 'distinctUsers'], all fields if None
+            page_size: Page size (max 1000)
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+
+        Yields:
+            Error issue dicts
+        """
+        fields = self._default_fields if fields is None else fields
+        params = self._interval_params(start_time=start_time, end_time=end_time)
+        if filter:
+            params["filter"] = filter
+        if order_by:
+            params["orderBy"] = order_by
+        if sample_error_report_limit:
+            params["sampleErrorReportLimit"] = sample_error_report_limit
+
+        return self._iter_search(resource=self._metric_set,
+                                 items_key="errorIssues",
+                                 app_package_name=app_package_name,
+                                 params=params,
+                                 fields=fields,
+                                 page_size=page_size,
+                                 retry_count=retry_count,
+                                 sleep_time=sleep_time)
+
+    def search_many(self, app_package_names: list[str], max_workers: int = 8, **kwargs) -> dict:
+        """
+        Search error issues of many apps concurrently
+
+        Args:
+            app_package_names: App package names
+            max_workers: Number of apps searched concurrently
+            **kwargs: Arguments of `search`
+
+        Returns:
+            Dict {app_package_name: list of error issue dicts}. Issues of failed searches are the exception.
+        """
+        return self._search_many(app_package_names, max_workers=max_workers, **kwargs)
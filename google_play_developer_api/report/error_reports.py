@@ -0,0 +1,72 @@
+from typing import Iterator
+
+from google_play_developer_api.report.base_search import BaseSearchService
+
+# Every error report field except `reportText`, which holds the full stack trace
+SUMMARY_FIELDS = ["name", "type", "issue", "eventTime", "appVersion", "osVersion", "deviceModel", "vcsInformation"]
+
+
+class ErrorReportsReport(BaseSearchService):
+    def __init__(self, credentials_path: str = None, **kwargs):
+        super().__init__(credentials_path=credentials_path, **kwargs)
+        self._default_fields = None
+
+        self._metric_set = "errorReports"
+
+    def search(
+        self,
+        app_package_name: str = "",
+        start_time: str = None,
+        end_time: str = None,
+        filter: str = None,
+        fields: list[str] = None,
+        page_size: int = 100,
+        retry_count: int = None,
+        sleep_time: int = None,
+    ) -> Iterator[dict]:
+        """
+        Search individual error reports of an app
+
+        Pages are requested lazily, as the iterator is consumed, so only one page of reports is held in memory.
+        Pass `fields=SUMMARY_FIELDS` to skip the stack traces.
+
+        Args:
+            app_package_name: App package name
+            start_time: Start time in UTC (format: YYYY-MM-DD HH:MM), None for the API default
+            end_time: End time in UTC (format: YYYY-MM-DD HH:MM), None for the API default
+            filter: Filter expression, e.g. 'errorIssueId = 1234 AND versionCode = 123'
+            fields: Report fields to return, all fields if None
+            page_size: Page size (max 100)
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+
+        Yields:
+            Error report dicts
+        """
+        fields = self._default_fields if fields is None else fields
+        params = self._interval_params(start_time=start_time, end_time=end_time)
+        if filter:
+            params["filter"] = filter
+
+        return self._iter_search(resource=self._metric_set,
+                                 items_key="errorReports",
+                                 app_package_name=app_package_name,
+                                 params=params,
+                                 fields=fields,
+                                 page_size=page_size,
+                                 retry_count=retry_count,
+                                 sleep_time=sleep_time)
+
+    def search_many(self, app_package_names: list[str], max_workers: int = 8, **kwargs) -> dict:
+        """
+        Search error reports of many apps concurrently
+
+        Args:
+            app_package_names: App package names
+            max_workers: Number of apps searched concurrently
+            **kwargs: Arguments of `search`
+
+        Returns:
+            Dict {app_package_name: list of error report dicts}. Reports of failed searches are the exception.
+        """
+        return self._search_many(app_package_names, max_workers=max_workers, **kwargs)
@@ -0,0 +1,203 @@
+import csv
+import json
+import os
+from typing import Callable
+
+from google_play_developer_api.report.columnar import ColumnBuffers
+
+SUCCESS_MARKER = "_SUCCESS"
+
+
+class NdjsonWriter:
+    extension = "ndjson"
+
+    def __init__(self, path: str, app_package_name: str, dimensions: list[str], metrics: list[str],
+                 parse_rows: Callable[[list[dict]], list[dict]]):
+        """
+        Write parsed rows as newline delimited JSON, one page at a time
+
+        Args:
+            path: Output file path
+            app_package_name: App package name
+            dimensions: Dimensions of the query
+            metrics: Metrics of the query
+            parse_rows: Function parsing raw rows of one page into dicts
+        """
+        self._parse_rows = parse_rows
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write_page(self, rows: list[dict]):
+        self._file.writelines(json.dumps(row) + "\n" for row in self._parse_rows(rows))
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter:
+    extension = "csv"
+
+    def __init__(self, path: str, app_package_name: str, dimensions: list[str], metrics: list[str],
+                 parse_rows: Callable[[list[dict]], list[dict]]):
+        """
+        Write parsed rows as CSV with a fixed header, one page at a time
+
+        Args:
+            path: Output file path
+            app_package_name: App package name
+            dimensions: Dimensions of the query
+            metrics: Metrics of the query
+            parse_rows: Function parsing raw rows of one page into dicts
+        """
+        self._parse_rows = parse_rows
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file,
+                                      fieldnames=["eventDate", "timeZone", "appPackageName", *dimensions, *metrics],
+                                      restval="",
+                                      extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write_page(self, rows: list[dict]):
+        self._writer.writerows(self._parse_rows(rows))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    extension = "parquet"
+
+    def __init__(self, path: str, app_package_name: str, dimensions: list[str], metrics: list[str],
+                 parse_rows: Callable[[list[dict]], list[dict]] = None):
+        """
+        Write typed columns as Parquet, one row group per page
+
+        Args:
+            path: Output file path
+            app_package_name: App package name
+            dimensions: Dimensions of the query
+            metrics: Metrics of the query
+            parse_rows: Unused, pages are parsed into columns directly
+        """
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ImportError("pyarrow is required for the parquet format, install it with `pip install pyarrow`")
+
+        self._path = path
+        self._app_package_name = app_package_name
+        self._dimensions = dimensions
+        self._metrics = metrics
+        self._writer = None
+
+    def write_page(self, rows: list[dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not rows and self._writer is not None:
+            return
+
+        # Types only depend on the query, so every page has the schema of the file
+        buffers = ColumnBuffers(app_package_name=self._app_package_name,
+                                dimensions=self._dimensions,
+                                metrics=self._metrics,
+                                infer_types=False)
+        buffers.add_rows(rows)
+        table = buffers.to_arrow()
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, table.schema)
+        elif not table.schema.equals(self._writer.schema):
+            table = pa.table({field.name: table[field.name].cast(field.type) for field in self._writer.schema})
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is None:
+            self.write_page([])
+        self._writer.close()
+
+
+WRITERS = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def partition_path(output_dir: str, app_package_name: str, metric_set: str, date: str) -> str:
+    """
+    Directory of one (app, metric set, date) partition
+
+    Args:
+        output_dir: Root output directory
+        app_package_name: App package name
+        metric_set: Metric set name
+        date: Date (format: YYYY-MM-DD)
+
+    Returns:
+        Partition directory path
+    """
+    return os.path.join(output_dir, f"app={app_package_name}", f"metric_set={metric_set}", f"date={date}")
+
+
+def is_partition_done(path: str) -> bool:
+    """
+    Whether a partition was fully written by a previous export
+
+    Args:
+        path: Partition directory path
+
+    Returns:
+        True if the partition has a success marker
+    """
+    return os.path.exists(os.path.join(path, SUCCESS_MARKER))
+
+
+def write_partition(path: str, pages, file_format: str, app_package_name: str, dimensions: list[str],
+                    metrics: list[str], parse_rows: Callable[[list[dict]], list[dict]], mark_done: bool = True) -> int:
+    """
+    Stream response pages into one partition
+
+    Data goes to a temporary file renamed on success, then a success marker is written, so a partition
+    interrupted by a failure (including a permission error raised by `pages`) is written again by the next export.
+
+    Args:
+        path: Partition directory path
+        pages: Raw response pages
+        file_format: One of ['parquet', 'ndjson', 'csv']
+        app_package_name: App package name
+        dimensions: Dimensions of the query
+        metrics: Metrics of the query
+        parse_rows: Function parsing raw rows of one page into dicts
+        mark_done: Write the success marker. False for a partition that may still get data (e.g. a day after
+            the freshness of the metric set), so the next export writes it again.
+
+    Returns:
+        Number of rows written
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"file_format must be one of {list(WRITERS)}, got {file_format}")
+    writer_class = WRITERS[file_format]
+
+    os.makedirs(path, exist_ok=True)
+    file_path = os.path.join(path, f"part-00000.{writer_class.extension}")
+    tmp_path = f"{file_path}.tmp"
+
+    row_count = 0
+    writer = writer_class(tmp_path, app_package_name, dimensions, metrics, parse_rows)
+    try:
+        for page in pages:
+            rows = page.get("rows", [])
+            writer.write_page(rows)
+            row_count += len(rows)
+    except BaseException:
+        writer.close()
+        os.remove(tmp_path)
+        raise
+    writer.close()
+
+    os.replace(tmp_path, file_path)
+    if not mark_done:
+        return row_count
+    with open(os.path.join(path, SUCCESS_MARKER), "w") as f:
+        json.dump({"rows": row_count}, f)
+    return row_count
@@ -0,0 +1,71 @@
+from collections import Counter
+
+KEY_COLUMNS = ["eventDate", "timeZone", "appPackageName"]
+
+
+class RowJoiner:
+    def __init__(self, dimensions: list[str], metrics: dict[str, list[str]]):
+        """
+        Full outer hash join of report rows of several metric sets on (eventDate, dimensions)
+
+        Rows are merged into an index as each metric set arrives, so the join of the first results runs while
+        the others are still being fetched, in one pass over each result. Metrics returned by several metric
+        sets (e.g. distinctUsers) are renamed '<metric set>.<metric>'. Metric values are decoded to floats,
+        as in the columnar outputs, since joined rows are meant to be compared across metric sets.
+
+        Args:
+            dimensions: Dimensions shared by all metric sets, the join key with eventDate
+            metrics: Dict of metric set name to its metrics, in output column order
+        """
+        self.dimensions = list(dimensions)
+        self.metrics = metrics
+
+        counts = Counter(metric for names in metrics.values() for metric in names)
+        self.columns = {
+            name: {metric: f"{name}.{metric}" if counts[metric] > 1 else metric for metric in names}
+            for name, names in metrics.items()
+        }
+        # Every joined row starts from this template, so all rows have the same columns in the same order
+        self._template = dict.fromkeys(KEY_COLUMNS + self.dimensions, "")
+        for columns in self.columns.values():
+            self._template.update(dict.fromkeys(columns.values()))
+
+        self._index = {}
+
+    def add(self, name: str, rows: list[dict]):
+        """
+        Merge the rows of one metric set
+
+        Args:
+            name: Metric set name, a key of `metrics`
+            rows: Dicts with report data
+        """
+        columns = list(self.columns[name].items())
+        dimensions = self.dimensions
+        index = self._index
+        template = self._template
+
+        for row in rows:
+            key = (row["eventDate"], *[row.get(dimension, "") for dimension in dimensions])
+            joined = index.get(key)
+            if joined is None:
+                joined = template.copy()
+                joined["eventDate"] = row["eventDate"]
+                joined["timeZone"] = row.get("timeZone", "")
+                joined["appPackageName"] = row.get("appPackageName", "")
+                for dimension in dimensions:
+                    joined[dimension] = row.get(dimension, "")
+                index[key] = joined
+            for metric, column in columns:
+                value = row.get(metric)
+                joined[column] = float(value) if value not in ("", None) else None
+
+    def rows(self) -> list[dict]:
+        """
+        Get the joined rows
+
+        Returns:
+            List of dicts with the key columns, dimensions and the float metrics of every metric set. Metrics
+            without a value, or of a metric set without a row for a key, are None.
+        """
+        return list(self._index.values())
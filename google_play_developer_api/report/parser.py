@@ -0,0 +1,122 @@
+import sys
+from collections import namedtuple
+
+ROW_TYPES = ["dict", "namedtuple"]
+
+
+class _InternedNames(dict):
+    def __missing__(self, name: str) -> str:
+        interned = self[name] = sys.intern(name)
+        return interned
+
+
+class RowDecoder:
+    def __init__(self, aggregation_period: str, row_type: str = "dict"):
+        """
+        Decoder of the raw report rows of one query
+
+        Column names are interned and shared by every row instead of keeping the strings of each response, which
+        lowers the memory held by large results; decoding itself is not faster than building each dict. The
+        eventDate strings and namedtuple classes are kept for the lifetime of the decoder, so use one decoder per
+        query rather than sharing one between queries or threads.
+
+        Args:
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            row_type: One of ['dict', 'namedtuple']
+        """
+        if row_type not in ROW_TYPES:
+            raise ValueError(f"row_type must be one of {ROW_TYPES}, got {row_type}")
+
+        self.hourly = aggregation_period == "HOURLY"
+        self.row_type = row_type
+
+        self._event_dates = {}
+        self._names = _InternedNames()
+        self._row_classes = {}
+
+    def _event_date(self, start_time: dict) -> str:
+        key = (start_time.get("year"), start_time.get("month"), start_time.get("day"), start_time.get("hours"))
+        event_date = self._event_dates.get(key)
+        if event_date is None:
+            year, month, day, hour = key
+            if self.hourly:
+                event_date = f"{year}-{month}-{day} {'00' if hour is None else hour}:00"
+            else:
+                event_date = f"{year}-{month}-{day}"
+            self._event_dates[key] = event_date
+        return event_date
+
+    def _row_class(self, keys: tuple):
+        row_class = self._row_classes[keys] = namedtuple("ReportRow", keys)
+        return row_class
+
+    def decode(self, rows: list[dict], app_package_name: str) -> list:
+        """
+        Decode raw rows of one response page
+
+        Args:
+            rows: Raw rows
+            app_package_name: App package name
+
+        Returns:
+            List of dicts (or namedtuples) with report data
+        """
+        names = self._names
+        event_dates = self._event_dates
+        namedtuples = self.row_type == "namedtuple"
+        row_keys = row_class = None
+
+        result_list = []
+        append = result_list.append
+        for row in rows:
+            start_time = row["startTime"]
+            event_date = event_dates.get((start_time.get("year"), start_time.get("month"), start_time.get("day"),
+                                          start_time.get("hours")))
+            if event_date is None:
+                event_date = self._event_date(start_time)
+
+            result = {
+                "eventDate": event_date,
+                "timeZone": start_time["timeZone"]["id"],
+                "appPackageName": app_package_name,
+            }
+            for cell in row.get("dimensions", ()):
+                if "stringValue" in cell:
+                    result[names[cell["dimension"]]] = cell["stringValue"]
+                elif "int64Value" in cell:
+                    result[names[cell["dimension"]]] = cell["int64Value"]
+                else:
+                    result[names[cell["dimension"]]] = ""
+            for cell in row.get("metrics", ()):
+                value = cell.get("decimalValue")
+                result[names[cell["metric"]]] = value["value"] if value is not None else ""
+
+            if namedtuples:
+                keys = tuple(result)
+                if keys != row_keys:
+                    # Rows of a page share their columns, the class only changes if a row has other cells
+                    row_keys = keys
+                    row_class = self._row_classes.get(keys) or self._row_class(keys)
+                append(row_class._make(result.values()))
+            else:
+                append(result)
+
+        return result_list
+
+
+def decode_rows(rows: list[dict], app_package_name: str, aggregation_period: str, row_type: str = "dict") -> list:
+    """
+    Decode raw rows of one response page with a decoder of its own
+
+    Args:
+        rows: Raw rows
+        app_package_name: App package name
+        aggregation_period: One of ['HOURLY', 'DAILY']
+        row_type: One of ['dict', 'namedtuple']
+
+    Returns:
+        List of dicts (or namedtuples) with report data
+    """
+    if not rows:
+        return []
+    return RowDecoder(aggregation_period, row_type).decode(rows, app_package_name)
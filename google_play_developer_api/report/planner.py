@@ -0,0 +1,233 @@
+import datetime
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from google_play_developer_api.report.base_report import SHARD_SIZES, BaseReportingService
+
+BUCKET_SIZES = {
+    "HOURLY": datetime.timedelta(hours=1),
+    "DAILY": datetime.timedelta(days=1),
+}
+
+
+@dataclass
+class QueryPlan:
+    """
+    One query of a plan
+
+    Args:
+        dimensions: Dimensions of the query, the breakdown it answers
+        estimated_rows: Estimated number of rows (upper bound)
+        estimated_pages: Estimated number of response pages
+        shard_by: Time sharding used to fetch it ('DAY' or 'WEEK'), None for a single query
+    """
+    dimensions: tuple
+    estimated_rows: int
+    estimated_pages: int
+    shard_by: str = None
+
+
+class QueryPlanner:
+    def __init__(self,
+                 report: BaseReportingService,
+                 page_size: int = 50000,
+                 max_pages_per_query: int = 4,
+                 cardinalities: dict[str, int] = None):
+        """
+        Plan report queries from the breakdowns actually needed, instead of one query on all default dimensions
+
+        Rows of a query are the cross product of its dimension values, so a query on the 18 default dimensions
+        returns orders of magnitude more rows than a few queries with one or two dimensions each. Each requested
+        breakdown becomes its own query with only its dimensions (rates can't be re-aggregated from a finer
+        breakdown without weights, so a breakdown is never derived from another one).
+
+        Row counts are estimated before fetching from the cardinality of each dimension, measured with small
+        one-dimension queries on the last day of the range and cached per (app, metric set, dimension).
+        Queries estimated to need more than `max_pages_per_query` pages are time sharded.
+
+        Args:
+            report: Report instance, e.g. CrashRateReport
+            page_size: Page size of the queries
+            max_pages_per_query: Estimated page count above which a query is time sharded
+            cardinalities: Known number of distinct values per dimension, used instead of measuring them
+        """
+        self._report = report
+        self._page_size = page_size
+        self._max_pages_per_query = max_pages_per_query
+        self._hints = {} if cardinalities is None else dict(cardinalities)
+        self._cardinalities = {}
+        self._lock = threading.Lock()
+
+    def get_cardinalities(self,
+                          app_package_name: str,
+                          dimensions: list[str],
+                          sample_date: datetime.date,
+                          metric_set: str = None,
+                          metrics: list[str] = None) -> dict[str, int]:
+        """
+        Get the number of distinct values of each dimension during one day
+
+        Unknown cardinalities are measured with one small query per dimension, sent together.
+
+        Args:
+            app_package_name: App package name
+            dimensions: Dimensions
+            sample_date: Day the values are counted on
+            metric_set: Metric set name, default metric set of the report if None
+            metrics: Metrics of the metric set, the first one is requested by the measuring queries.
+                Default metrics of the report if None, which only belong to its default metric set.
+
+        Returns:
+            Dict of dimension to number of distinct values (at least 1)
+        """
+        metric_set = self._report._metric_set if metric_set is None else metric_set
+        metrics = self._report._default_metrics if metrics is None else metrics
+        with self._lock:
+            result = {dimension: self._hints[dimension] for dimension in dimensions if dimension in self._hints}
+            for dimension in dimensions:
+                key = (app_package_name, metric_set, dimension)
+                if dimension not in result and key in self._cardinalities:
+                    result[dimension] = self._cardinalities[key]
+
+        missing = [dimension for dimension in dimensions if dimension not in result]
+        if missing:
+            sample_start = datetime.datetime.combine(sample_date, datetime.time())
+            timeline_spec = self._report._timeline_spec("DAILY",
+                                                        start_time=sample_start,
+                                                        end_time=sample_start + datetime.timedelta(days=1))
+            queries = [{
+                "app_package_name": app_package_name,
+                "timeline_spec": timeline_spec,
+                "dimensions": [dimension],
+                "metrics": metrics[:1],
+                "metric_set": metric_set,
+            } for dimension in missing]
+
+            for dimension, rows in zip(missing, self._report.query_many(queries)):
+                if isinstance(rows, Exception):
+                    logging.warning(f"Failed to measure cardinality of {dimension}: {rows}")
+                    continue
+                cardinality = max(1, len({row[dimension] for row in rows}))
+                result[dimension] = cardinality
+                with self._lock:
+                    self._cardinalities[(app_package_name, metric_set, dimension)] = cardinality
+
+        # A dimension that couldn't be measured doesn't change the estimate
+        return {dimension: result.get(dimension, 1) for dimension in dimensions}
+
+    def _shard_by(self, start_time: datetime.datetime, end_time: datetime.datetime, estimated_rows: int) -> str:
+        max_rows = self._page_size * self._max_pages_per_query
+        if estimated_rows <= max_rows or end_time <= start_time:
+            # An empty range is one (empty) query
+            return None
+        rows_per_second = estimated_rows / (end_time - start_time).total_seconds()
+        if rows_per_second * SHARD_SIZES["WEEK"].total_seconds() <= max_rows:
+            return "WEEK"
+        return "DAY"
+
+    def plan(self,
+             app_package_name: str,
+             breakdowns: list[list[str]],
+             start_time: datetime.datetime,
+             end_time: datetime.datetime,
+             aggregation_period: str = "DAILY",
+             metric_set: str = None,
+             metrics: list[str] = None) -> list[QueryPlan]:
+        """
+        Plan the queries answering the requested breakdowns
+
+        Args:
+            app_package_name: App package name
+            breakdowns: Dimension lists, e.g. [['versionCode'], ['countryCode'], ['deviceModel', 'apiLevel']].
+                An empty list is the totals over all dimensions.
+            start_time: Start time
+            end_time: End time (exclusive)
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            metric_set: Metric set name, default metric set of the report if None
+            metrics: Metrics of the queries, default metrics of the report if None (see `get_cardinalities`)
+
+        Returns:
+            One QueryPlan per distinct breakdown, in request order
+        """
+        if aggregation_period not in BUCKET_SIZES:
+            raise ValueError(f"aggregation_period must be one of {list(BUCKET_SIZES)}, got {aggregation_period}")
+
+        # The same breakdown in another dimension order is the same query
+        unique = {}
+        for breakdown in breakdowns:
+            unique.setdefault(frozenset(breakdown), tuple(breakdown))
+        breakdowns = list(unique.values())
+
+        dimensions = list(dict.fromkeys(dimension for breakdown in breakdowns for dimension in breakdown))
+        sample_date = (end_time - datetime.timedelta(days=1)).date()
+        cardinalities = self.get_cardinalities(app_package_name, dimensions, sample_date,
+                                               metric_set=metric_set,
+                                               metrics=metrics)
+
+        buckets = max(1, math.ceil((end_time - start_time) / BUCKET_SIZES[aggregation_period]))
+        plans = []
+        for breakdown in breakdowns:
+            estimated_rows = buckets * math.prod(cardinalities[dimension] for dimension in breakdown)
+            plans.append(QueryPlan(dimensions=breakdown,
+                                   estimated_rows=estimated_rows,
+                                   estimated_pages=max(1, math.ceil(estimated_rows / self._page_size)),
+                                   shard_by=self._shard_by(start_time, end_time, estimated_rows)))
+        return plans
+
+    def execute(self,
+                app_package_name: str,
+                breakdowns: list[list[str]],
+                start_time: str,
+                end_time: str,
+                aggregation_period: str = "DAILY",
+                metrics: list[str] = None,
+                metric_set: str = None,
+                max_workers: int = 4,
+                **kwargs) -> dict[tuple, list[dict]]:
+        """
+        Plan and run the queries answering the requested breakdowns, concurrently
+
+        Args:
+            app_package_name: App package name
+            breakdowns: Dimension lists, e.g. [['versionCode'], ['countryCode']]
+            start_time: Start time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+            end_time: End time (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            metrics: Metrics, default metrics of the report if None
+            metric_set: Metric set name, default metric set of the report if None
+            max_workers: Number of queries run concurrently
+            kwargs: Extra arguments passed to `get_hourly`/`get_daily`. A `page_size` is used instead of the page
+                size of the planner.
+
+        Returns:
+            Dict of breakdown (tuple of dimensions) to its report data
+        """
+        time_format = "%Y-%m-%d %H:%M" if aggregation_period == "HOURLY" else "%Y-%m-%d"
+        page_size = kwargs.pop("page_size", self._page_size)
+        plans = self.plan(app_package_name,
+                          breakdowns,
+                          start_time=datetime.datetime.strptime(start_time, time_format),
+                          end_time=datetime.datetime.strptime(end_time, time_format),
+                          aggregation_period=aggregation_period,
+                          metric_set=metric_set,
+                          metrics=metrics)
+        get_report_data = self._report.get_hourly if aggregation_period == "HOURLY" else self._report.get_daily
+
+        def run(plan: QueryPlan):
+            logging.info(f"Query {list(plan.dimensions)}: ~{plan.estimated_rows} rows, ~{plan.estimated_pages} pages"
+                         f"{f', sharded by {plan.shard_by}' if plan.shard_by else ''}")
+            return get_report_data(app_package_name=app_package_name,
+                                   start_time=start_time,
+                                   end_time=end_time,
+                                   dimensions=list(plan.dimensions),
+                                   metrics=metrics,
+                                   metric_set=metric_set,
+                                   shard_by=plan.shard_by,
+                                   page_size=page_size,
+                                   **kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip([plan.dimensions for plan in plans], executor.map(run, plans)))
@@ -0,0 +1,154 @@
+import re
+
+ROLLUP_PERIODS = ["HOURLY", "DAILY", "WEEKLY"]
+ROLLUP_OUTPUT_FORMATS = ["records", "pandas", "arrow"]
+KEY_COLUMNS = ["eventDate", "timeZone", "appPackageName"]
+# Metrics that add up across rows; every other metric is a rate, averaged with the weight metric
+SUM_METRICS = {"distinctUsers", "errorReportCount"}
+# Metric columns of the report data: rates (crashRate, slowRenderingRate20Fps, crashRate7dUserWeighted, ...) and counts
+METRIC_PATTERN = re.compile(r"Rate|^distinctUsers$|^errorReportCount$")
+
+
+class ReportRollup:
+    def __init__(self, weight_metric: str = "distinctUsers", sum_metrics: set[str] = None):
+        """
+        Re-aggregate fetched report data locally: coarser dimension breakdowns and time buckets
+        (hourly -> daily -> weekly) without new API calls
+
+        Count metrics are summed. Rates (crashRate, anrRate, ...) are averaged weighted by `distinctUsers`, i.e.
+        sum(rate * users) / sum(users). Users active in several rows (several hours, or several values of a
+        dropped dimension such as versionCode after an update) are counted once per row, so rolled up rates are
+        close to, but not exactly, the rates the API returns for the coarser query, and summed distinctUsers is an
+        upper bound of the distinct users. Time buckets are in the time zone of the data (UTC for hourly data),
+        which can differ from the time zone of the API's daily data.
+
+        Args:
+            weight_metric: Metric weighting the rates
+            sum_metrics: Metrics summed instead of averaged, `SUM_METRICS` if None
+        """
+        self._weight_metric = weight_metric
+        self._sum_metrics = SUM_METRICS if sum_metrics is None else set(sum_metrics)
+
+    @staticmethod
+    def _to_frame(data):
+        """
+        Get a DataFrame from report data
+
+        Args:
+            data: pandas DataFrame (output_format='pandas') or list of dicts/namedtuples (records, namedtuples)
+
+        Returns:
+            DataFrame, sharing the data of a DataFrame input
+        """
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            return data.copy(deep=False)
+        if data and hasattr(data[0], "_fields"):
+            fields = data[0]._fields
+            if all(row._fields == fields for row in data):
+                return pd.DataFrame.from_records(data, columns=fields)
+            # Rows with other cells are of another class, e.g. a dimension missing from some rows
+            return pd.DataFrame.from_records([row._asdict() for row in data])
+        return pd.DataFrame.from_records(data)
+
+    def rollup(self,
+               data,
+               dimensions: list[str] = None,
+               period: str = "DAILY",
+               metrics: list[str] = None,
+               output_format: str = "pandas"):
+        """
+        Group report data by a subset of its dimensions and by coarser time buckets
+
+        Args:
+            data: Report data from `get_hourly`/`get_daily`: pandas DataFrame, records or namedtuples
+            dimensions: Dimensions kept, a subset of the fetched ones; [] or None for totals
+            period: Time bucket of the result, one of ['HOURLY', 'DAILY', 'WEEKLY'] (weeks start on Monday)
+            metrics: Metrics of the result, all metrics of the data if None
+            output_format: One of ['records', 'pandas', 'arrow']
+
+        Returns:
+            Aggregated data with eventDate (start of the bucket), timeZone, appPackageName, the kept dimensions
+            and the metrics. Records have eventDate formatted as 'YYYY-MM-DD HH:MM' (HOURLY) or 'YYYY-MM-DD'.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for ReportRollup, install it with `pip install pandas`")
+
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"period must be one of {ROLLUP_PERIODS}, got {period}")
+        if output_format not in ROLLUP_OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {ROLLUP_OUTPUT_FORMATS}, got {output_format}")
+
+        dimensions = list(dimensions or [])
+        frame = self._to_frame(data)
+        if frame.empty:
+            return [] if output_format == "records" else self._build(frame, output_format, period)
+
+        missing = [column for column in KEY_COLUMNS + dimensions if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} are not in the data, fetch them to roll up on them")
+        if metrics is None:
+            metrics = [column for column in frame.columns if METRIC_PATTERN.search(column)]
+        rates = [metric for metric in metrics if metric not in self._sum_metrics]
+        if rates and self._weight_metric not in frame.columns:
+            raise ValueError(f"Rates {rates} are weighted by {self._weight_metric}, "
+                             f"add it to the metrics of the query")
+
+        # Records hold strings: unpadded dates (e.g. '2024-1-5 3:00') and decimal values, '' when missing
+        event_date = frame["eventDate"]
+        if not pd.api.types.is_datetime64_any_dtype(event_date):
+            event_date = pd.to_datetime(event_date, format="mixed")
+        values = {}
+        for metric in dict.fromkeys(metrics + ([self._weight_metric] if rates else [])):
+            column = frame[metric]
+            if not pd.api.types.is_float_dtype(column):
+                column = pd.to_numeric(column, errors="coerce").astype("float64")
+            values[metric] = column
+
+        if period == "DAILY":
+            event_date = event_date.dt.floor("D")
+        elif period == "WEEKLY":
+            event_date = event_date.dt.floor("D") - pd.to_timedelta(event_date.dt.dayofweek, unit="D")
+
+        keys = KEY_COLUMNS + dimensions
+        columns = {key: frame[key] for key in keys}
+        columns["eventDate"] = event_date
+        weight = values[self._weight_metric].fillna(0.0) if rates else None
+        for metric in metrics:
+            if metric in rates:
+                # Rows without a value of the rate don't weigh in its average
+                columns[f"_weighted_{metric}"] = (values[metric] * weight).fillna(0.0)
+                columns[f"_weight_{metric}"] = weight.where(values[metric].notna(), 0.0)
+            else:
+                columns[metric] = values[metric]
+
+        sums = pd.DataFrame(columns).groupby(keys, observed=True, sort=True, dropna=False).sum(min_count=1)
+
+        result = sums.index.to_frame(index=False)
+        for metric in metrics:
+            if metric in rates:
+                weights = sums[f"_weight_{metric}"]
+                result[metric] = (sums[f"_weighted_{metric}"] / weights.where(weights > 0)).to_numpy()
+            else:
+                result[metric] = sums[metric].to_numpy()
+
+        return self._build(result, output_format, period)
+
+    @staticmethod
+    def _build(result, output_format: str, period: str):
+        if output_format == "pandas":
+            return result
+        if output_format == "arrow":
+            try:
+                import pyarrow as pa
+            except ImportError:
+                raise ImportError("pyarrow is required for output_format='arrow', "
+                                  "install it with `pip install pyarrow`")
+            return pa.Table.from_pandas(result, preserve_index=False)
+
+        time_format = "%Y-%m-%d %H:%M" if period == "HOURLY" else "%Y-%m-%d"
+        result = result.assign(eventDate=result["eventDate"].dt.strftime(time_format)).astype(object)
+        return result.where(result.notna(), None).to_dict("records")
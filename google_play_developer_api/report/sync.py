@@ -0,0 +1,105 @@
+import datetime
+
+from google_play_developer_api.report.base_report import BaseReportingService
+from google_play_developer_api.state import JsonStateStore
+
+TIME_FORMATS = {
+    "HOURLY": "%Y-%m-%d %H:%M",
+    "DAILY": "%Y-%m-%d",
+}
+
+
+class IncrementalSync:
+    def __init__(self, report: BaseReportingService, state_store: JsonStateStore):
+        """
+        Fetch only the report data published since the previous sync
+
+        A watermark is kept per (app, metric set, aggregation period). Each sync reads the freshness of the report,
+        fetches [watermark, latestEndTime) and moves the watermark to latestEndTime once the fetch succeeded.
+        A failed fetch, including a permission error (403), raises and leaves the watermark where it was.
+
+        Args:
+            report: Report instance, e.g. CrashRateReport
+            state_store: Store keeping the watermarks between runs
+        """
+        self._report = report
+        self._state_store = state_store
+
+    @staticmethod
+    def _watermark_key(app_package_name: str, metric_set: str, aggregation_period: str) -> str:
+        return f"{app_package_name}/{metric_set}/{aggregation_period}"
+
+    def get_watermark(self, app_package_name: str, aggregation_period: str = "HOURLY", metric_set: str = None) -> str:
+        """
+        Get the end time of the last synced data
+
+        Args:
+            app_package_name: App package name
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            metric_set: Metric set name, default metric set of the report if None
+
+        Returns:
+            Watermark (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY), None if never synced
+        """
+        metric_set = self._report._metric_set if metric_set is None else metric_set
+        return self._state_store.get(self._watermark_key(app_package_name, metric_set, aggregation_period))
+
+    def sync(
+        self,
+        app_package_name: str,
+        aggregation_period: str = "HOURLY",
+        initial_start_time: str = None,
+        dimensions: list[str] = None,
+        metrics: list[str] = None,
+        metric_set: str = None,
+        **kwargs,
+    ) -> list[dict]:
+        """
+        Fetch report data between the watermark and the latest available time
+
+        Args:
+            app_package_name: App package name
+            aggregation_period: One of ['HOURLY', 'DAILY']
+            initial_start_time: Start time of the first sync, when no watermark is stored yet
+                (format: YYYY-MM-DD HH:MM for HOURLY, YYYY-MM-DD for DAILY)
+            dimensions: Dimensions
+            metrics: Metrics
+            metric_set: Metric set name, default metric set of the report if None
+            kwargs: Extra arguments passed to `get_hourly`/`get_daily`
+
+        Returns:
+            List of dicts with report data, empty if nothing new was published
+
+        Raises:
+            HttpError: The freshness or the data could not be fetched, e.g. permission denied (403)
+        """
+        if aggregation_period not in TIME_FORMATS:
+            raise ValueError(f"aggregation_period must be one of {list(TIME_FORMATS)}, got {aggregation_period}")
+        time_format = TIME_FORMATS[aggregation_period]
+
+        metric_set = self._report._metric_set if metric_set is None else metric_set
+        key = self._watermark_key(app_package_name, metric_set, aggregation_period)
+        watermark = self._state_store.get(key, initial_start_time)
+        if watermark is None:
+            raise ValueError(f"No watermark stored for {key}, initial_start_time is required")
+
+        freshnesses = self._report.get_freshnesses(app_package_name=app_package_name, metric_set=metric_set)
+        latest_end_time = self._report._latest_end_time(freshnesses, aggregation_period)
+        if latest_end_time is None:
+            return []
+        if datetime.datetime.strptime(watermark, time_format) >= latest_end_time:
+            return []
+
+        get_report_data = self._report.get_hourly if aggregation_period == "HOURLY" else self._report.get_daily
+        end_time = latest_end_time.strftime(time_format)
+        rows = get_report_data(app_package_name=app_package_name,
+                               start_time=watermark,
+                               end_time=end_time,
+                               dimensions=dimensions,
+                               metrics=metrics,
+                               metric_set=metric_set,
+                               raise_on_denied=True,
+                               **kwargs)
+
+        self._state_store.set(key, end_time)
+        return rows
@@ -0,0 +1,26 @@
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported on first access, like the report classes
+_exports = {
+    "ReviewService": ".reviews",
+    "ReviewSync": ".sync",
+}
+
+__all__ = list(_exports)
+
+if TYPE_CHECKING:
+    from .reviews import ReviewService
+    from .sync import ReviewSync
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
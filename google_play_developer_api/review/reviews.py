@@ -0,0 +1,213 @@
+import datetime
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Union
+
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.client import PUBLISHER_SCOPES, get_credentials, get_publisher_service
+from google_play_developer_api.credential_pool import CredentialPool
+from google_play_developer_api.instrumentation import Instrumentation
+from google_play_developer_api.scheduler import PERMANENT, RequestScheduler, reviews_scheduler
+from google_play_developer_api.service import BaseService
+
+
+def review_timestamp(review: dict) -> tuple[int, int]:
+    """
+    Get the last modification time of a raw review, i.e. of its user comment
+
+    Args:
+        review: Raw review dict
+
+    Returns:
+        Tuple of (seconds, nanos) since the epoch, (0, 0) if the review has no user comment
+    """
+    for comment in review.get("comments", []):
+        if "userComment" in comment:
+            last_modified = comment["userComment"].get("lastModified", {})
+            return int(last_modified.get("seconds", 0)), int(last_modified.get("nanos", 0))
+    return 0, 0
+
+
+def _format_timestamp(timestamp: dict) -> str:
+    if not timestamp:
+        return ""
+    seconds = int(timestamp.get("seconds", 0))
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class ReviewService(BaseService):
+    _default_scheduler = reviews_scheduler
+
+    def __init__(self,
+                 credentials_path: Union[str, list[str]] = None,
+                 credentials=None,
+                 publisher_service=None,
+                 api_version: str = "v3",
+                 discovery_path: str = None,
+                 static_discovery: bool = True,
+                 scheduler: RequestScheduler = None,
+                 http=None,
+                 instrumentation: Instrumentation = None,
+                 credential_pool: CredentialPool = None):
+        """
+        Reviews of the androidpublisher API (`reviews.list`), which returns the reviews created or modified during
+        the last week, most recently modified first
+
+        Credentials and clients are cached process-wide, like the report classes.
+
+        Args:
+            credentials_path: Path to a service account json file, or a list of paths to spread requests over
+                several service accounts
+            credentials: Already loaded credentials, used instead of `credentials_path`
+            publisher_service: Already built androidpublisher client to share between instances
+            api_version: androidpublisher API version
+            discovery_path: Path to a discovery document saved on disk, used instead of the bundled one
+            static_discovery: Use the discovery document bundled with googleapiclient (no network I/O)
+            scheduler: Rate limiter and retry policy of API calls. If None, a process-wide scheduler shared by the
+                review instances, limited to the reviews quota (200 requests per hour), not the Reporting API one
+            http: Thread-safe httplib2-like transport shared by all threads, e.g. `transport.PooledHttp`
+            instrumentation: Receives spans, counters and histograms of requests and pages
+            credential_pool: Several credentials sharing the requests, created with the androidpublisher scopes
+        """
+        if isinstance(credentials_path, (list, tuple)):
+            credential_pool = CredentialPool(credentials_paths=credentials_path, scopes=PUBLISHER_SCOPES)
+            credentials_path = None
+        if credential_pool is not None and credentials is None:
+            credentials = credential_pool.credentials
+
+        if publisher_service is None:
+            credentials, publisher_service = get_publisher_service(credentials_path=credentials_path,
+                                                                   credentials=credentials,
+                                                                   version=api_version,
+                                                                   discovery_path=discovery_path,
+                                                                   static_discovery=static_discovery)
+        elif credentials is None and credentials_path is not None:
+            credentials = get_credentials(credentials_path, PUBLISHER_SCOPES)
+        super().__init__(credentials=credentials, scheduler=scheduler, http=http, instrumentation=instrumentation,
+                         credential_pool=credential_pool)
+
+        self._publisher_service = publisher_service
+        self._reviews = publisher_service.reviews()
+
+    def iter_pages(self,
+                   app_package_name: str = "",
+                   max_results: int = 100,
+                   translation_language: str = None,
+                   retry_count: int = None,
+                   sleep_time: int = None) -> Iterator[list[dict]]:
+        """
+        Iterate over pages of raw reviews, requesting the next page only when the previous one has been consumed
+
+        Args:
+            app_package_name: App package name
+            max_results: Page size (max 100)
+            translation_language: Language the review texts are translated to, e.g. 'en', original language if None
+            retry_count: Maximum number of attempts, retry policy of the scheduler if None
+            sleep_time: Base backoff delay (seconds), retry policy of the scheduler if None
+
+        Yields:
+            Lists of raw review dicts, one per page
+        """
+        params = {"translationLanguage": translation_language} if translation_language else {}
+
+        token = None
+        while True:
+            request = self._reviews.list(packageName=app_package_name, maxResults=max_results, token=token, **params)
+            try:
+                with self._instrumentation.span("reviews_page", app_package_name=app_package_name) as attributes:
+                    response = self._scheduler.execute(functools.partial(self._execute, request),
+                                                       retry_policy=self._retry_policy(retry_count, sleep_time),
+                                                       description=f"List reviews for {app_package_name}",
+                                                       on_retry=self._on_retry)
+                    attributes["rows"] = len(response.get("reviews", []))
+            except HttpError as e:
+                if e.resp.status == 403 and self._scheduler.retry_policy.classify(e) == PERMANENT:
+                    logging.warning(f'Permission denied for {app_package_name}')
+                    return
+                if e.resp.status == 400:
+                    logging.warning(f'Bad request for {app_package_name}, {e.reason}')
+                raise e
+
+            yield response.get("reviews", [])
+            token = response.get("tokenPagination", {}).get("nextPageToken")
+            if not token:
+                break
+
+    @staticmethod
+    def parse_review(review: dict, app_package_name: str = "") -> dict:
+        """
+        Flatten a raw review
+
+        Args:
+            review: Raw review dict
+            app_package_name: App package name
+
+        Returns:
+            Dict with the review, its user comment and the developer reply
+        """
+        user_comment = {}
+        developer_comment = {}
+        for comment in review.get("comments", []):
+            if "userComment" in comment and not user_comment:
+                user_comment = comment["userComment"]
+            elif "developerComment" in comment and not developer_comment:
+                developer_comment = comment["developerComment"]
+
+        return {
+            "app_package_name": app_package_name,
+            "reviewId": review.get("reviewId", ""),
+            "authorName": review.get("authorName", ""),
+            "starRating": user_comment.get("starRating"),
+            "text": user_comment.get("text", ""),
+            "originalText": user_comment.get("originalText", ""),
+            "reviewerLanguage": user_comment.get("reviewerLanguage", ""),
+            "lastModified": _format_timestamp(user_comment.get("lastModified")),
+            "appVersionCode": user_comment.get("appVersionCode"),
+            "appVersionName": user_comment.get("appVersionName", ""),
+            "androidOsVersion": user_comment.get("androidOsVersion"),
+            "device": user_comment.get("device", ""),
+            "thumbsUpCount": user_comment.get("thumbsUpCount", 0),
+            "thumbsDownCount": user_comment.get("thumbsDownCount", 0),
+            "developerReplyText": developer_comment.get("text", ""),
+            "developerReplyLastModified": _format_timestamp(developer_comment.get("lastModified")),
+        }
+
+    def list_reviews(self, app_package_name: str = "", **kwargs) -> Iterator[dict]:
+        """
+        Iterate over the reviews of an app, most recently modified first. Pages are requested lazily,
+        as the iterator is consumed.
+
+        Args:
+            app_package_name: App package name
+            kwargs: Arguments of `iter_pages` (max_results, translation_language, ...)
+
+        Yields:
+            Flat review dicts, see `parse_review`
+        """
+        for page in self.iter_pages(app_package_name=app_package_name, **kwargs):
+            for review in page:
+                yield self.parse_review(review, app_package_name=app_package_name)
+
+    def list_reviews_many(self, app_package_names: list[str], max_workers: int = 16, **kwargs) -> dict:
+        """
+        List the reviews of many apps concurrently
+
+        Args:
+            app_package_names: App package names
+            max_workers: Number of apps listed concurrently
+            kwargs: Arguments of `iter_pages`
+
+        Returns:
+            Dict {app_package_name: list of review dicts}. Reviews of failed apps are the exception.
+        """
+        def list_one(app_package_name):
+            try:
+                return list(self.list_reviews(app_package_name=app_package_name, **kwargs))
+            except Exception as e:
+                logging.warning(f"Failed to list reviews for {app_package_name}: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(app_package_names, executor.map(list_one, app_package_names)))
@@ -0,0 +1,109 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from google_play_developer_api.review.reviews import ReviewService, review_timestamp
+from google_play_developer_api.state import JsonStateStore
+
+
+class ReviewSync:
+    def __init__(self, service: ReviewService, state_store: JsonStateStore, max_workers: int = 16):
+        """
+        Fetch only the reviews created or modified since the previous sync, for many apps concurrently
+
+        A watermark is kept per app: the latest modification time seen and the ids of the reviews modified at that
+        exact time. Reviews are listed most recently modified first, so pagination stops at the first page
+        without any review past the watermark; a sync of an app without new reviews costs one request.
+        Reviews are deduplicated by `reviewId`, within a sync (pages shift when reviews arrive during pagination)
+        and against the reviews at the watermark.
+
+        Args:
+            service: ReviewService instance
+            state_store: Store keeping the watermarks between runs
+            max_workers: Number of apps synced concurrently
+        """
+        self._service = service
+        self._state_store = state_store
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _watermark_key(app_package_name: str) -> str:
+        return f"{app_package_name}/reviews"
+
+    def _sync_app(self, app_package_name: str, watermark: dict, **kwargs):
+        """
+        Fetch the new reviews of one app
+
+        Returns:
+            Tuple of (new review dicts, new watermark), or the exception
+        """
+        last_timestamp = tuple(watermark["last_modified"]) if watermark else None
+        last_ids = set(watermark["review_ids"]) if watermark else set()
+
+        new_reviews = []
+        seen_ids = set()
+        try:
+            for page in self._service.iter_pages(app_package_name=app_package_name, **kwargs):
+                has_new = False
+                for review in page:
+                    timestamp = review_timestamp(review)
+                    review_id = review.get("reviewId")
+                    if last_timestamp is not None and (timestamp < last_timestamp
+                                                       or (timestamp == last_timestamp and review_id in last_ids)):
+                        continue
+                    has_new = True
+                    if review_id not in seen_ids:
+                        seen_ids.add(review_id)
+                        new_reviews.append((timestamp, review))
+                if not has_new:
+                    break
+        except Exception as e:
+            logging.warning(f"Failed to sync reviews for {app_package_name}: {e}")
+            return e
+
+        if not new_reviews:
+            return [], watermark
+
+        max_timestamp = max(timestamp for timestamp, _ in new_reviews)
+        max_ids = {review["reviewId"] for timestamp, review in new_reviews if timestamp == max_timestamp}
+        if max_timestamp == last_timestamp:
+            max_ids |= last_ids
+        new_watermark = {"last_modified": list(max_timestamp), "review_ids": sorted(max_ids)}
+
+        reviews = [self._service.parse_review(review, app_package_name=app_package_name) for _, review in new_reviews]
+        return reviews, new_watermark
+
+    def sync(self, app_package_names: list[str], **kwargs) -> dict:
+        """
+        Fetch the new reviews of many apps concurrently
+
+        On the first sync of an app, every review returned by the API (last week) is new.
+
+        Args:
+            app_package_names: App package names
+            kwargs: Arguments of `ReviewService.iter_pages` (max_results, translation_language, ...)
+
+        Returns:
+            Dict {app_package_name: list of new review dicts}. Failed apps map to the exception and keep
+            their previous watermark.
+        """
+        def sync_one(app_package_name):
+            watermark = self._state_store.get(self._watermark_key(app_package_name))
+            return self._sync_app(app_package_name, watermark, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            responses = list(executor.map(sync_one, app_package_names))
+
+        result = {}
+        watermarks = {}
+        for app_package_name, response in zip(app_package_names, responses):
+            if isinstance(response, Exception):
+                result[app_package_name] = response
+                continue
+            result[app_package_name], watermark = response
+            if watermark is not None:
+                watermarks[self._watermark_key(app_package_name)] = watermark
+
+        # One write for the whole sync
+        if watermarks:
+            self._state_store.update(watermarks)
+        return result
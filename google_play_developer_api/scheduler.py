@@ -0,0 +1,241 @@
+import email.utils
+import logging
+import math
+import random
+import threading
+import time
+from typing import Callable
+
+from googleapiclient.errors import HttpError
+
+QUOTA = "quota"
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+QUOTA_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded", "RESOURCE_EXHAUSTED",
+                 "RATE_LIMIT_EXCEEDED")
+TRANSIENT_STATUSES = (408, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Thread-safe token bucket limiting the request rate
+
+        Args:
+            rate: Tokens added per second (requests per second)
+            capacity: Maximum number of tokens, i.e. the allowed burst. Defaults to `rate`.
+        """
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until `tokens` tokens are available, then take them
+
+        Args:
+            tokens: Number of tokens
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """
+        Time `acquire` would wait for `tokens` tokens now, without taking them
+
+        Args:
+            tokens: Number of tokens
+
+        Returns:
+            Wait in seconds, 0 if the tokens are available
+        """
+        with self._lock:
+            now = time.monotonic()
+            available = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            if now < self._paused_until:
+                return self._paused_until - now + tokens / self.rate
+            return max(0.0, (tokens - available) / self.rate)
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for a while, e.g. after the quota was exceeded
+
+        Args:
+            seconds: Pause duration
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 64.0, jitter: bool = True):
+        """
+        Exponential backoff with jitter, honoring `Retry-After`
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one
+            base_delay: Delay before the first retry (seconds), doubled on each retry
+            max_delay: Maximum delay between two attempts (seconds)
+            jitter: Randomize delays ("full jitter") so concurrent clients don't retry in lockstep
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    @staticmethod
+    def classify(error: Exception) -> str:
+        """
+        Classify an error of an API call
+
+        Args:
+            error: Raised exception
+
+        Returns:
+            One of ['quota', 'transient', 'permanent']
+        """
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status == 429:
+                return QUOTA
+            if status == 403 and any(reason in str(error.content) for reason in QUOTA_REASONS):
+                return QUOTA
+            if status in TRANSIENT_STATUSES:
+                return TRANSIENT
+            return PERMANENT
+        # Network errors, timeouts, ...
+        return TRANSIENT
+
+    @staticmethod
+    def retry_after(error: Exception) -> float:
+        """
+        Get the delay requested by the server with a `Retry-After` header
+
+        Args:
+            error: Raised exception
+
+        Returns:
+            Delay in seconds, None if the header is missing or malformed
+        """
+        if not isinstance(error, HttpError):
+            return None
+        value = error.resp.get("retry-after")
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                logging.warning(f"Ignoring malformed Retry-After header {value!r}")
+                return None
+            delay = retry_at.timestamp() - time.time()
+        if not math.isfinite(delay):
+            logging.warning(f"Ignoring malformed Retry-After header {value!r}")
+            return None
+        return max(0.0, delay)
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """
+        Delay before the next attempt
+
+        Args:
+            attempt: Number of the failed attempt, starting at 1
+            error: Raised exception
+
+        Returns:
+            Delay in seconds
+        """
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class RequestScheduler:
+    def __init__(self, rate_limiter: TokenBucket = None, retry_policy: RetryPolicy = None):
+        """
+        Run API calls under a shared rate limit, retrying failures according to a retry policy
+
+        Quota errors pause the whole rate limiter, so every thread sharing it backs off together.
+        Permanent errors are raised right away.
+
+        Args:
+            rate_limiter: Token bucket shared by all requests of this scheduler, no limit if None
+            retry_policy: Retry policy, default RetryPolicy() if None
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+
+    def execute(self,
+                call: Callable[[], dict],
+                retry_policy: RetryPolicy = None,
+                description: str = "",
+                on_retry: Callable[[int, str, float, Exception], None] = None,
+                cost: int = 1) -> dict:
+        """
+        Execute an API call
+
+        Args:
+            call: Function doing the API call
+            retry_policy: Retry policy of this call, scheduler policy if None
+            description: Description of the call used in logs
+            on_retry: Function called before each retry with (failed attempt, error kind, delay, error)
+            cost: Number of API requests made by each attempt, e.g. the size of a batch HTTP request
+
+        Returns:
+            Result of `call`
+        """
+        retry_policy = self.retry_policy if retry_policy is None else retry_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                # One token at a time: a batch may be larger than the capacity of the bucket
+                for _ in range(cost):
+                    self.rate_limiter.acquire()
+            try:
+                return call()
+            except Exception as e:
+                kind = retry_policy.classify(e)
+                if kind == PERMANENT or attempt >= retry_policy.max_attempts:
+                    raise e
+
+                delay = retry_policy.delay(attempt, e)
+                if kind == QUOTA and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                if on_retry is not None:
+                    on_retry(attempt, kind, delay, e)
+                logging.warning(f"{description} failed ({kind}: {e}), retry {attempt}/{retry_policy.max_attempts - 1} "
+                                f"in {delay:.1f}s...")
+                time.sleep(delay)
+
+
+# Default scheduler shared by all report instances: the Reporting API quota is per Google Cloud project
+default_scheduler = RequestScheduler(rate_limiter=TokenBucket(rate=10))
+
+# Default scheduler of the androidpublisher reviews: a separate quota of 200 GET requests per hour,
+# spent as a burst of up to 200 requests then one request every 18s
+REVIEWS_REQUESTS_PER_HOUR = 200
+reviews_scheduler = RequestScheduler(rate_limiter=TokenBucket(rate=REVIEWS_REQUESTS_PER_HOUR / 3600,
+                                                              capacity=REVIEWS_REQUESTS_PER_HOUR))
@@ -0,0 +1,162 @@
+import logging
+import re
+import threading
+
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.credential_pool import CredentialPool, PooledCredentials
+from google_play_developer_api.instrumentation import Instrumentation, InstrumentedHttp, null_instrumentation
+from google_play_developer_api.scheduler import PERMANENT, QUOTA, RequestScheduler, RetryPolicy, default_scheduler
+
+# App of a request URI: apps/{app}/... (playdeveloperreporting) or applications/{app}/... (androidpublisher)
+APP_PATTERN = re.compile(r"/(?:apps|applications)/([^/:?]+)")
+
+
+class BaseService:
+    # Scheduler used when none is given, subclasses of another API (and quota) override it
+    _default_scheduler = default_scheduler
+
+    def __init__(self,
+                 credentials=None,
+                 scheduler: RequestScheduler = None,
+                 http=None,
+                 instrumentation: Instrumentation = None,
+                 credential_pool: CredentialPool = None):
+        """
+        Request plumbing shared by the API clients of the package: per-thread authorized transports,
+        scheduler (rate limiting and retries) and instrumentation
+
+        Args:
+            credentials: Credentials of the requests, None for a client built without credentials
+            scheduler: Rate limiter and retry policy of API calls, the process-wide default scheduler of the API
+                if None
+            http: Thread-safe httplib2-like transport shared by all threads, e.g. `transport.PooledHttp`.
+                If None, each thread gets its own httplib2 transport.
+            instrumentation: Receives spans, counters and histograms of the requests. Nothing is recorded if None.
+            credential_pool: Several credentials sharing the requests, used instead of `credentials`. Without a
+                scheduler, the pool's per-credentials rate limiters replace the process-wide rate limit.
+        """
+        if credential_pool is not None and http is not None:
+            raise ValueError("http can't be combined with a credential pool, each credentials needs its transport")
+        if scheduler is None:
+            scheduler = self._default_scheduler if credential_pool is None else RequestScheduler()
+
+        self._credentials = credentials
+        self._credential_pool = credential_pool
+        self._http = http
+        self._instrumentation = null_instrumentation if instrumentation is None else instrumentation
+        self._local = threading.local()
+        self._scheduler = scheduler
+
+    def _get_http(self, member: PooledCredentials = None):
+        """
+        Get the http object used by the calling thread
+
+        The injected transport is shared by all threads. Otherwise, as the httplib2 transport used by
+        googleapiclient is not thread-safe, each thread gets its own authorized http object.
+
+        Args:
+            member: Credentials of the pool to authorize with, the credentials of the service if None
+
+        Returns:
+            Authorized http object, None for a client built without credentials
+        """
+        if self._http is not None:
+            return self._http
+        credentials = self._credentials if member is None else member.credentials
+        if credentials is None:
+            return None
+
+        https = getattr(self._local, "https", None)
+        if https is None:
+            https = self._local.https = {}
+        http = https.get(id(credentials))
+        if http is None:
+            from google_auth_httplib2 import AuthorizedHttp
+            from googleapiclient.http import build_http
+
+            http = https[id(credentials)] = AuthorizedHttp(credentials, http=build_http())
+        return http
+
+    def _execute(self, request):
+        """
+        Execute an API request on an http object owned by the calling thread
+
+        Args:
+            request: googleapiclient HttpRequest
+
+        Returns:
+            Response dict
+        """
+        if self._credential_pool is not None:
+            return self._execute_pooled(request)
+
+        http = self._get_http()
+        if http is None:
+            if not self._instrumentation.enabled:
+                return request.execute()
+            http = request.http
+        if self._instrumentation.enabled:
+            http = InstrumentedHttp(http, self._instrumentation)
+        return request.execute(http=http)
+
+    def _execute_pooled(self, request):
+        """
+        Execute an API request with credentials of the pool, failing over to other credentials
+        on permission and quota errors
+
+        Args:
+            request: googleapiclient HttpRequest
+
+        Returns:
+            Response dict
+        """
+        match = APP_PATTERN.search(request.uri)
+        app_package_name = match.group(1) if match else None
+
+        tried = []
+        while True:
+            member = self._credential_pool.acquire(app_package_name, exclude=tried)
+            http = self._get_http(member)
+            if self._instrumentation.enabled:
+                http = InstrumentedHttp(http, self._instrumentation, credentials=member.name)
+            try:
+                return request.execute(http=http)
+            except HttpError as e:
+                kind = self._scheduler.retry_policy.classify(e)
+                if kind == QUOTA:
+                    self._credential_pool.report_quota(member, RetryPolicy.retry_after(e))
+                elif e.resp.status == 403 and kind == PERMANENT:
+                    self._credential_pool.report_denied(member, app_package_name)
+                else:
+                    self._credential_pool.report_error(member)
+                    raise e
+
+                tried.append(member)
+                if not self._credential_pool.has_candidate(app_package_name, exclude=tried):
+                    # Every credentials failed: the scheduler retries quota errors, permission errors are final
+                    raise e
+                self._instrumentation.event("failover", kind=kind, credentials=member.name)
+                logging.info(f"Failing over from {member.name} for {app_package_name} ({kind})")
+
+    def _on_retry(self, attempt: int, kind: str, delay: float, error: Exception):
+        self._instrumentation.event("retry", attempt=attempt, kind=kind, delay=delay, error=repr(error))
+
+    def _retry_policy(self, retry_count: int = None, sleep_time: int = None) -> RetryPolicy:
+        """
+        Retry policy of one call, overriding the scheduler policy with explicit arguments
+
+        Args:
+            retry_count: Maximum number of attempts
+            sleep_time: Base backoff delay (seconds)
+
+        Returns:
+            RetryPolicy, None to use the scheduler policy
+        """
+        if retry_count is None and sleep_time is None:
+            return None
+        policy = self._scheduler.retry_policy
+        return RetryPolicy(max_attempts=policy.max_attempts if retry_count is None else retry_count,
+                           base_delay=policy.base_delay if sleep_time is None else sleep_time,
+                           max_delay=policy.max_delay,
+                           jitter=policy.jitter)
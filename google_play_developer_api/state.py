@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+
+
+class JsonStateStore:
+    def __init__(self, path: str):
+        """
+        Small key-value store persisted as one JSON file, used to keep sync watermarks between runs
+
+        Args:
+            path: Path of the JSON file, created on first write
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._state = json.load(f)
+
+    def get(self, key: str, default=None):
+        """
+        Get a value
+
+        Args:
+            key: Key
+            default: Value returned when the key is not set
+
+        Returns:
+            Stored value
+        """
+        with self._lock:
+            return self._state.get(key, default)
+
+    def set(self, key: str, value):
+        """
+        Set a value and write the file
+
+        Args:
+            key: Key
+            value: JSON serializable value
+        """
+        self.update({key: value})
+
+    def update(self, values: dict):
+        """
+        Set several values and write the file once
+
+        Args:
+            values: Dict of key to JSON serializable value
+        """
+        with self._lock:
+            self._state.update(values)
+            # Write to a temporary file first so a crash never leaves a truncated state file
+            tmp_path = f"{self._path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self._path)
@@ -0,0 +1,80 @@
+import httplib2
+
+from google_play_developer_api.client import REPORTING_SCOPES, get_credentials
+
+RESPONSE_HEADERS_DROPPED = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class PooledHttp:
+    def __init__(self,
+                 credentials=None,
+                 credentials_path: str = None,
+                 scopes: list[str] = None,
+                 pool_size: int = 10,
+                 timeout: float = 120,
+                 connect_timeout: float = 10,
+                 gzip: bool = True):
+        """
+        Thread-safe http object with a shared connection pool, usable wherever googleapiclient expects httplib2
+
+        Requests go through one `google.auth.transport.requests.AuthorizedSession`, whose urllib3 pool keeps
+        connections alive and reuses them across threads, so concurrent fetches don't each pay for their own
+        TLS handshakes. Credentials are refreshed by the session.
+
+        Args:
+            credentials: Credentials of the requests
+            credentials_path: Path to a service account json file, used if `credentials` is None
+            scopes: OAuth scopes used with `credentials_path`, the Reporting API scopes if None
+            pool_size: Maximum number of kept-alive connections per host, i.e. the useful number of threads
+            timeout: Read timeout of a request (seconds)
+            connect_timeout: Connection timeout (seconds)
+            gzip: Ask for gzip compressed responses (decompressed transparently)
+        """
+        try:
+            import requests.adapters
+            from google.auth.transport.requests import AuthorizedSession
+        except ImportError:
+            raise ImportError("requests is required for PooledHttp, install it with `pip install requests`")
+
+        if credentials is None:
+            credentials = get_credentials(credentials_path, REPORTING_SCOPES if scopes is None else scopes)
+        # Read by googleapiclient batch requests to authorize each part
+        self.credentials = credentials
+        self.timeout = timeout
+        self._timeout = (connect_timeout, timeout)
+        self._gzip = gzip
+
+        self._session = AuthorizedSession(credentials)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def request(self, uri: str, method: str = "GET", body=None, headers: dict = None, **kwargs):
+        """
+        Send a request, with the signature and return value of `httplib2.Http.request`
+
+        Args:
+            uri: Request URI
+            method: HTTP method
+            body: Request body
+            headers: Request headers
+            kwargs: Other httplib2 arguments (redirections, connection_type), ignored
+
+        Returns:
+            Tuple of (httplib2.Response, content bytes)
+        """
+        headers = dict(headers or {})
+        if not self._gzip:
+            headers = {key: value for key, value in headers.items() if key.lower() != "accept-encoding"}
+            headers["accept-encoding"] = "identity"
+
+        response = self._session.request(method, uri, data=body, headers=headers, timeout=self._timeout)
+
+        info = {key: value for key, value in response.headers.items() if key.lower() not in RESPONSE_HEADERS_DROPPED}
+        info["status"] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+
+    def close(self):
+        self._session.close()
@@ -0,0 +1,227 @@
+"""In-memory Reporting API used by the offline tests."""
+import datetime
+import email.parser
+import json
+import re
+import threading
+import urllib.parse
+
+import httplib2
+from googleapiclient.discovery import build
+
+BASE_URI = "https://playdeveloperreporting.googleapis.com"
+BOUNDARY = "fake-batch-boundary"
+APP_PATTERN = re.compile(r"/apps/([^/:?]+)")
+SEARCH_PATTERN = re.compile(r"/apps/[^/:?]+/(anomalies|errorIssues:search|errorReports:search)\b")
+EPOCH = datetime.datetime(2024, 1, 1)
+HOUR = datetime.timedelta(hours=1)
+
+
+def make_rows(count: int, start: int = 0) -> list[dict]:
+    """Hourly rows, row i is at EPOCH + i hours"""
+    rows = []
+    for i in range(start, start + count):
+        rows.append({
+            "startTime": {"year": 2024, "month": 1, "day": 1 + i // 24, "hours": i % 24, "timeZone": {"id": "UTC"}},
+            "dimensions": [{"dimension": "versionCode", "int64Value": str(i % 5)},
+                           {"dimension": "countryCode", "stringValue": "US"}],
+            "metrics": [{"metric": "crashRate", "decimalValue": {"value": f"0.{i:03d}"}},
+                        {"metric": "distinctUsers", "decimalValue": {"value": str(100 + i)}}],
+        })
+    return rows
+
+
+def to_datetime(time: dict) -> datetime.datetime:
+    return datetime.datetime(time["year"], time["month"], time["day"], time.get("hours", 0))
+
+
+def matches_filter(row: dict, filter: str) -> bool:
+    """Evaluate the filters built by the reports: `dim = value` clauses, optionally negated, joined by AND"""
+    values = {cell["dimension"]: cell.get("int64Value", cell.get("stringValue")) for cell in row["dimensions"]}
+    for clause in filter.split(" AND "):
+        negated = clause.startswith("NOT ")
+        dimension, value = clause.removeprefix("NOT ").split(" = ")
+        if (values.get(dimension) == value.strip('"')) == negated:
+            return False
+    return True
+
+
+def error_response(status: int, reason: str) -> tuple:
+    response = httplib2.Response({"status": status})
+    response.reason = reason
+    content = {"error": {"code": status, "message": reason, "status": reason}}
+    return response, json.dumps(content).encode()
+
+
+class FakeReportingHttp:
+    def __init__(self,
+                 row_count: int = 10,
+                 page_size: int = 4,
+                 failures: dict = None,
+                 denied_apps: tuple = (),
+                 quota_exceeded: bool = False,
+                 latest_end_time: dict = None,
+                 timeline_rows: bool = False,
+                 rows: list[dict] = None,
+                 items: dict = None):
+        """
+        httplib2-like transport serving `query`, freshness and search/list requests of the Reporting API from
+        memory, alone or in multipart batch requests. Page tokens are row offsets.
+
+        Args:
+            row_count: Number of rows of each query
+            page_size: Rows per page
+            failures: Dict {request number (from 1): (status, reason)} of requests answered with an error
+            denied_apps: Apps answered with 403 PERMISSION_DENIED
+            quota_exceeded: Answer every request with 429 RESOURCE_EXHAUSTED
+            latest_end_time: latestEndTime of the HOURLY freshness
+            timeline_rows: Serve one row per hour of the timeline spec of each query instead of `row_count` rows
+            rows: Raw rows served by every query instead of generated ones, only the ones inside the timeline
+                spec with `timeline_rows`
+            items: Dict {items key, e.g. 'anomalies': list of items} served by the search/list endpoints,
+                paginated by their pageSize, with partial responses for `fields`
+        """
+        self.row_count = row_count
+        self.page_size = page_size
+        self.failures = dict(failures or {})
+        self.denied_apps = set(denied_apps)
+        self.quota_exceeded = quota_exceeded
+        self.latest_end_time = latest_end_time or {"year": 2024, "month": 1, "day": 3, "hours": 5}
+        self.timeline_rows = timeline_rows
+        self.rows = rows
+        self.items = dict(items or {})
+        self.requests = []
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if uri.endswith("/batch"):
+            return self._batch(body, headers)
+        return self._respond(uri, body)
+
+    def _batch(self, body, headers):
+        """Answer each part of a multipart batch request like a single request"""
+        message = email.parser.Parser().parsestr(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        with self._lock:
+            self.batch_sizes.append(len(message.get_payload()))
+
+        parts = []
+        for part in message.get_payload():
+            request_line, _, http_message = part.get_payload().partition("\n")
+            path = request_line.split(" ")[1]
+            response, content = self._respond(BASE_URI + path, email.parser.Parser().parsestr(http_message).get_payload())
+            parts.append(f"--{BOUNDARY}\r\n"
+                         f"Content-Type: application/http\r\n"
+                         f"Content-ID: <response-{part['Content-ID'][1:]}\r\n\r\n"
+                         f"HTTP/1.1 {response.status} {response.reason}\r\n"
+                         f"Content-Type: application/json\r\n\r\n"
+                         f"{content.decode()}\r\n")
+        parts.append(f"--{BOUNDARY}--")
+        response = httplib2.Response({"status": 200, "content-type": f'multipart/mixed; boundary="{BOUNDARY}"'})
+        return response, "".join(parts).encode()
+
+    def _respond(self, uri, body):
+        with self._lock:
+            self.requests.append((uri, json.loads(body) if body else None))
+            failure = self.failures.get(len(self.requests))
+        if failure is not None:
+            return error_response(*failure)
+        if self.quota_exceeded:
+            return error_response(429, "RESOURCE_EXHAUSTED")
+        if APP_PATTERN.search(uri).group(1) in self.denied_apps:
+            return error_response(403, "PERMISSION_DENIED")
+
+        search = SEARCH_PATTERN.search(uri)
+        if search is not None:
+            items_key = search.group(1).split(":")[0]
+            params = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(uri).query))
+            offset, page_size = int(params.get("pageToken") or 0), int(params["pageSize"])
+            items = self.items.get(items_key, [])[offset:offset + page_size]
+            fields = re.match(rf"{items_key}\(([^)]*)\)", params.get("fields", ""))
+            if fields is not None:
+                # Partial response
+                names = fields.group(1).split(",")
+                items = [{name: item[name] for name in names if name in item} for item in items]
+            content = {items_key: items}
+            if offset + page_size < len(self.items.get(items_key, [])):
+                content["nextPageToken"] = str(offset + page_size)
+        elif ":query" in uri:
+            query = json.loads(body)
+            first, row_count = 0, self.row_count if self.rows is None else len(self.rows)
+            if self.timeline_rows:
+                start_time, end_time = (to_datetime(query["timelineSpec"][bound]) for bound in ("startTime", "endTime"))
+                first, row_count = (start_time - EPOCH) // HOUR, (end_time - start_time) // HOUR
+            if self.rows is None:
+                rows = make_rows(row_count, first)
+            elif self.timeline_rows:
+                rows = [row for row in self.rows if start_time <= to_datetime(row["startTime"]) < end_time]
+            else:
+                rows = self.rows
+            if query.get("filter"):
+                rows = [row for row in rows if matches_filter(row, query["filter"])]
+            offset = int(query.get("pageToken") or 0)
+            content = {"rows": rows[offset:offset + self.page_size]}
+            if offset + self.page_size < len(rows):
+                content["nextPageToken"] = str(offset + self.page_size)
+        else:
+            content = {"freshnessInfo": {"freshnesses": [
+                {"aggregationPeriod": "HOURLY", "latestEndTime": {**self.latest_end_time, "timeZone": {"id": "UTC"}}},
+            ]}}
+        return httplib2.Response({"status": 200}), json.dumps(content).encode()
+
+    @property
+    def queries(self) -> list[dict]:
+        """Bodies of the query requests"""
+        return [body for uri, body in self.requests if ":query" in uri]
+
+
+def build_reporting_service(http):
+    return build("playdeveloperreporting", "v1beta1", http=http, static_discovery=True)
+
+
+def make_review(review_id: str, seconds: int, text: str = "") -> dict:
+    return {"reviewId": review_id,
+            "authorName": f"author-{review_id}",
+            "comments": [{"userComment": {"text": text or f"review {review_id}",
+                                          "starRating": 5,
+                                          "lastModified": {"seconds": str(seconds), "nanos": 0}}}]}
+
+
+class FakePublisherHttp:
+    def __init__(self, reviews: dict = None, denied_apps: tuple = (), failures: dict = None):
+        """
+        httplib2-like transport serving `reviews.list` of the androidpublisher API from memory.
+        Page tokens are review offsets.
+
+        Args:
+            reviews: Dict {app package name: raw reviews, most recently modified first}
+            denied_apps: Apps answered with 403 PERMISSION_DENIED
+            failures: Dict {request number (from 1): (status, reason)} of requests answered with an error
+        """
+        self.reviews = dict(reviews or {})
+        self.denied_apps = set(denied_apps)
+        self.failures = dict(failures or {})
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(uri).query))
+        app_package_name = re.search(r"/applications/([^/]+)/reviews", uri).group(1)
+        with self._lock:
+            self.requests.append((app_package_name, params))
+            failure = self.failures.get(len(self.requests))
+        if failure is not None:
+            return error_response(*failure)
+        if app_package_name in self.denied_apps:
+            return error_response(403, "PERMISSION_DENIED")
+
+        offset, max_results = int(params.get("token") or 0), int(params["maxResults"])
+        reviews = self.reviews.get(app_package_name, [])
+        content = {"reviews": reviews[offset:offset + max_results]}
+        if offset + max_results < len(reviews):
+            content["tokenPagination"] = {"nextPageToken": str(offset + max_results)}
+        return httplib2.Response({"status": 200}), json.dumps(content).encode()
+
+
+def build_publisher_service(http):
+    return build("androidpublisher", "v3", http=http, static_discovery=True)
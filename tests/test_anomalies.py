@@ -0,0 +1,54 @@
+"""Offline tests for polling new anomalies."""
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import AnomaliesReport
+from google_play_developer_api.report.anomalies import AnomalyPoller
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+from google_play_developer_api.state import JsonStateStore
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+
+def make_anomalies(*names) -> list[dict]:
+    return [{"name": f"apps/com.a/anomalies/{name}", "metricSet": "apps/com.a/crashRateMetricSet"} for name in names]
+
+
+def make_poller(http, tmp_path):
+    report = AnomaliesReport(reporting_service=build_reporting_service(http),
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+    return AnomalyPoller(report, JsonStateStore(str(tmp_path / "state.json")), max_workers=1)
+
+
+def test_list_anomalies_pages():
+    http = FakeReportingHttp(items={"anomalies": make_anomalies(*range(5))})
+    report = AnomaliesReport(reporting_service=build_reporting_service(http),
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+    assert len(list(report.list_anomalies(app_package_name="com.a", page_size=2))) == 5
+    assert len(http.requests) == 3
+
+
+def test_poll_reports_only_new_anomalies(tmp_path):
+    http = FakeReportingHttp(items={"anomalies": make_anomalies(1, 2)})
+    poller = make_poller(http, tmp_path)
+
+    assert len(poller.poll(["com.a"])["com.a"]) == 2
+    assert poller.poll(["com.a"]) == {"com.a": []}
+
+    http.items["anomalies"] = make_anomalies(2, 3)
+    assert poller.poll(["com.a"]) == {"com.a": make_anomalies(3)}
+
+
+def test_denied_app_keeps_its_seen_anomalies(tmp_path):
+    http = FakeReportingHttp(items={"anomalies": make_anomalies(1, 2)})
+    poller = make_poller(http, tmp_path)
+    poller.poll(["com.a"])
+
+    http.denied_apps.add("com.a")
+    result = poller.poll(["com.a"])
+    assert isinstance(result["com.a"], HttpError)
+    assert result["com.a"].resp.status == 403
+
+    # Once access is back, the anomalies seen before the denied poll are not reported again
+    http.denied_apps.clear()
+    assert poller.poll(["com.a"]) == {"com.a": []}
@@ -0,0 +1,87 @@
+"""Offline tests for backfilling report data into partitioned files."""
+import json
+import os
+
+from google.auth.credentials import AnonymousCredentials
+
+from google_play_developer_api.report import BatchReportFetcher, backfill
+from google_play_developer_api.report.backfill import Backfill
+from google_play_developer_api.report.export import SUCCESS_MARKER, partition_path
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp
+
+# Data is available up to 2024-01-03 05:00: days from 2024-01-03 are not complete
+RANGE = dict(start_date="2024-01-01", end_date="2024-01-05")
+EXPORT = dict(dimensions=["versionCode", "countryCode"], metrics=["distinctUsers"], page_size=10)
+
+
+def make_fetcher(http, scheduler=None):
+    scheduler = RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)) if scheduler is None else scheduler
+    return BatchReportFetcher(credentials=AnonymousCredentials(), http=http, scheduler=scheduler)
+
+
+def test_backfill_and_resume(tmp_path):
+    http = FakeReportingHttp(timeline_rows=True, page_size=10, denied_apps={"com.denied"})
+    progress = []
+    job = Backfill(make_fetcher(http), output_dir=str(tmp_path), file_format="ndjson", max_workers=2,
+                   on_progress=lambda finished, total, job, result: progress.append((finished, total, result)))
+
+    summary = job.run(["com.a", "com.denied"], ["crash_rate", "anr_rate"], **RANGE, **EXPORT)
+
+    assert (summary.total_jobs, summary.succeeded, summary.failed, summary.unavailable, summary.skipped) == \
+        (16, 4, 8, 4, 0)
+    assert summary.rows == 4 * 24
+    assert {failure.app_package_name for failure, _ in summary.failures} == {"com.denied"}
+    assert sorted(progress) == [(1, 4, 24), (2, 4, 24), (3, 4, 24), (4, 4, 24)]
+    for metric_set in ("crashRateMetricSet", "anrRateMetricSet"):
+        for date in ("2024-01-01", "2024-01-02"):
+            assert os.path.exists(os.path.join(partition_path(str(tmp_path), "com.a", metric_set, date),
+                                               SUCCESS_MARKER))
+
+    # Run again: written days are skipped, only freshnesses are requested
+    http.requests.clear()
+    summary = job.run(["com.a"], ["crash_rate", "anr_rate"], **RANGE, **EXPORT)
+    assert (summary.total_jobs, summary.succeeded, summary.skipped, summary.unavailable) == (8, 0, 4, 4)
+    assert http.queries == []
+
+
+def test_failed_day_is_reported(tmp_path):
+    # Request 1 is the freshness, request 2 the first page of the first day
+    http = FakeReportingHttp(timeline_rows=True, page_size=10, failures={2: (500, "INTERNAL")})
+    job = Backfill(make_fetcher(http), output_dir=str(tmp_path), file_format="ndjson", max_workers=1)
+
+    summary = job.run(["com.a"], ["crash_rate"], start_date="2024-01-01", end_date="2024-01-03", **EXPORT)
+
+    assert (summary.succeeded, summary.failed, summary.rows) == (1, 1, 24)
+    assert summary.to_dict()["failures"] == [{"app_package_name": "com.a", "metric_set": "crash_rate",
+                                              "date": "2024-01-01", "error": summary.failures[0][1]}]
+    assert "500" in summary.failures[0][1]
+
+    # The failed day is done by the next run
+    summary = job.run(["com.a"], ["crash_rate"], start_date="2024-01-01", end_date="2024-01-03", **EXPORT)
+    assert (summary.succeeded, summary.skipped, summary.failed) == (1, 1, 0)
+
+
+def test_main(tmp_path, monkeypatch, capsys):
+    http = FakeReportingHttp(timeline_rows=True, page_size=100)
+    fetcher_arguments = {}
+
+    def fake_fetcher(credentials_path, scheduler):
+        fetcher_arguments.update(credentials_path=credentials_path, rate=scheduler.rate_limiter.rate)
+        return make_fetcher(http, scheduler)
+
+    monkeypatch.setattr(backfill, "BatchReportFetcher", fake_fetcher)
+    monkeypatch.setattr("sys.argv", ["backfill", "--credentials-path", "credentials.json",
+                                     "--apps", "com.a,com.b", "--metric-sets", "crash_rate",
+                                     "--start-date", "2024-01-02", "--end-date", "2024-01-03",
+                                     "--aggregation-period", "HOURLY", "--output-dir", str(tmp_path),
+                                     "--file-format", "csv", "--max-workers", "2", "--requests-per-second", "1000"])
+
+    backfill.main()
+
+    assert fetcher_arguments == {"credentials_path": "credentials.json", "rate": 1000}
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["total_jobs"], summary["succeeded"], summary["rows"]) == (2, 2, 48)
+    assert os.path.exists(os.path.join(partition_path(str(tmp_path), "com.b", "crashRateMetricSet", "2024-01-02"),
+                                       "part-00000.csv"))
@@ -0,0 +1,64 @@
+"""Offline tests for fetching many reports concurrently."""
+import urllib.parse
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import BatchReportFetcher, ReportJob
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp
+
+
+def make_fetcher(http):
+    return BatchReportFetcher(credentials=AnonymousCredentials(), http=http, max_workers=2,
+                              scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def make_jobs(app_package_name: str = "com.example") -> list[ReportJob]:
+    return [ReportJob(app_package_name=app_package_name,
+                      metric_set=metric_set,
+                      start_time="2024-01-01",
+                      end_time="2024-01-02",
+                      dimensions=["versionCode"],
+                      metrics=["distinctUsers"],
+                      kwargs={"page_size": 4}) for metric_set in ["crash_rate", "anrRateMetricSet"]]
+
+
+def test_fetch_returns_results_in_job_order():
+    # The denied app logs the 403 and gets no rows
+    http = FakeReportingHttp(row_count=6, denied_apps={"com.denied"})
+    fetcher = make_fetcher(http)
+
+    results = fetcher.fetch(make_jobs("com.denied") + make_jobs() + make_jobs("com.denied"))
+
+    assert [len(rows) for rows in results] == [0, 0, 6, 6, 0, 0]
+    # Both reports share the transport, 2 pages for each job of com.example
+    paths = [urllib.parse.urlparse(uri).path for uri, _ in http.requests if "com.example" in uri]
+    assert sorted(path.split("/")[-1] for path in paths) == \
+        ["anrRateMetricSet:query"] * 2 + ["crashRateMetricSet:query"] * 2
+    assert fetcher.get_report("crash_rate") is fetcher.get_report("crashRateMetricSet")
+    with pytest.raises(ValueError):
+        fetcher.get_report("unknown")
+
+
+def test_fetch_failures():
+    fetcher = make_fetcher(FakeReportingHttp(failures={1: (500, "INTERNAL"), 2: (500, "INTERNAL")}))
+
+    results = fetcher.fetch(make_jobs(), return_exceptions=True)
+    assert all(isinstance(result, HttpError) for result in results)
+
+    fetcher = make_fetcher(FakeReportingHttp(failures={1: (500, "INTERNAL")}))
+    with pytest.raises(HttpError):
+        fetcher.fetch(make_jobs()[:1])
+
+
+def test_iter_completed():
+    fetcher = make_fetcher(FakeReportingHttp(row_count=3))
+    jobs = make_jobs()
+
+    completed = dict((job.metric_set, rows) for job, rows in fetcher.iter_completed(jobs))
+
+    assert set(completed) == {"crash_rate", "anrRateMetricSet"}
+    assert all(len(rows) == 3 for rows in completed.values())
@@ -0,0 +1,99 @@
+"""Offline tests for many requests sent together, concurrently or in batch HTTP requests."""
+import datetime
+
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.report.base_report import BaseReportingService
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy, TokenBucket
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+APPS = ["com.a", "com.b", "com.c"]
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=1000)
+        self.acquired = 0
+
+    def acquire(self, tokens: float = 1):
+        self.acquired += tokens
+        super().acquire(tokens)
+
+
+def make_report(http, rate_limiter=None):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           scheduler=RequestScheduler(rate_limiter=rate_limiter,
+                                                      retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def test_freshnesses_bulk_in_batches():
+    http = FakeReportingHttp()
+    bucket = CountingBucket()
+    report = make_report(http, bucket)
+
+    result = report.get_freshnesses_bulk(APPS, use_batch=True, batch_size=2)
+
+    assert http.batch_sizes == [2, 1]
+    # One token per request of the batches
+    assert bucket.acquired == 3
+    assert result == {app: {"crashRateMetricSet": report.get_freshnesses(app)} for app in APPS}
+
+
+def test_permission_denied_in_batch_is_not_sent_again():
+    http = FakeReportingHttp(denied_apps={"com.b"})
+    report = make_report(http)
+
+    result = report.get_freshnesses_bulk(APPS, use_batch=True)
+
+    assert http.batch_sizes == [3]
+    assert len(http.requests) == 3
+    assert isinstance(result["com.b"]["crashRateMetricSet"], HttpError)
+    assert BaseReportingService._latest_end_time(result["com.a"]["crashRateMetricSet"], "HOURLY") is not None
+
+
+def test_transient_error_in_batch_is_sent_again():
+    http = FakeReportingHttp(failures={2: (503, "UNAVAILABLE")})
+    bucket = CountingBucket()
+    report = make_report(http, bucket)
+
+    result = report.get_freshnesses_bulk(APPS, use_batch=True)
+
+    # The failed request is sent again on its own
+    assert http.batch_sizes == [3]
+    assert len(http.requests) == 4
+    assert bucket.acquired == 4
+    assert not any(isinstance(freshnesses["crashRateMetricSet"], Exception) for freshnesses in result.values())
+
+
+def test_freshnesses_bulk_concurrent():
+    http = FakeReportingHttp(denied_apps={"com.c"})
+    report = make_report(http)
+
+    result = report.get_freshnesses_bulk(APPS, metric_sets=["crashRateMetricSet", "anrRateMetricSet"])
+
+    assert http.batch_sizes == []
+    assert len(http.requests) == 6
+    assert set(result["com.a"]) == {"crashRateMetricSet", "anrRateMetricSet"}
+    assert isinstance(result["com.c"]["anrRateMetricSet"], HttpError)
+
+
+def test_query_many_in_batches():
+    http = FakeReportingHttp(row_count=6, page_size=4)
+    report = make_report(http)
+    timeline_spec = report._timeline_spec("HOURLY", datetime.datetime(2024, 1, 1, 0), datetime.datetime(2024, 1, 1, 6))
+    queries = [{"app_package_name": app,
+                "timeline_spec": timeline_spec,
+                "dimensions": ["versionCode", "countryCode"],
+                "metrics": ["crashRate", "distinctUsers"],
+                "metric_set": "crashRateMetricSet",
+                "page_size": 4} for app in APPS]
+
+    results = report.query_many(queries, use_batch=True)
+
+    # First pages in one batch, second pages one by one
+    assert http.batch_sizes == [3]
+    assert len(http.requests) == 6
+    assert results == report.query_many(queries)
+    assert [len(rows) for rows in results] == [6, 6, 6]
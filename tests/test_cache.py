@@ -0,0 +1,71 @@
+"""Offline tests for queries served through the response cache."""
+from google_play_developer_api.report import CrashRateReport, ResponseCache
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+QUERY = dict(app_package_name="com.example",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+
+
+def make_report(http, cache=None):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           cache=cache,
+                           scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def query_ranges(http) -> list[tuple]:
+    """(start hour, end hour) of the first page of each query"""
+    return [(query["timelineSpec"]["startTime"]["hours"], query["timelineSpec"]["endTime"]["hours"])
+            for query in http.queries if not query["pageToken"]]
+
+
+def test_only_closed_buckets_are_cached():
+    # Data is final up to 05:00, later hours may still change
+    http = FakeReportingHttp(timeline_rows=True, latest_end_time={"year": 2024, "month": 1, "day": 1, "hours": 5})
+    report = make_report(http, ResponseCache(":memory:"))
+    expected = make_report(FakeReportingHttp(timeline_rows=True)).get_hourly(
+        start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY)
+
+    assert report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY) == expected
+    assert query_ranges(http) == [(0, 8)]
+
+    http.requests.clear()
+    assert report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY) == expected
+    # Closed hours come from the cache, open ones are fetched again
+    assert query_ranges(http) == [(5, 8)]
+
+
+def test_missing_buckets_are_fetched_in_contiguous_ranges():
+    http = FakeReportingHttp(timeline_rows=True, latest_end_time={"year": 2024, "month": 1, "day": 2, "hours": 0})
+    report = make_report(http, ResponseCache(":memory:"))
+    report.get_hourly(start_time="2024-01-01 03:00", end_time="2024-01-01 05:00", **QUERY)
+    report.get_hourly(start_time="2024-01-01 08:00", end_time="2024-01-01 09:00", **QUERY)
+
+    http.requests.clear()
+    rows = report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 12:00", **QUERY)
+
+    assert query_ranges(http) == [(0, 3), (5, 8), (9, 12)]
+    assert [row["eventDate"] for row in rows] == [f"2024-1-1 {hour}:00" for hour in range(12)]
+
+    http.requests.clear()
+    report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 12:00", **QUERY)
+    assert http.requests == []
+
+
+def test_permission_denied_is_not_cached():
+    http = FakeReportingHttp(timeline_rows=True, denied_apps={"com.example"})
+    report = make_report(http, ResponseCache(":memory:"))
+    uncached_report = make_report(FakeReportingHttp(timeline_rows=True, denied_apps={"com.example"}))
+
+    # Same result with and without the cache: the 403 is logged and no rows are returned
+    assert report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY) == []
+    assert uncached_report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY) == []
+
+    # Once access is granted, the data is fetched instead of served as cached empty buckets
+    http.denied_apps.clear()
+    http.requests.clear()
+    assert len(report.get_hourly(start_time="2024-01-01 00:00", end_time="2024-01-01 08:00", **QUERY)) == 8
+    assert query_ranges(http) == [(0, 8)]
@@ -0,0 +1,79 @@
+"""Offline tests for resuming paginated queries from checkpoints."""
+import os
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import CheckpointStore, CrashRateReport
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+QUERY = dict(app_package_name="com.example",
+             start_time="2024-01-01 00:00",
+             end_time="2024-01-02 00:00",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+
+
+def make_report(http, checkpoint_store=None):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           checkpoint_store=checkpoint_store,
+                           scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+@pytest.fixture
+def expected_rows():
+    return make_report(FakeReportingHttp(row_count=18, page_size=4)).get_hourly(**QUERY)
+
+
+def test_resume_after_failure(tmp_path, expected_rows):
+    store = CheckpointStore(str(tmp_path))
+    # Pages 1 and 2 succeed, page 3 fails
+    http = FakeReportingHttp(row_count=18, page_size=4, failures={3: (404, "NOT_FOUND")})
+    report = make_report(http, store)
+
+    with pytest.raises(HttpError):
+        report.get_hourly(**QUERY)
+    assert len(os.listdir(tmp_path)) == 2
+
+    http.failures = {}
+    http.requests.clear()
+    assert report.get_hourly(**QUERY) == expected_rows
+    # Resumed from the third page, then the checkpoint is deleted
+    assert [query["pageToken"] for query in http.queries] == ["8", "12", "16"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_load_drops_partial_page(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    key = store.query_key("com.example", "crashRateMetricSet", {}, ["versionCode"], ["crashRate"])
+    store.save(key, [{"row": 1}, {"row": 2}], "token-1")
+
+    # A crash while appending the next page leaves rows after the checkpointed offset
+    with open(os.path.join(tmp_path, f"{key}.ndjson"), "a") as f:
+        f.write('{"row": 3}\n{"ro')
+    assert store.load(key) == ([{"row": 1}, {"row": 2}], "token-1")
+
+    # The next page overwrites them
+    store.save(key, [{"row": 3}], "token-2")
+    assert store.load(key) == ([{"row": 1}, {"row": 2}, {"row": 3}], "token-2")
+
+    store.clear(key)
+    assert store.load(key) is None
+
+
+def test_restart_when_page_token_expired(tmp_path, expected_rows):
+    store = CheckpointStore(str(tmp_path))
+    http = FakeReportingHttp(row_count=18, page_size=4, failures={3: (404, "NOT_FOUND")})
+    report = make_report(http, store)
+    with pytest.raises(HttpError):
+        report.get_hourly(**QUERY)
+
+    # The saved token is rejected with a 400, the query starts over from the first page
+    http.requests.clear()
+    http.failures = {1: (400, "INVALID_ARGUMENT")}
+    assert report.get_hourly(**QUERY) == expected_rows
+    assert [query["pageToken"] for query in http.queries] == ["8", "", "4", "8", "12", "16"]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,93 @@
+"""Offline tests for building typed tables from raw response pages."""
+import pytest
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.report.columnar import ColumnBuffers, concat_tables
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service, make_rows
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+DIMENSIONS = ["versionCode", "countryCode", "deviceModel"]
+METRICS = ["crashRate", "distinctUsers"]
+
+
+def make_pages() -> list[list[dict]]:
+    """Two pages, the first without versionCode and deviceModel values, the second with them"""
+    first, second = make_rows(2), make_rows(2, start=2)
+    for row in first:
+        row["dimensions"][0] = {"dimension": "versionCode"}
+        row["metrics"][0] = {"metric": "crashRate"}
+    for row in second:
+        row["dimensions"].append({"dimension": "deviceModel", "stringValue": "google/pixel"})
+    return [first, second]
+
+
+def make_buffers(pages) -> ColumnBuffers:
+    buffers = ColumnBuffers("com.example", DIMENSIONS, METRICS)
+    for page in pages:
+        buffers.add_rows(page)
+    return buffers
+
+
+def test_pandas_dtypes():
+    frame = make_buffers(make_pages()).to_pandas()
+
+    assert list(frame.columns) == ["eventDate", "timeZone", "appPackageName"] + DIMENSIONS + METRICS
+    assert pd.api.types.is_datetime64_any_dtype(frame["eventDate"])
+    assert str(frame["versionCode"].dtype) == "Int64"
+    assert isinstance(frame["countryCode"].dtype, pd.CategoricalDtype)
+    assert isinstance(frame["deviceModel"].dtype, pd.CategoricalDtype)
+    assert str(frame["crashRate"].dtype) == "float64"
+    assert frame["versionCode"].tolist() == [pd.NA, pd.NA, 2, 3]
+    assert frame["deviceModel"].isna().tolist() == [True, True, False, False]
+    assert frame["crashRate"].isna().tolist() == [True, True, False, False]
+
+
+def test_arrow_types():
+    table = make_buffers(make_pages()).to_arrow()
+
+    assert table.schema.field("eventDate").type == pa.timestamp("s")
+    assert table.schema.field("versionCode").type == pa.int64()
+    assert table.schema.field("countryCode").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("deviceModel").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("distinctUsers").type == pa.float64()
+    assert table.column("versionCode").to_pylist() == [None, None, 2, 3]
+    assert table.column("deviceModel").to_pylist() == [None, None, "google/pixel", "google/pixel"]
+
+
+@pytest.mark.parametrize("output_format", ["pandas", "arrow"])
+def test_tables_of_pages_with_and_without_values_share_their_schema(output_format):
+    empty, populated = (make_buffers([page]).build(output_format) for page in make_pages())
+
+    if output_format == "pandas":
+        assert empty.dtypes["versionCode"] == populated.dtypes["versionCode"]
+    else:
+        assert empty.schema.field("versionCode").type == populated.schema.field("versionCode").type
+    result = concat_tables([empty, populated], output_format)
+    assert len(result) == 4
+    if output_format == "pandas":
+        assert isinstance(result["deviceModel"].dtype, pd.CategoricalDtype)
+        assert result["deviceModel"].tolist()[2:] == ["google/pixel", "google/pixel"]
+    else:
+        assert result.column("deviceModel").to_pylist() == [None, None, "google/pixel", "google/pixel"]
+
+
+@pytest.mark.parametrize("output_format", ["pandas", "arrow"])
+def test_query_output_matches_records(output_format):
+    pages = make_pages()
+    report = CrashRateReport(reporting_service=build_reporting_service(FakeReportingHttp(rows=pages[0] + pages[1],
+                                                                                       page_size=2)),
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+    query = dict(app_package_name="com.example", start_time="2024-01-01 00:00", end_time="2024-01-01 04:00",
+                 dimensions=DIMENSIONS, metrics=METRICS, page_size=2)
+
+    table = report.get_hourly(output_format=output_format, **query)
+    records = report.get_hourly(**query)
+
+    rows = table.to_dict("records") if output_format == "pandas" else table.to_pylist()
+    assert [row["versionCode"] if pd.notna(row["versionCode"]) else "" for row in rows] == \
+        [int(record["versionCode"]) if record["versionCode"] else "" for record in records]
+    assert [row["distinctUsers"] for row in rows] == [float(record["distinctUsers"]) for record in records]
@@ -0,0 +1,136 @@
+"""Offline tests for spreading requests over a pool of credentials."""
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.credential_pool import CredentialPool
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+QUERY = dict(start_time="2024-01-01 00:00",
+             end_time="2024-01-01 08:00",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+
+
+def make_report(monkeypatch, **https):
+    """Report over a pool of one credentials per transport, named by the keyword"""
+    pool = CredentialPool(credentials=[object() for _ in https], requests_per_second=1000, quota_cooldown=600)
+    for member, name in zip(pool.members, https):
+        member.name = name
+    report = CrashRateReport(reporting_service=build_reporting_service(FakeReportingHttp()),
+                             credential_pool=pool,
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+    monkeypatch.setattr(report, "_get_http", lambda member=None: https[member.name])
+    return report, pool
+
+
+def test_acquire_least_loaded():
+    pool = CredentialPool(credentials=[object(), object()], requests_per_second=None)
+    first, second = pool.members
+
+    assert [pool.acquire("com.a") for _ in range(4)] == [first, second, first, second]
+    assert pool.acquire("com.a", exclude=[first]) is second
+    assert pool.acquire("com.a", exclude=[first, second]) is None
+
+
+def test_denied_app_is_routed_to_other_credentials():
+    pool = CredentialPool(credentials=[object(), object()], requests_per_second=None)
+    first, second = pool.members
+
+    pool.report_denied(first, "com.a")
+    assert [pool.acquire("com.a") for _ in range(3)] == [second, second, second]
+    assert pool.acquire("com.b") is first
+    assert pool.has_candidate("com.a")
+    assert not pool.has_candidate("com.a", exclude=[second])
+    assert pool.stats()["credentials-0"]["denied_apps"] == ["com.a"]
+
+    # Once every credentials was denied, they are all tried again: access may have been granted since
+    pool.report_denied(second, "com.a")
+    assert pool.has_candidate("com.a")
+    assert pool.acquire("com.a") in (first, second)
+
+
+def test_quota_error_pauses_credentials():
+    pool = CredentialPool(credentials=[object(), object()], requests_per_second=1000, quota_cooldown=600)
+    first, second = pool.members
+
+    pool.report_quota(first)
+    assert first.wait_time() > 500
+    assert [pool.acquire("com.a") for _ in range(3)] == [second, second, second]
+
+    pool.report_quota(second, retry_after=0)
+    assert pool.stats()["credentials-1"]["quota_errors"] == 1
+
+
+def test_quota_error_pauses_credentials_without_rate_limit():
+    pool = CredentialPool(credentials=[object(), object()], requests_per_second=None, quota_cooldown=600)
+    first, second = pool.members
+
+    pool.report_quota(first)
+    assert first.rate_limiter is None
+    assert first.wait_time() > 500
+    assert [pool.acquire("com.a") for _ in range(3)] == [second, second, second]
+
+    # A short Retry-After: the pause is over once it elapsed
+    pool.report_quota(second, retry_after=0.01)
+    assert pool.acquire("com.a") is second
+    assert second.wait_time() == 0
+
+
+def test_empty_pool():
+    with pytest.raises(ValueError):
+        CredentialPool(credentials=[])
+    with pytest.raises(ValueError):
+        CredentialPool(credentials_paths=[])
+
+
+def test_routing_after_permission_error(monkeypatch):
+    https = {"a": FakeReportingHttp(row_count=8, denied_apps={"com.denied"}), "b": FakeReportingHttp(row_count=8)}
+    report, pool = make_report(monkeypatch, **https)
+
+    assert len(report.get_hourly(app_package_name="com.denied", **QUERY)) == 8
+    # The 403 was failed over to "b", which also gets the next requests of the app
+    assert len(https["a"].requests) == 1
+    assert len(https["b"].requests) == 2
+
+    assert len(report.get_hourly(app_package_name="com.denied", **QUERY)) == 8
+    assert len(https["a"].requests) == 1
+    assert pool.stats()["a"]["denied_apps"] == ["com.denied"]
+
+    # Other apps still use both credentials
+    report.get_hourly(app_package_name="com.other", **QUERY)
+    assert len(https["a"].requests) > 1
+
+
+def test_failover_on_quota_error(monkeypatch):
+    https = {"a": FakeReportingHttp(row_count=8, quota_exceeded=True), "b": FakeReportingHttp(row_count=8)}
+    report, pool = make_report(monkeypatch, **https)
+
+    assert len(report.get_hourly(app_package_name="com.a", **QUERY)) == 8
+    assert len(https["a"].requests) == 1
+    assert len(https["b"].requests) == 2
+    assert pool.stats()["a"]["quota_errors"] == 1
+    assert pool.stats()["a"]["denied_apps"] == []
+
+
+def test_permission_denied_by_every_credentials(monkeypatch):
+    https = {"a": FakeReportingHttp(denied_apps={"com.a"}), "b": FakeReportingHttp(denied_apps={"com.a"})}
+    report, pool = make_report(monkeypatch, **https)
+
+    # Like without a pool: the query logs the 403 and returns no rows
+    assert report.get_hourly(app_package_name="com.a", **QUERY) == []
+    assert len(https["a"].requests) == len(https["b"].requests) == 1
+    assert not pool.has_candidate("com.a", exclude=pool.members[:1])
+
+
+def test_other_errors_are_not_failed_over(monkeypatch):
+    https = {"a": FakeReportingHttp(failures={1: (500, "INTERNAL")}),
+             "b": FakeReportingHttp(failures={1: (500, "INTERNAL")})}
+    report, pool = make_report(monkeypatch, **https)
+
+    with pytest.raises(HttpError):
+        report.get_hourly(app_package_name="com.a", **QUERY)
+    assert len(https["a"].requests) + len(https["b"].requests) == 1
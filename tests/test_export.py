@@ -0,0 +1,96 @@
+"""Offline tests for exporting report data to partitioned files."""
+import csv
+import json
+import os
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.report.export import SUCCESS_MARKER, partition_path
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service, make_rows
+
+EXPORT = dict(app_package_name="com.example",
+              start_time="2024-01-01",
+              end_time="2024-01-02",
+              dimensions=["versionCode", "countryCode"],
+              metrics=["crashRate", "distinctUsers"],
+              page_size=4)
+
+
+def make_report(http):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def rows_without_first_versions(count: int = 10) -> list[dict]:
+    """Rows whose first page (4 rows) has no versionCode value, and the next pages an int64Value"""
+    rows = make_rows(count)
+    for row in rows[:4]:
+        row["dimensions"][0] = {"dimension": "versionCode"}
+    return rows
+
+
+def read_partition(path: str, file_format: str) -> list:
+    file_path = os.path.join(path, f"part-00000.{file_format}")
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(file_path).to_pylist()
+    with open(file_path) as f:
+        if file_format == "csv":
+            return list(csv.DictReader(f))
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "ndjson", "csv"])
+def test_export_and_resume(tmp_path, file_format):
+    http = FakeReportingHttp(page_size=4, rows=rows_without_first_versions())
+    report = make_report(http)
+
+    written = report.export(output_dir=str(tmp_path), file_format=file_format, **EXPORT)
+
+    path = partition_path(str(tmp_path), "com.example", "crashRateMetricSet", "2024-01-01")
+    assert written == {path: 10}
+    assert os.path.exists(os.path.join(path, SUCCESS_MARKER))
+    rows = read_partition(path, file_format)
+    assert len(rows) == 10
+    assert [row["countryCode"] for row in rows] == ["US"] * 10
+    if file_format == "parquet":
+        # Typed from the query: the page without values doesn't turn versionCode into strings
+        assert [row["versionCode"] for row in rows] == [None] * 4 + [4, 0, 1, 2, 3, 4]
+        assert isinstance(rows[0]["crashRate"], float)
+
+    # Done days are skipped
+    http.requests.clear()
+    assert report.export(output_dir=str(tmp_path), file_format=file_format, **EXPORT) == {}
+    assert http.queries == []
+
+
+def test_export_days_after_freshness_are_not_done(tmp_path):
+    # Data is complete up to 2024-01-01 05:00 only
+    http = FakeReportingHttp(row_count=6, latest_end_time={"year": 2024, "month": 1, "day": 1, "hours": 5})
+    report = make_report(http)
+
+    path = partition_path(str(tmp_path), "com.example", "crashRateMetricSet", "2024-01-01")
+    assert report.export(output_dir=str(tmp_path), file_format="ndjson", **EXPORT) == {path: 6}
+    assert not os.path.exists(os.path.join(path, SUCCESS_MARKER))
+
+    # The next export writes the day again, and marks it once it is complete
+    http.latest_end_time = {"year": 2024, "month": 1, "day": 2, "hours": 0}
+    assert report.export(output_dir=str(tmp_path), file_format="ndjson", **EXPORT) == {path: 6}
+    assert os.path.exists(os.path.join(path, SUCCESS_MARKER))
+
+
+def test_export_permission_denied(tmp_path):
+    http = FakeReportingHttp(denied_apps={"com.example"})
+    report = make_report(http)
+
+    with pytest.raises(HttpError):
+        report.export(output_dir=str(tmp_path), file_format="parquet", check_freshness=False, **EXPORT)
+
+    path = partition_path(str(tmp_path), "com.example", "crashRateMetricSet", "2024-01-01")
+    assert not os.path.exists(os.path.join(path, SUCCESS_MARKER))
+    assert not os.path.exists(os.path.join(path, "part-00000.parquet"))
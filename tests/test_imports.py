@@ -0,0 +1,33 @@
+"""Checks that importing the package doesn't load the Google client stack."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["googleapiclient.discovery", "google.oauth2.service_account"]
+
+
+def loaded_heavy_modules(statement: str) -> list[str]:
+    """Run an import statement in a fresh interpreter and list the heavy modules it loaded"""
+    probe = f"import json, sys\n{statement}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize("statement", [
+    "import google_play_developer_api.report",
+    "from google_play_developer_api.report import CrashRateReport",
+    "from google_play_developer_api.report import mapping",
+    "import google_play_developer_api.review",
+])
+def test_import_is_light(statement):
+    assert loaded_heavy_modules(statement) == []
+
+
+def test_mapping_is_a_dict():
+    from google_play_developer_api.report import CrashRateReport, mapping
+
+    assert type(mapping) is dict
+    assert mapping["crash_rate"] is CrashRateReport
+    assert len(mapping) == 7
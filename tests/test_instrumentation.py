@@ -0,0 +1,87 @@
+"""Offline tests for the instrumentation of requests, pages and parsing."""
+import pytest
+
+from google_play_developer_api.instrumentation import Histogram, InstrumentedHttp, MetricsRecorder
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+QUERY = dict(app_package_name="com.example",
+             start_time="2024-01-01 00:00",
+             end_time="2024-01-02 00:00",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+
+
+def test_histogram():
+    histogram = Histogram()
+    for value in [0, 0.5, 1, 3, 3, 7, 100]:
+        histogram.add(value)
+
+    result = histogram.to_dict()
+    assert (result["count"], result["sum"], result["min"], result["max"]) == (7, 114.5, 0, 100)
+    assert result["mean"] == pytest.approx(114.5 / 7)
+    # Upper bound of the power of 2 bucket holding the percentile, capped by the max
+    assert histogram.percentile(0) == 0.0
+    assert result["p50"] == 4.0
+    assert result["p99"] == 100
+    assert Histogram().to_dict() == {"count": 0}
+    assert Histogram().percentile(50) is None
+
+
+def test_recorder_spans_and_events():
+    records = []
+    recorder = MetricsRecorder(listeners=[records.append])
+
+    with recorder.span("page", app_package_name="com.a") as attributes:
+        attributes["rows"] = 3
+    with pytest.raises(ValueError):
+        with recorder.span("page"):
+            raise ValueError("boom")
+    recorder.event("retry", attempt=1)
+
+    snapshot = recorder.snapshot()
+    assert snapshot["counters"] == {"page.count": 2, "page.errors": 1, "retry": 1}
+    assert snapshot["histograms"]["page.duration"]["count"] == 2
+    assert [(record["type"], record["name"], record.get("error")) for record in records] == [
+        ("span", "page", None), ("span", "page", "ValueError('boom')"), ("event", "retry", None)]
+    assert records[0]["attributes"] == {"app_package_name": "com.a", "rows": 3}
+
+    recorder.reset()
+    assert recorder.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_instrumented_http():
+    recorder = MetricsRecorder()
+    fake = FakeReportingHttp(denied_apps={"com.denied"})
+    http = InstrumentedHttp(fake, recorder, credentials="a")
+
+    resp, content = http.request("https://example.com/v1beta1/apps/com.a/crashRateMetricSet")
+    http.request("https://example.com/v1beta1/apps/com.denied/crashRateMetricSet")
+
+    counters = recorder.snapshot()["counters"]
+    assert resp.status == 200
+    assert counters["request.count"] == 2
+    assert counters["request.http_errors"] == 1
+    assert counters["bytes_received"] > len(content)
+    # Attributes of the wrapped object are still reachable
+    assert http.page_size == fake.page_size
+
+
+def test_report_metrics():
+    recorder = MetricsRecorder()
+    report = CrashRateReport(reporting_service=build_reporting_service(FakeReportingHttp(row_count=10)),
+                             instrumentation=recorder,
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+    assert len(report.get_hourly(**QUERY)) == 10
+
+    snapshot = recorder.snapshot()
+    assert snapshot["counters"]["rows"] == 10
+    assert snapshot["counters"]["request.count"] == 3
+    assert snapshot["counters"]["parse.count"] == 3
+    assert snapshot["histograms"]["page.rows"]["sum"] == 10
+    assert snapshot["histograms"]["page.rows"]["max"] == 4
+    assert snapshot["histograms"]["response.bytes"]["count"] == 3
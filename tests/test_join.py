@@ -0,0 +1,66 @@
+"""Offline tests for joining the rows of several metric sets."""
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from google_play_developer_api.report import BatchReportFetcher
+from google_play_developer_api.report.join import RowJoiner
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp
+
+
+def make_row(event_date, version_code, **metrics):
+    return {"eventDate": event_date, "timeZone": "UTC", "appPackageName": "com.example",
+            "versionCode": version_code, **metrics}
+
+
+def test_full_outer_join():
+    joiner = RowJoiner(dimensions=["versionCode"],
+                       metrics={"crash": ["crashRate", "distinctUsers"], "anr": ["anrRate", "distinctUsers"]})
+
+    joiner.add("crash", [make_row("2024-1-1", "1", crashRate="0.5", distinctUsers="10"),
+                         make_row("2024-1-1", "2", crashRate="0.25", distinctUsers="")])
+    joiner.add("anr", [make_row("2024-1-1", "2", anrRate="0.125", distinctUsers="20"),
+                       make_row("2024-1-2", "2", anrRate="0", distinctUsers="30")])
+
+    assert joiner.rows() == [
+        {"eventDate": "2024-1-1", "timeZone": "UTC", "appPackageName": "com.example", "versionCode": "1",
+         "crashRate": 0.5, "crash.distinctUsers": 10.0, "anrRate": None, "anr.distinctUsers": None},
+        {"eventDate": "2024-1-1", "timeZone": "UTC", "appPackageName": "com.example", "versionCode": "2",
+         "crashRate": 0.25, "crash.distinctUsers": None, "anrRate": 0.125, "anr.distinctUsers": 20.0},
+        {"eventDate": "2024-1-2", "timeZone": "UTC", "appPackageName": "com.example", "versionCode": "2",
+         "crashRate": None, "crash.distinctUsers": None, "anrRate": 0.0, "anr.distinctUsers": 30.0},
+    ]
+
+
+def make_fetcher(http):
+    return BatchReportFetcher(credentials=AnonymousCredentials(), http=http, max_workers=2,
+                              scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def test_fetch_joined():
+    fetcher = make_fetcher(FakeReportingHttp(row_count=5))
+
+    rows = fetcher.fetch_joined(app_package_name="com.example",
+                                metric_sets=["crash_rate", "anrRateMetricSet"],
+                                start_time="2024-01-01",
+                                end_time="2024-01-02",
+                                dimensions=["versionCode"],
+                                metrics={"crash_rate": ["crashRate", "distinctUsers"],
+                                         "anrRateMetricSet": ["distinctUsers"]})
+
+    assert len(rows) == 5
+    assert rows[4] == {"eventDate": "2024-1-1", "timeZone": "UTC", "appPackageName": "com.example",
+                       "versionCode": "4", "crashRate": 0.004, "crash_rate.distinctUsers": 104.0,
+                       "anrRateMetricSet.distinctUsers": 104.0}
+
+
+def test_fetch_joined_rejects_other_output_formats():
+    http = FakeReportingHttp()
+    fetcher = make_fetcher(http)
+
+    with pytest.raises(ValueError):
+        fetcher.fetch_joined(app_package_name="com.example", metric_sets=["crash_rate", "anr_rate"],
+                             start_time="2024-01-01", end_time="2024-01-02", dimensions=["versionCode"],
+                             output_format="pandas")
+    assert http.requests == []
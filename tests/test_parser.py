@@ -0,0 +1,78 @@
+"""Tests for the report row decoder."""
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.report.parser import RowDecoder, decode_rows
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+
+def make_row(dimensions, metrics, hours=5):
+    return {
+        "startTime": {"year": 2024, "month": 1, "day": 2, "hours": hours, "timeZone": {"id": "UTC"}},
+        "dimensions": [{"dimension": name, **value} for name, value in dimensions],
+        "metrics": [{"metric": name, **value} for name, value in metrics],
+    }
+
+
+def test_decode_rows_labels_cells_with_their_names():
+    rows = [
+        make_row([("versionCode", {"int64Value": "7"}), ("countryCode", {"stringValue": "US"})],
+                 [("crashRate", {"decimalValue": {"value": "0.1"}}), ("distinctUsers", {})]),
+        # Same columns in another order
+        make_row([("countryCode", {"stringValue": "FR"}), ("versionCode", {"int64Value": "8"})],
+                 [("distinctUsers", {"decimalValue": {"value": "10"}}),
+                  ("crashRate", {"decimalValue": {"value": "0.2"}})],
+                 hours=None),
+    ]
+
+    result = decode_rows(rows, "com.example", "HOURLY")
+
+    assert result == [
+        {"eventDate": "2024-1-2 5:00", "timeZone": "UTC", "appPackageName": "com.example",
+         "versionCode": "7", "countryCode": "US", "crashRate": "0.1", "distinctUsers": ""},
+        {"eventDate": "2024-1-2 00:00", "timeZone": "UTC", "appPackageName": "com.example",
+         "countryCode": "FR", "versionCode": "8", "distinctUsers": "10", "crashRate": "0.2"},
+    ]
+
+
+def test_decode_rows_namedtuple():
+    rows = [
+        make_row([("versionCode", {"int64Value": "7"}), ("deviceType", {})],
+                 [("crashRate", {"decimalValue": {"value": "0.1"}})]),
+        make_row([("deviceType", {"stringValue": "PHONE"}), ("versionCode", {"int64Value": "8"})],
+                 [("crashRate", {"decimalValue": {"value": "0.2"}})]),
+    ]
+
+    result = decode_rows(rows, "com.example", "DAILY", row_type="namedtuple")
+
+    assert [row.eventDate for row in result] == ["2024-1-2", "2024-1-2"]
+    assert [(row.versionCode, row.deviceType, row.crashRate) for row in result] == [("7", "", "0.1"),
+                                                                                   ("8", "PHONE", "0.2")]
+
+
+def test_decoder_caches_are_scoped_to_the_decoder():
+    rows = [make_row([("versionCode", {"int64Value": "7"})], [], hours=hour) for hour in range(3)]
+    decoder = RowDecoder("HOURLY", "namedtuple")
+
+    first, second = decoder.decode(rows[:2], "com.example"), decoder.decode(rows[2:], "com.example")
+    assert type(first[0]) is type(second[0])
+    assert len(decoder._event_dates) == 3
+    # Another decoder starts empty
+    assert RowDecoder("HOURLY", "namedtuple")._event_dates == {}
+
+
+def test_namedtuple_query_rows_share_their_class():
+    report = CrashRateReport(reporting_service=build_reporting_service(FakeReportingHttp(row_count=10, page_size=4)),
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+    rows = report.get_hourly(app_package_name="com.example",
+                             start_time="2024-01-01 00:00",
+                             end_time="2024-01-02 00:00",
+                             dimensions=["versionCode", "countryCode"],
+                             metrics=["crashRate", "distinctUsers"],
+                             page_size=4,
+                             output_format="namedtuples")
+
+    assert len(rows) == 10
+    assert len({type(row) for row in rows}) == 1
+    assert rows[9].versionCode == "4"
@@ -0,0 +1,70 @@
+"""Offline tests for planning report queries from breakdowns."""
+import datetime
+
+from google_play_developer_api.report import CrashRateReport, QueryPlanner
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+START = datetime.datetime(2024, 1, 1)
+END = datetime.datetime(2024, 1, 8)
+
+
+def make_report(http):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def test_plan_measures_cardinalities_once():
+    # 10 rows per query: 5 versionCodes, 1 countryCode
+    http = FakeReportingHttp(page_size=100)
+    planner = QueryPlanner(make_report(http), page_size=100)
+
+    plans = planner.plan("com.example", [["versionCode"], ["countryCode", "versionCode"], ["versionCode", "countryCode"]],
+                         start_time=START, end_time=END)
+
+    assert [(plan.dimensions, plan.estimated_rows, plan.shard_by) for plan in plans] == [
+        (("versionCode",), 35, None),
+        (("countryCode", "versionCode"), 35, None),
+    ]
+    assert sorted(query["dimensions"] for query in http.queries) == [["countryCode"], ["versionCode"]]
+
+    http.requests.clear()
+    planner.plan("com.example", [["versionCode"]], start_time=START, end_time=END)
+    assert http.requests == []
+
+
+def test_cardinality_probes_use_the_requested_metric_set():
+    http = FakeReportingHttp(page_size=100)
+    planner = QueryPlanner(make_report(http))
+
+    planner.plan("com.example", [["versionCode"]], start_time=START, end_time=END,
+                 metric_set="anrRateMetricSet", metrics=["anrRate", "distinctUsers"])
+
+    [(uri, body)] = http.requests
+    assert "/apps/com.example/anrRateMetricSet:query" in uri
+    assert body["metrics"] == ["anrRate"]
+
+
+def test_large_queries_are_sharded():
+    planner = QueryPlanner(make_report(FakeReportingHttp()), page_size=4, max_pages_per_query=2,
+                           cardinalities={"versionCode": 5, "countryCode": 1, "deviceModel": 50})
+
+    plans = planner.plan("com.example", [["countryCode"], ["versionCode"]], start_time=START, end_time=END)
+    assert [plan.shard_by for plan in plans] == [None, "DAY"]
+
+    # An empty range is a single query, even when its one bucket is estimated above the limit
+    [plan] = planner.plan("com.example", [["deviceModel"]], start_time=START, end_time=START)
+    assert plan.estimated_rows == 50
+    assert plan.shard_by is None
+
+
+def test_execute_with_page_size():
+    http = FakeReportingHttp(row_count=6)
+    planner = QueryPlanner(make_report(http), cardinalities={"versionCode": 5})
+
+    result = planner.execute("com.example", [["versionCode"]], start_time="2024-01-01", end_time="2024-01-08",
+                             metrics=["crashRate"], page_size=4)
+
+    assert len(result[("versionCode",)]) == 6
+    assert [query["pageSize"] for query in http.queries] == [4, 4]
@@ -9,8 +9,10 @@ import pytest
 
 @pytest.fixture
 def credentials_path():
+    # Live tests against the API, the offline tests cover the same code with an in-memory transport
     cred_path = os.environ.get("CREDENTIALS_PATH", None)
-    assert cred_path is not None
+    if cred_path is None:
+        pytest.skip("CREDENTIALS_PATH is not set")
     return cred_path
 
 
@@ -62,3 +64,57 @@ def test_anr_rate_report(credentials_path):
                                     start_time=start_date.strftime("%Y-%m-%d %H:00"),
                                     end_time=end_date.strftime("%Y-%m-%d %H:00"))
     assert len(report_data) > 0
+
+
+def test_crash_rate_report_iter(credentials_path):
+    from google_play_developer_api.report import CrashRateReport
+
+    app_package_name = os.environ.get("APP_PACKAGE", None)
+    assert app_package_name is not None
+
+    report = CrashRateReport(credentials_path=credentials_path)
+
+    start_date = datetime.datetime.now() - datetime.timedelta(days=3)
+    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_date = start_date + datetime.timedelta(hours=1, days=1)
+
+    rows = report.iter_daily(app_package_name=app_package_name,
+                             start_time=start_date.strftime("%Y-%m-%d"),
+                             end_time=end_date.strftime("%Y-%m-%d"))
+    first_row = next(rows)
+    assert first_row["appPackageName"] == app_package_name
+
+
+def test_batch_report_fetcher(credentials_path):
+    from google_play_developer_api.report import BatchReportFetcher, ReportJob
+
+    app_package_name = os.environ.get("APP_PACKAGE", None)
+    assert app_package_name is not None
+
+    fetcher = BatchReportFetcher(credentials_path=credentials_path, max_workers=2)
+
+    start_date = datetime.datetime.now() - datetime.timedelta(days=3)
+    end_date = start_date + datetime.timedelta(days=1)
+    jobs = [ReportJob(app_package_name=app_package_name,
+                      metric_set=metric_set,
+                      start_time=start_date.strftime("%Y-%m-%d"),
+                      end_time=end_date.strftime("%Y-%m-%d")) for metric_set in ["crash_rate", "anrRateMetricSet"]]
+
+    results = fetcher.fetch(jobs)
+    assert len(results) == len(jobs)
+    assert all(len(result) > 0 for result in results)
+
+
+def test_error_issues_search(credentials_path):
+    from google_play_developer_api.report import ErrorIssuesReport
+
+    app_package_name = os.environ.get("APP_PACKAGE", None)
+    assert app_package_name is not None
+
+    report = ErrorIssuesReport(credentials_path=credentials_path)
+
+    issues = report.search(app_package_name=app_package_name, fields=["name", "type", "distinctUsers"], page_size=10)
+    for issue in issues:
+        assert "name" in issue
+        assert "cause" not in issue
+        break
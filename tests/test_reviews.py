@@ -0,0 +1,111 @@
+"""Offline tests for listing and syncing reviews."""
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api import scheduler
+from google_play_developer_api.review import ReviewService, ReviewSync
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+from google_play_developer_api.state import JsonStateStore
+
+from .fake_api import FakePublisherHttp, build_publisher_service, make_review
+
+
+def make_service(http, **kwargs):
+    kwargs.setdefault("scheduler", RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+    return ReviewService(publisher_service=build_publisher_service(http), **kwargs)
+
+
+def make_reviews(count: int, start: int = 0) -> list[dict]:
+    """Reviews most recently modified first, review i modified at second 1000 + i"""
+    return [make_review(str(i), 1000 + i) for i in reversed(range(start, start + count))]
+
+
+def test_pagination_follows_token_pagination():
+    http = FakePublisherHttp(reviews={"com.a": make_reviews(5)})
+    service = make_service(http)
+
+    reviews = list(service.list_reviews(app_package_name="com.a", max_results=2))
+
+    assert [review["reviewId"] for review in reviews] == ["4", "3", "2", "1", "0"]
+    assert [params.get("token") for _, params in http.requests] == [None, "2", "4"]
+    assert reviews[0]["lastModified"] == "1970-01-01 00:16:44"
+    assert reviews[0]["starRating"] == 5
+
+
+def test_pages_are_requested_lazily():
+    http = FakePublisherHttp(reviews={"com.a": make_reviews(5)})
+    pages = make_service(http).iter_pages(app_package_name="com.a", max_results=2)
+
+    assert len(next(pages)) == 2
+    assert len(http.requests) == 1
+
+
+def test_list_reviews_many():
+    http = FakePublisherHttp(reviews={"com.a": make_reviews(3)}, failures={1: (500, "INTERNAL")})
+    service = make_service(http)
+
+    result = service.list_reviews_many(["com.a"])
+    assert isinstance(result["com.a"], HttpError)
+    assert len(service.list_reviews_many(["com.a"])["com.a"]) == 3
+
+
+def test_reviews_scheduler():
+    service = make_service(FakePublisherHttp(), scheduler=None)
+
+    # The reviews quota is separate from the Reporting API one
+    assert service._scheduler is scheduler.reviews_scheduler
+    assert service._scheduler is not scheduler.default_scheduler
+    bucket = service._scheduler.rate_limiter
+    assert bucket.capacity == scheduler.REVIEWS_REQUESTS_PER_HOUR
+    assert bucket.rate * 3600 == scheduler.REVIEWS_REQUESTS_PER_HOUR
+
+
+def make_sync(http, tmp_path):
+    return ReviewSync(make_service(http), JsonStateStore(str(tmp_path / "state.json")), max_workers=1)
+
+
+def test_sync_stops_at_the_watermark(tmp_path):
+    http = FakePublisherHttp(reviews={"com.a": make_reviews(5)})
+    sync = make_sync(http, tmp_path)
+
+    assert len(sync.sync(["com.a"], max_results=2)["com.a"]) == 5
+    assert sync._state_store.get("com.a/reviews") == {"last_modified": [1004, 0], "review_ids": ["4"]}
+
+    # Two new reviews: the second page has none past the watermark and ends the pagination
+    http.reviews["com.a"] = make_reviews(7)
+    http.requests.clear()
+    assert [review["reviewId"] for review in sync.sync(["com.a"], max_results=2)["com.a"]] == ["6", "5"]
+    assert len(http.requests) == 2
+    assert sync._state_store.get("com.a/reviews")["last_modified"] == [1006, 0]
+
+    # Nothing new: one request
+    http.requests.clear()
+    assert sync.sync(["com.a"], max_results=2) == {"com.a": []}
+    assert len(http.requests) == 1
+
+
+def test_sync_reviews_modified_at_the_watermark_time(tmp_path):
+    http = FakePublisherHttp(reviews={"com.a": [make_review("a", 1000)]})
+    sync = make_sync(http, tmp_path)
+    sync.sync(["com.a"])
+
+    # Another review modified in the same second, and an edit of a known review
+    http.reviews["com.a"] = [make_review("a", 1001, "edited"), make_review("b", 1000), make_review("a", 1000)]
+    assert [(review["reviewId"], review["text"]) for review in sync.sync(["com.a"])["com.a"]] == [("a", "edited"),
+                                                                                              ("b", "review b")]
+    assert sync._state_store.get("com.a/reviews") == {"last_modified": [1001, 0], "review_ids": ["a"]}
+
+
+def test_failed_sync_keeps_the_watermark(tmp_path):
+    http = FakePublisherHttp(reviews={"com.a": make_reviews(2), "com.b": make_reviews(2)})
+    sync = make_sync(http, tmp_path)
+    sync.sync(["com.a", "com.b"])
+
+    http.reviews = {"com.a": make_reviews(3), "com.b": make_reviews(3)}
+    http.failures = {len(http.requests) + 1: (500, "INTERNAL")}
+    result = sync.sync(["com.a", "com.b"])
+    assert isinstance(result["com.a"], HttpError)
+    assert [review["reviewId"] for review in result["com.b"]] == ["2"]
+    assert sync._state_store.get("com.a/reviews")["last_modified"] == [1001, 0]
+
+    http.failures = {}
+    assert [review["reviewId"] for review in sync.sync(["com.a", "com.b"])["com.a"]] == ["2"]
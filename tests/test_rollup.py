@@ -0,0 +1,73 @@
+"""Offline tests for rolling up fetched report data locally."""
+from collections import namedtuple
+
+import pytest
+
+from google_play_developer_api.report.rollup import ReportRollup
+
+pd = pytest.importorskip("pandas")
+
+
+def make_row(event_date, version_code, crash_rate, distinct_users, country_code="US"):
+    return {"eventDate": event_date, "timeZone": "UTC", "appPackageName": "com.example",
+            "versionCode": version_code, "countryCode": country_code,
+            "crashRate": crash_rate, "distinctUsers": distinct_users}
+
+
+ROWS = [
+    make_row("2024-1-1 0:00", "1", "0.1", "100"),
+    make_row("2024-1-1 5:00", "2", "0.3", "300"),
+    # No rate: doesn't weigh in the average, its users are still counted
+    make_row("2024-1-1 9:00", "2", "", "50"),
+    make_row("2024-1-2 0:00", "1", "0.2", "10"),
+]
+
+
+def test_weighted_average_of_rates():
+    result = ReportRollup().rollup(ROWS, period="DAILY", output_format="records")
+
+    assert result == [
+        {"eventDate": "2024-01-01", "timeZone": "UTC", "appPackageName": "com.example",
+         "crashRate": pytest.approx((0.1 * 100 + 0.3 * 300) / 400), "distinctUsers": 450.0},
+        {"eventDate": "2024-01-02", "timeZone": "UTC", "appPackageName": "com.example",
+         "crashRate": pytest.approx(0.2), "distinctUsers": 10.0},
+    ]
+
+
+def test_rollup_keeps_dimensions():
+    result = ReportRollup().rollup(ROWS, dimensions=["versionCode"], period="WEEKLY", output_format="records")
+
+    assert [(row["eventDate"], row["versionCode"], row["distinctUsers"]) for row in result] == [
+        ("2024-01-01", "1", 110.0), ("2024-01-01", "2", 350.0)]
+    assert result[0]["crashRate"] == pytest.approx((0.1 * 100 + 0.2 * 10) / 110)
+    assert result[1]["crashRate"] == pytest.approx(0.3)
+
+
+def test_rollup_of_namedtuples_with_different_fields():
+    Row = namedtuple("ReportRow", list(ROWS[0]))
+    # A row without the countryCode cell has another class, with other fields
+    OtherRow = namedtuple("ReportRow", [column for column in ROWS[0] if column != "countryCode"])
+    rows = [Row(**row) for row in ROWS[:3]]
+    rows.append(OtherRow(**{column: value for column, value in ROWS[3].items() if column != "countryCode"}))
+
+    expected = ReportRollup().rollup(ROWS, dimensions=["versionCode"], output_format="records")
+    assert ReportRollup().rollup(rows, dimensions=["versionCode"], output_format="records") == expected
+
+
+def test_rollup_of_a_frame():
+    frame = pd.DataFrame.from_records(ROWS)
+    frame["eventDate"] = pd.to_datetime(frame["eventDate"], format="mixed")
+
+    result = ReportRollup().rollup(frame, period="DAILY")
+
+    assert list(result.columns) == ["eventDate", "timeZone", "appPackageName", "crashRate", "distinctUsers"]
+    assert result["distinctUsers"].tolist() == [450.0, 10.0]
+    # The input is not modified
+    assert len(frame.columns) == 7
+
+
+def test_missing_dimension_or_weight():
+    with pytest.raises(ValueError):
+        ReportRollup().rollup(ROWS, dimensions=["deviceModel"])
+    with pytest.raises(ValueError):
+        ReportRollup().rollup([{key: value for key, value in row.items() if key != "distinctUsers"} for row in ROWS])
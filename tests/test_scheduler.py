@@ -0,0 +1,182 @@
+"""Offline tests for the rate limiter and retry policy of API calls."""
+import email.utils
+import json
+import time
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api import scheduler
+from google_play_developer_api.scheduler import (PERMANENT, QUOTA, TRANSIENT, RequestScheduler, RetryPolicy,
+                                                 TokenBucket)
+
+
+def make_error(status: int, reason: str = "", headers: dict = None) -> HttpError:
+    response = httplib2.Response({"status": status, **(headers or {})})
+    response.reason = reason
+    content = json.dumps({"error": {"code": status, "message": reason, "status": reason,
+                                    "errors": [{"reason": reason}]}}).encode()
+    return HttpError(response, content, uri="https://playdeveloperreporting.googleapis.com/v1beta1/apps/a")
+
+
+class FakeClock:
+    """Replaces time.monotonic and time.sleep of the scheduler module, sleeping only advances the clock."""
+
+    def __init__(self, monkeypatch):
+        self.now = 1000.0
+        self.sleeps = []
+        monkeypatch.setattr(scheduler.time, "monotonic", lambda: self.now)
+        monkeypatch.setattr(scheduler.time, "sleep", self.sleep)
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize("error, kind", [
+    (make_error(429, "RESOURCE_EXHAUSTED"), QUOTA),
+    (make_error(403, "rateLimitExceeded"), QUOTA),
+    (make_error(403, "quotaExceeded"), QUOTA),
+    (make_error(403, "PERMISSION_DENIED"), PERMANENT),
+    (make_error(400, "INVALID_ARGUMENT"), PERMANENT),
+    (make_error(404, "NOT_FOUND"), PERMANENT),
+    (make_error(500, "INTERNAL"), TRANSIENT),
+    (make_error(503, "UNAVAILABLE"), TRANSIENT),
+    (make_error(408, "Request Timeout"), TRANSIENT),
+    (TimeoutError("timed out"), TRANSIENT),
+    (ConnectionResetError(), TRANSIENT),
+])
+def test_classify(error, kind):
+    assert RetryPolicy.classify(error) == kind
+
+
+def test_retry_after_seconds():
+    assert RetryPolicy.retry_after(make_error(429, headers={"retry-after": "7"})) == 7.0
+    assert RetryPolicy.retry_after(make_error(429, headers={"retry-after": "1.5"})) == 1.5
+    assert RetryPolicy.retry_after(make_error(429)) is None
+    assert RetryPolicy.retry_after(TimeoutError()) is None
+
+
+def test_retry_after_http_date():
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    delay = RetryPolicy.retry_after(make_error(503, headers={"retry-after": retry_at}))
+    assert 28 <= delay <= 30
+
+    # A date in the past means no wait
+    retry_at = email.utils.formatdate(time.time() - 30, usegmt=True)
+    assert RetryPolicy.retry_after(make_error(503, headers={"retry-after": retry_at})) == 0.0
+
+
+@pytest.mark.parametrize("value", ["soon", "Mon, 99 Foo 2024 00:00:00 GMT", "", "inf", "nan"])
+def test_malformed_retry_after_falls_back_to_backoff(value):
+    error = make_error(503, headers={"retry-after": value})
+    assert RetryPolicy.retry_after(error) is None
+    assert RetryPolicy(base_delay=1.0, jitter=False).delay(3, error) == 4.0
+
+
+def test_delay_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=False)
+    error = make_error(503)
+    assert [policy.delay(attempt, error) for attempt in range(1, 7)] == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=True)
+    assert all(0 <= policy.delay(attempt, error) <= 10.0 for attempt in range(1, 20))
+
+
+def test_delay_honors_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=False)
+    assert policy.delay(1, make_error(429, headers={"retry-after": "42"})) == 42.0
+
+
+def test_token_bucket_rate(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    # A burst of 2, then one token every 0.5s
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+
+def test_token_bucket_pause(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    bucket = TokenBucket(rate=10)
+
+    bucket.pause(5)
+    assert bucket.wait_time() == pytest.approx(5.1)
+    bucket.acquire()
+    assert clock.now >= 1005.0
+
+    # A shorter pause doesn't cut a longer one short
+    bucket.pause(5)
+    bucket.pause(1)
+    assert bucket.wait_time() >= 5
+
+
+def test_execute_retries_transient_errors(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    errors = [make_error(503), make_error(500)]
+    retries = []
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return {"ok": True}
+
+    request_scheduler = RequestScheduler(retry_policy=RetryPolicy(base_delay=1.0, jitter=False))
+    result = request_scheduler.execute(call, on_retry=lambda attempt, kind, delay, error: retries.append(
+        (attempt, kind, delay)))
+
+    assert result == {"ok": True}
+    assert retries == [(1, TRANSIENT, 1.0), (2, TRANSIENT, 2.0)]
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_execute_gives_up_after_max_attempts(monkeypatch):
+    FakeClock(monkeypatch)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise make_error(503)
+
+    request_scheduler = RequestScheduler(retry_policy=RetryPolicy(max_attempts=3, jitter=False))
+    with pytest.raises(HttpError):
+        request_scheduler.execute(call)
+    assert len(calls) == 3
+
+
+def test_execute_quota_error_pauses_the_rate_limiter(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    bucket = TokenBucket(rate=100)
+    errors = [make_error(403, "rateLimitExceeded", headers={"retry-after": "20"})]
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return {}
+
+    RequestScheduler(rate_limiter=bucket).execute(call)
+
+    # The retry waited for Retry-After, and the bucket was paused for every thread sharing it
+    assert clock.now - 1000.0 >= 20
+    assert bucket._paused_until == pytest.approx(1020.0)
+
+
+def test_execute_permission_error_is_not_retried(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    bucket = TokenBucket(rate=100)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise make_error(403, "PERMISSION_DENIED")
+
+    with pytest.raises(HttpError):
+        RequestScheduler(rate_limiter=bucket).execute(call)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+    assert bucket.wait_time() == 0
@@ -0,0 +1,92 @@
+"""Offline tests for searching error issues and error reports."""
+import urllib.parse
+
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import ErrorIssuesReport, ErrorReportsReport
+from google_play_developer_api.report.error_reports import SUMMARY_FIELDS
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+
+def make_issues(count: int) -> list[dict]:
+    return [{"name": f"apps/com.a/errorIssues/{i}", "type": "CRASH", "cause": f"cause {i}", "distinctUsers": str(i)}
+            for i in range(count)]
+
+
+def make_error_reports(count: int) -> list[dict]:
+    return [{"name": f"apps/com.a/errorReports/{i}", "type": "CRASH", "issue": "apps/com.a/errorIssues/1",
+             "reportText": "java.lang.NullPointerException"} for i in range(count)]
+
+
+def make_report(report_class, http):
+    return report_class(reporting_service=build_reporting_service(http),
+                        scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+def request_params(http) -> list[dict]:
+    return [dict(urllib.parse.parse_qsl(urllib.parse.urlparse(uri).query)) for uri, _ in http.requests]
+
+
+def test_error_issues_search_is_lazy():
+    http = FakeReportingHttp(items={"errorIssues": make_issues(5)})
+    report = make_report(ErrorIssuesReport, http)
+
+    issues = report.search(app_package_name="com.a", page_size=2)
+    assert http.requests == []
+    assert next(issues)["name"] == "apps/com.a/errorIssues/0"
+    assert len(http.requests) == 1
+
+    assert len(list(issues)) == 4
+    assert [params.get("pageToken", "") for params in request_params(http)] == ["", "2", "4"]
+
+
+def test_error_issues_search_params():
+    http = FakeReportingHttp(items={"errorIssues": make_issues(3)})
+    report = make_report(ErrorIssuesReport, http)
+
+    issues = list(report.search(app_package_name="com.a",
+                                start_time="2024-01-01 00:00",
+                                end_time="2024-01-02 06:00",
+                                filter="errorIssueType = CRASH",
+                                order_by="distinctUsers desc",
+                                fields=["name", "type", "distinctUsers"],
+                                page_size=10))
+
+    # Partial response: only the requested fields
+    assert issues == [{"name": f"apps/com.a/errorIssues/{i}", "type": "CRASH", "distinctUsers": str(i)}
+                      for i in range(3)]
+    params = request_params(http)[0]
+    assert params["fields"] == "errorIssues(name,type,distinctUsers),nextPageToken"
+    assert params["filter"] == "errorIssueType = CRASH"
+    assert params["orderBy"] == "distinctUsers desc"
+    assert (params["interval.startTime.day"], params["interval.endTime.day"]) == ("1", "2")
+    assert (params["interval.endTime.hours"], params["interval.endTime.timeZone.id"]) == ("6", "UTC")
+
+
+def test_error_issues_search_many():
+    http = FakeReportingHttp(items={"errorIssues": make_issues(3)}, denied_apps={"com.denied"},
+                             failures={1: (500, "INTERNAL")})
+    report = make_report(ErrorIssuesReport, http)
+
+    results = report.search_many(["com.a", "com.denied"], max_workers=1)
+
+    # The denied app logs the 403 and gets no issues, the failed search gets its exception
+    assert isinstance(results["com.a"], HttpError)
+    assert results["com.denied"] == []
+
+    http.failures = {}
+    assert len(report.search_many(["com.a"])["com.a"]) == 3
+
+
+def test_error_reports_search_summary_fields():
+    http = FakeReportingHttp(items={"errorReports": make_error_reports(3)})
+    report = make_report(ErrorReportsReport, http)
+
+    error_reports = list(report.search(app_package_name="com.a", fields=SUMMARY_FIELDS, page_size=2))
+
+    assert [error_report["name"] for error_report in error_reports] == [f"apps/com.a/errorReports/{i}"
+                                                                       for i in range(3)]
+    assert all("reportText" not in error_report for error_report in error_reports)
+    assert len(http.requests) == 2
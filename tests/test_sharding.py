@@ -0,0 +1,51 @@
+"""Offline tests for queries split into time and dimension shards."""
+import pytest
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+
+from .fake_api import FakeReportingHttp, build_reporting_service, make_rows
+
+QUERY = dict(app_package_name="com.example",
+             start_time="2024-01-01 00:00",
+             end_time="2024-01-03 00:00",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+
+
+def rows_with_missing_versions(count: int = 30) -> list[dict]:
+    """Rows at distinct hours, every third one without a versionCode value"""
+    rows = make_rows(count)
+    for row in rows[::3]:
+        row["dimensions"][0] = {"dimension": "versionCode"}
+    return rows
+
+
+def make_report(http):
+    return CrashRateReport(reporting_service=build_reporting_service(http),
+                           scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+
+@pytest.mark.parametrize("shard_by", [None, "DAY"])
+def test_dimension_shards_return_the_unsharded_rows(shard_by):
+    http = FakeReportingHttp(timeline_rows=True, rows=rows_with_missing_versions())
+    report = make_report(http)
+    expected = report.get_hourly(**QUERY)
+    assert sum(row["versionCode"] == "" for row in expected) == 10
+
+    http.requests.clear()
+    assert report.get_hourly(shard_by=shard_by, shard_dimension="versionCode", max_workers=1, **QUERY) == expected
+
+    # Values are never filtered on as empty strings, missing ones are in the remainder shard
+    filters = {query["filter"] for query in http.queries if "filter" in query}
+    assert 'versionCode = ""' not in filters
+    assert "NOT versionCode = 1 AND NOT versionCode = 2 AND NOT versionCode = 4 AND NOT versionCode = 0 " \
+           "AND NOT versionCode = 3" in filters
+
+
+def test_unlisted_shard_values_are_fetched():
+    report = make_report(FakeReportingHttp(timeline_rows=True, rows=rows_with_missing_versions()))
+    expected = report.get_hourly(**QUERY)
+
+    assert report.get_hourly(shard_dimension="versionCode", shard_values=[1, 2], **QUERY) == expected
@@ -0,0 +1,76 @@
+"""Offline tests for incremental syncs driven by a watermark."""
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.report.sync import IncrementalSync
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+from google_play_developer_api.state import JsonStateStore
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+QUERY = dict(app_package_name="com.example",
+             dimensions=["versionCode", "countryCode"],
+             metrics=["crashRate", "distinctUsers"],
+             page_size=4)
+KEY = "com.example/crashRateMetricSet/HOURLY"
+
+
+def make_sync(http, tmp_path):
+    report = CrashRateReport(reporting_service=build_reporting_service(http),
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+    return IncrementalSync(report, JsonStateStore(str(tmp_path / "state.json")))
+
+
+def test_first_sync_requires_initial_start_time(tmp_path):
+    sync = make_sync(FakeReportingHttp(timeline_rows=True), tmp_path)
+
+    with pytest.raises(ValueError):
+        sync.sync(**QUERY)
+
+    rows = sync.sync(initial_start_time="2024-01-03 00:00", **QUERY)
+    # Up to latestEndTime of the freshness (2024-01-03 05:00)
+    assert len(rows) == 5
+    assert sync.get_watermark("com.example") == "2024-01-03 05:00"
+
+
+def test_sync_advances_watermark(tmp_path):
+    http = FakeReportingHttp(timeline_rows=True, latest_end_time={"year": 2024, "month": 1, "day": 1, "hours": 6})
+    sync = make_sync(http, tmp_path)
+    sync.sync(initial_start_time="2024-01-01 00:00", **QUERY)
+    assert sync.get_watermark("com.example") == "2024-01-01 06:00"
+
+    http.latest_end_time = {"year": 2024, "month": 1, "day": 1, "hours": 9}
+    rows = sync.sync(initial_start_time="2024-01-01 00:00", **QUERY)
+    # The stored watermark wins over initial_start_time
+    assert [row["eventDate"] for row in rows] == [f"2024-1-1 {hour}:00" for hour in range(6, 9)]
+    assert sync.get_watermark("com.example") == "2024-01-01 09:00"
+
+
+def test_sync_without_new_data(tmp_path):
+    http = FakeReportingHttp(timeline_rows=True)
+    sync = make_sync(http, tmp_path)
+    sync.sync(initial_start_time="2024-01-03 00:00", **QUERY)
+
+    http.requests.clear()
+    assert sync.sync(**QUERY) == []
+    assert http.queries == []
+    assert sync.get_watermark("com.example") == "2024-01-03 05:00"
+
+
+def test_denied_sync_keeps_watermark(tmp_path):
+    http = FakeReportingHttp(timeline_rows=True)
+    sync = make_sync(http, tmp_path)
+    sync.sync(initial_start_time="2024-01-03 00:00", **QUERY)
+    assert sync.get_watermark("com.example") == "2024-01-03 05:00"
+
+    # Only the query is denied: the freshness would move the watermark past data that was never fetched
+    http.latest_end_time = {"year": 2024, "month": 1, "day": 3, "hours": 9}
+    http.failures = {len(http.requests) + 2: (403, "PERMISSION_DENIED")}
+    with pytest.raises(HttpError):
+        sync.sync(**QUERY)
+    assert sync.get_watermark("com.example") == "2024-01-03 05:00"
+
+    http.failures = {}
+    assert len(sync.sync(**QUERY)) == 4
+    assert sync._state_store.get(KEY) == "2024-01-03 09:00"
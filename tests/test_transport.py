@@ -0,0 +1,96 @@
+"""Offline tests for the pooled HTTP transport."""
+import gzip
+import io
+import json
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from google_play_developer_api.report import CrashRateReport
+from google_play_developer_api.scheduler import RequestScheduler, RetryPolicy
+from google_play_developer_api.transport import PooledHttp
+
+from .fake_api import FakeReportingHttp, build_reporting_service
+
+requests = pytest.importorskip("requests")
+urllib3 = pytest.importorskip("urllib3")
+
+
+class FakeAdapter(requests.adapters.HTTPAdapter):
+    """Answers requests of the session from a handler instead of the network"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        status, reason, headers, body = self.handler(request)
+        response = urllib3.HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                                        preload_content=False, decode_content=False)
+        return self.build_response(request, response)
+
+
+def make_http(handler, **kwargs) -> tuple:
+    http = PooledHttp(credentials=AnonymousCredentials(), **kwargs)
+    adapter = FakeAdapter(handler)
+    http._session.mount("https://", adapter)
+    return http, adapter
+
+
+def test_response_maps_to_httplib2():
+    body = json.dumps({"rows": []}).encode()
+    http, adapter = make_http(lambda request: (404, "Not Found", {"Content-Type": "application/json",
+                                                                  "Content-Length": str(len(body)),
+                                                                  "X-Request-Id": "abc"}, body))
+
+    resp, content = http.request("https://example.com/v1/apps/x", "POST", body="{}",
+                                 headers={"content-type": "application/json"})
+
+    assert resp.status == 404
+    assert resp.reason == "Not Found"
+    assert resp["content-type"] == "application/json"
+    assert resp["x-request-id"] == "abc"
+    assert "content-length" not in resp
+    assert content == body
+    assert adapter.sent[0].method == "POST"
+    assert adapter.sent[0].body == "{}"
+
+
+def test_gzip_response_is_decompressed():
+    body = json.dumps({"rows": [{"value": "x" * 100}]}).encode()
+    http, adapter = make_http(lambda request: (200, "OK", {"Content-Encoding": "gzip"}, gzip.compress(body)))
+
+    resp, content = http.request("https://example.com/v1/apps/x")
+
+    assert content == body
+    # googleapiclient must not decompress it again
+    assert "content-encoding" not in resp
+    assert "gzip" in adapter.sent[0].headers["accept-encoding"]
+
+
+def test_gzip_disabled():
+    http, adapter = make_http(lambda request: (200, "OK", {}, b"{}"), gzip=False)
+
+    http.request("https://example.com/v1/apps/x", headers={"Accept-Encoding": "gzip"})
+
+    assert adapter.sent[0].headers["accept-encoding"] == "identity"
+
+
+def test_report_over_pooled_http():
+    fake = FakeReportingHttp(row_count=6, page_size=4)
+
+    def handler(request):
+        resp, content = fake.request(request.url, request.method, body=request.body)
+        return resp.status, resp.reason, {"Content-Type": "application/json"}, content
+
+    http, _ = make_http(handler)
+    report = CrashRateReport(reporting_service=build_reporting_service(fake), http=http,
+                             scheduler=RequestScheduler(retry_policy=RetryPolicy(max_attempts=1)))
+
+    rows = report.get_hourly(app_package_name="com.example", start_time="2024-01-01 00:00",
+                             end_time="2024-01-01 06:00", dimensions=["versionCode"], metrics=["crashRate"],
+                             page_size=4)
+    assert len(rows) == 6
+    assert len(fake.queries) == 2